@@ -0,0 +1,30 @@
+"""baseline schema (restored from sanrakshya1.sql)
+
+Revision ID: 2f3c9c8d1b7a
+Revises: 
+Create Date: 2025-01-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f3c9c8d1b7a'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing databases are created from the sanrakshya1.sql dump, which is
+    # already stamped at this revision.
+    pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
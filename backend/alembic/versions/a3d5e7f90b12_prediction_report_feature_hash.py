@@ -0,0 +1,36 @@
+"""add feature_hash to child_prediction_reports
+
+Revision ID: a3d5e7f90b12
+Revises: 2f3c9c8d1b7a
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d5e7f90b12'
+down_revision: Union[str, Sequence[str], None] = '2f3c9c8d1b7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing reports keep a NULL hash and simply re-predict once.
+    op.add_column('child_prediction_reports', sa.Column('feature_hash', sa.String(length=64), nullable=True))
+    op.create_index(
+        'ix_child_prediction_reports_child_id_feature_hash',
+        'child_prediction_reports',
+        ['child_id', 'feature_hash'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_child_prediction_reports_child_id_feature_hash', table_name='child_prediction_reports')
+    op.drop_column('child_prediction_reports', 'feature_hash')
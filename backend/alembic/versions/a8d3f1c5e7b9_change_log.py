@@ -0,0 +1,53 @@
+"""change_log feed for delta sync
+
+Revision ID: a8d3f1c5e7b9
+Revises: f2a6c8e0b4d7
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3f1c5e7b9'
+down_revision: Union[str, Sequence[str], None] = 'f2a6c8e0b4d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQLAlchemy stores Python enums by member name
+change_entity_enum = sa.Enum(
+    'ILLNESS_LOG', 'VACCINE_STATUS', 'MILESTONE_STATUS', 'PREDICTION_REPORT', 'MEDICAL_REPORT',
+    name='change_entity_enum',
+)
+change_op_enum = sa.Enum('UPSERT', 'DELETE', name='change_op_enum')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Starts empty: clients without a cursor get reset=true and refetch once
+    op.create_table(
+        'change_log',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('parent_id', sa.Integer(), nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', change_entity_enum, nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('op', change_op_enum, nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['parent_id'], ['parents.parent_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True,
+    )
+    op.create_index('ix_change_log_parent_id_id', 'change_log', ['parent_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_change_log_parent_id_id', table_name='change_log')
+    op.drop_table('change_log')
+    change_op_enum.drop(op.get_bind(), checkfirst=True)
+    change_entity_enum.drop(op.get_bind(), checkfirst=True)
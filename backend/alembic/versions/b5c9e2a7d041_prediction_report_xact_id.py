@@ -0,0 +1,47 @@
+"""xact_id on child_prediction_reports for commit-ordered exports
+
+Revision ID: b5c9e2a7d041
+Revises: a8d3f1c5e7b9
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c9e2a7d041'
+down_revision: Union[str, Sequence[str], None] = 'a8d3f1c5e7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _xact_id_default() -> sa.TextClause:
+    # Same as app.db.commit_order.current_xact_id
+    if op.get_bind().dialect.name == 'postgresql':
+        return sa.text('(pg_current_xact_id()::text::bigint)')
+    return sa.text('0')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows all get this migration's transaction id (0 on SQLite),
+    # so they keep their id order and sort before anything written later
+    op.add_column(
+        'child_prediction_reports',
+        sa.Column('xact_id', sa.BigInteger(), server_default=_xact_id_default(), nullable=False),
+    )
+    op.create_index(
+        'ix_child_prediction_reports_age_group_xact_id_id',
+        'child_prediction_reports',
+        ['age_group', 'xact_id', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_child_prediction_reports_age_group_xact_id_id', table_name='child_prediction_reports')
+    op.drop_column('child_prediction_reports', 'xact_id')
@@ -0,0 +1,62 @@
+"""composite (child_id, date DESC, id DESC) indexes on per-child log tables
+
+Revision ID: c7e19b4d2a60
+Revises: a3d5e7f90b12
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e19b4d2a60'
+down_revision: Union[str, Sequence[str], None] = 'a3d5e7f90b12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, date column)
+INDEXES = [
+    ('ix_child_anthropometry_child_id_log_date', 'child_anthropometry', 'log_date'),
+    ('ix_child_meal_log_child_id_log_date', 'child_meal_log', 'log_date'),
+    ('ix_child_illness_logs_child_id_created_at', 'child_illness_logs', 'created_at'),
+    ('ix_child_prediction_reports_child_id_created_at', 'child_prediction_reports', 'created_at'),
+]
+
+
+def _concurrently() -> bool:
+    # The log tables are written constantly; on Postgres build without blocking writes.
+    return op.get_context().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _concurrently():
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            for name, table, column in INDEXES:
+                op.create_index(
+                    name,
+                    table,
+                    ['child_id', sa.text(f'{column} DESC'), sa.text('id DESC')],
+                    unique=False,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+        return
+    for name, table, column in INDEXES:
+        op.create_index(name, table, ['child_id', sa.text(f'{column} DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _concurrently():
+        with op.get_context().autocommit_block():
+            for name, table, _ in INDEXES:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        return
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
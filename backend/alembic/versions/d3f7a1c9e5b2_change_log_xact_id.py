@@ -0,0 +1,45 @@
+"""xact_id on change_log for a commit-ordered sync cursor
+
+Revision ID: d3f7a1c9e5b2
+Revises: b5c9e2a7d041
+Create Date: 2026-10-20 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f7a1c9e5b2'
+down_revision: Union[str, Sequence[str], None] = 'b5c9e2a7d041'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _xact_id_default() -> sa.TextClause:
+    # Same as app.db.commit_order.current_xact_id
+    if op.get_bind().dialect.name == 'postgresql':
+        return sa.text('(pg_current_xact_id()::text::bigint)')
+    return sa.text('0')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Cursors become "<xact_id>.<id>"; old integer cursors get reset=true once
+    op.add_column(
+        'change_log',
+        sa.Column('xact_id', sa.BigInteger(), server_default=_xact_id_default(), nullable=False),
+    )
+    op.drop_index('ix_change_log_parent_id_id', table_name='change_log')
+    op.create_index(
+        'ix_change_log_parent_id_xact_id_id', 'change_log', ['parent_id', 'xact_id', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_change_log_parent_id_xact_id_id', table_name='change_log')
+    op.create_index('ix_change_log_parent_id_id', 'change_log', ['parent_id', 'id'], unique=False)
+    op.drop_column('change_log', 'xact_id')
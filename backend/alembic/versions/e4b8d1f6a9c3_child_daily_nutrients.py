@@ -0,0 +1,75 @@
+"""child_daily_nutrients rollup table
+
+Revision ID: e4b8d1f6a9c3
+Revises: c7e19b4d2a60
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8d1f6a9c3'
+down_revision: Union[str, Sequence[str], None] = 'c7e19b4d2a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NUTRIENTS = ['energy_kcal', 'protein_g', 'carb_g', 'fat_g', 'iron_mg', 'calcium_mg', 'vitamin_a_mcg', 'vitamin_c_mg']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'child_daily_nutrients',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=False),
+        sa.Column('log_date', sa.Date(), nullable=False),
+        sa.Column('item_count', sa.Integer(), server_default='0', nullable=False),
+        *[sa.Column(name, sa.Float(), server_default='0', nullable=False) for name in NUTRIENTS],
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['child_id'], ['children.child_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('child_id', 'log_date', name='uq_child_daily_nutrients_child_id_log_date'),
+    )
+    op.create_index(op.f('ix_child_daily_nutrients_id'), 'child_daily_nutrients', ['id'], unique=False)
+
+    # Roll up existing meal logs, as app.db.crud_daily_nutrients.rebuild_daily_nutrients does.
+    # SHARE mode waits for in-flight meal-log writes and blocks new ones until
+    # this transaction commits, so no log is missed by the rollup.
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('LOCK TABLE child_meal_log, child_meal_item IN SHARE MODE')
+    meal_log = sa.table('child_meal_log', sa.column('id'), sa.column('child_id'), sa.column('log_date'))
+    meal_item = sa.table(
+        'child_meal_item', sa.column('id'), sa.column('meal_log_id'), sa.column('meal_frequency'),
+        *[sa.column(name) for name in NUTRIENTS],
+    )
+    daily = sa.table(
+        'child_daily_nutrients', sa.column('child_id'), sa.column('log_date'), sa.column('item_count'),
+        *[sa.column(name) for name in NUTRIENTS],
+    )
+    source = (
+        sa.select(
+            meal_log.c.child_id,
+            meal_log.c.log_date,
+            sa.cast(sa.func.count(meal_item.c.id), sa.Integer()),
+            *[
+                sa.func.coalesce(
+                    sa.func.sum(sa.func.coalesce(meal_item.c[name], 0.0) * meal_item.c.meal_frequency), 0.0
+                )
+                for name in NUTRIENTS
+            ],
+        )
+        .select_from(meal_log.outerjoin(meal_item, meal_item.c.meal_log_id == meal_log.c.id))
+        .group_by(meal_log.c.child_id, meal_log.c.log_date)
+    )
+    op.execute(daily.insert().from_select(['child_id', 'log_date', 'item_count', *NUTRIENTS], source))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_child_daily_nutrients_id'), table_name='child_daily_nutrients')
+    op.drop_table('child_daily_nutrients')
@@ -0,0 +1,40 @@
+"""write counters for conditional-GET version tokens
+
+Revision ID: e9a2c4f6b8d1
+Revises: d3f7a1c9e5b2
+Create Date: 2026-10-21 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9a2c4f6b8d1'
+down_revision: Union[str, Sequence[str], None] = 'd3f7a1c9e5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tags issued before this revision do not include the counters, so they
+    # simply miss once
+    op.add_column(
+        'children',
+        sa.Column('data_version', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.create_table(
+        'table_versions',
+        sa.Column('table_name', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('table_versions')
+    op.drop_column('children', 'data_version')
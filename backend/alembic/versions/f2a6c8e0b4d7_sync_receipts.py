@@ -0,0 +1,50 @@
+"""sync_receipts for offline-sync idempotency keys
+
+Revision ID: f2a6c8e0b4d7
+Revises: e4b8d1f6a9c3
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6c8e0b4d7'
+down_revision: Union[str, Sequence[str], None] = 'e4b8d1f6a9c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQLAlchemy stores Python enums by member name
+sync_entry_type_enum = sa.Enum('MEAL_LOG', 'MEASUREMENT', 'ILLNESS_LOG', name='sync_entry_type_enum')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sync_receipts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('parent_id', sa.Integer(), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=64), nullable=False),
+        sa.Column('entry_type', sync_entry_type_enum, nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=False),
+        sa.Column('record_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['parent_id'], ['parents.parent_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['child_id'], ['children.child_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('parent_id', 'idempotency_key', name='uq_sync_receipts_parent_id_idempotency_key'),
+    )
+    op.create_index(op.f('ix_sync_receipts_id'), 'sync_receipts', ['id'], unique=False)
+    op.create_index(op.f('ix_sync_receipts_child_id'), 'sync_receipts', ['child_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sync_receipts_child_id'), table_name='sync_receipts')
+    op.drop_index(op.f('ix_sync_receipts_id'), table_name='sync_receipts')
+    op.drop_table('sync_receipts')
+    sync_entry_type_enum.drop(op.get_bind(), checkfirst=True)
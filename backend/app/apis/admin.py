@@ -0,0 +1,130 @@
+import io
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.apis.deps import get_db, require_admin
+from app.core.responses import dumps
+from app.db.session import SessionLocal
+from app.schemas.schemas import VaccinationAgeGroupEnum
+from app.services.report_export import (
+    DEFAULT_BATCH_SIZE,
+    arrow_batch,
+    arrow_schema,
+    batch_watermark,
+    concat_batches,
+    export_columns,
+    iter_report_batches,
+    npz_bytes,
+    require_pyarrow,
+)
+from app.services.vaccination_due import due_dose_record, iter_due_doses
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+# (xact_id, id) of the last row in an npz export page; pass them back as
+# after_xact_id / after_id for the next page
+EXPORT_LAST_XACT_ID_HEADER = "X-Export-Last-Xact-Id"
+EXPORT_LAST_ID_HEADER = "X-Export-Last-Id"
+
+
+class _ChunkSink(io.RawIOBase):
+    """Writable file for the Arrow IPC writer whose output is drained after every batch."""
+
+    def __init__(self) -> None:
+        self._chunks = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _stream_arrow(group: VaccinationAgeGroupEnum, after: tuple, limit: int):
+    """Arrow IPC stream, one record batch per cursor batch (own session: runs after the route returns)."""
+    pa = require_pyarrow()
+    db = SessionLocal()
+    try:
+        sink = _ChunkSink()
+        writer = pa.ipc.new_stream(sink, arrow_schema(group))
+        for batch in iter_report_batches(db, group, after=after, batch_size=DEFAULT_BATCH_SIZE, max_rows=limit):
+            writer.write_batch(arrow_batch(group, batch))
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+    finally:
+        db.close()
+
+
+@router.get("/prediction-reports/export")
+def export_prediction_reports(
+    age_group: VaccinationAgeGroupEnum,
+    after_xact_id: int = Query(0, ge=0, description="Watermark: xact_id of the last row already exported"),
+    after_id: int = Query(0, ge=0, description="Watermark: id of the last row already exported"),
+    limit: int = Query(50_000, ge=1, le=200_000),
+    format: Literal["arrow", "npz"] = Query("arrow"),
+    db: Session = Depends(get_db),
+):
+    """ChildPredictionReport rows for one age group in model column order, for retraining.
+
+    Rows come in (xact_id, id) commit order. The next page starts after the
+    xact_id and id of the last row received (the last row of the last Arrow
+    record batch; npz pages also return them as headers).
+    """
+    after = (after_xact_id, after_id)
+    if format == "npz":
+        batches = list(iter_report_batches(db, age_group, after=after, max_rows=limit))
+        headers = {"Content-Disposition": f'attachment; filename="{age_group.value}-after-{after_xact_id}-{after_id}.npz"'}
+        if batches:
+            last_xact_id, last_id = batch_watermark(batches[-1])
+            headers[EXPORT_LAST_XACT_ID_HEADER] = str(last_xact_id)
+            headers[EXPORT_LAST_ID_HEADER] = str(last_id)
+        body = npz_bytes(concat_batches(batches, export_columns(age_group)))
+        return Response(content=body, media_type="application/octet-stream", headers=headers)
+
+    try:
+        require_pyarrow()
+    except RuntimeError as exc:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(exc))
+    return StreamingResponse(
+        _stream_arrow(age_group, after, limit),
+        media_type="application/vnd.apache.arrow.stream",
+    )
+
+
+def _stream_due_doses(within_days: int, after_child_id: int, include_overdue: bool):
+    db = SessionLocal()
+    try:
+        for dose in iter_due_doses(
+            db, within_days=within_days, after_child_id=after_child_id, include_overdue=include_overdue
+        ):
+            yield dumps(due_dose_record(dose)) + b"\n"
+    finally:
+        db.close()
+
+
+@router.get("/vaccinations/due")
+def stream_due_vaccinations(
+    within_days: int = Query(7, ge=0, le=365),
+    after_child_id: int = Query(0, ge=0, description="Resume after this child_id"),
+    include_overdue: bool = Query(True),
+):
+    """Every overdue or soon-due CORE dose, one JSON object per line, in child_id order."""
+    return StreamingResponse(
+        _stream_due_doses(within_days, after_child_id, include_overdue),
+        media_type="application/x-ndjson",
+    )
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 
 from app.db import crud
 from app.schemas.schemas import ParentCreate, Token, UserLogin, Parent
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_and_update_password, create_access_token
 from app.core.config import settings
 from app.apis.deps import get_db
 
@@ -35,12 +35,17 @@ async def login_for_access_token_parent(user_login: UserLogin, db: Session = Dep
             detail="You are not registered as a parent",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    elif not verify_password(user_login.password, user.password_hash):
+
+    verified, new_hash = await verify_and_update_password(user_login.password, user.password_hash)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # BCRYPT_ROUNDS changed since this hash was stored; upgrade it now
+        crud.update_parent_password_hash(db, db_parent=user, password_hash=new_hash)
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     expires_at_utc = datetime.utcnow() + access_token_expires
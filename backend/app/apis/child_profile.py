@@ -5,8 +5,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
-from app.apis.deps import get_current_user, get_db
+from app.apis.deps import child_cache_version, get_current_user, get_db
+from app.core.http_cache import conditional
 from app.db import crud
+from app.db.crud_versions import profile_summary_version
 from app.db.crud_child_profile import get_child_profile_summary
 from app.models.models import Parent as ParentModel
 
@@ -74,7 +76,11 @@ def _require_parent(user):
     return user
 
 
-@router.get("/{child_id}/profile-summary", response_model=ChildProfileSummaryResponse)
+@router.get(
+    "/{child_id}/profile-summary",
+    response_model=ChildProfileSummaryResponse,
+    dependencies=[conditional(child_cache_version(profile_summary_version))],
+)
 def get_child_profile(
     child_id: int,
     db: Session = Depends(get_db),
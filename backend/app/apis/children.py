@@ -1,10 +1,11 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.apis.deps import get_current_user, get_db
-from app.db import crud
+from app.apis.deps import get_async_db, get_current_user, get_db
+from app.db import crud, crud_async
 from app.schemas.schemas import Child, ChildCreate, ChildUpdate
 from app.models.models import Parent as ParentModel
 from app.services import profile_photo_storage
@@ -20,12 +21,12 @@ def _require_parent(user):
 
 
 @router.get("/list-children", response_model=List[Child])
-def list_my_children(
-    db: Session = Depends(get_db),
+async def list_my_children(
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
     parent = _require_parent(current_user)
-    return crud.list_children_by_parent(db, parent_id=parent.parent_id)
+    return await crud_async.list_children_by_parent(db, parent_id=parent.parent_id)
 
 
 @router.post("/create-child", response_model=Child, status_code=status.HTTP_201_CREATED)
@@ -39,13 +40,13 @@ def create_my_child(
 
 
 @router.get("/get-child/{child_id}", response_model=Child)
-def get_my_child(
+async def get_my_child(
     child_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
     parent = _require_parent(current_user)
-    db_child = crud.get_child_by_id_and_parent(db, child_id=child_id, parent_id=parent.parent_id)
+    db_child = await crud_async.get_child_by_id_and_parent(db, child_id=child_id, parent_id=parent.parent_id)
     if not db_child:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
     return db_child
@@ -80,7 +81,7 @@ def delete_my_child(
 
 
 @router.post("/{child_id}/photo", status_code=status.HTTP_201_CREATED)
-async def upload_child_photo(
+def upload_child_photo(
     child_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -111,7 +112,7 @@ async def upload_child_photo(
 
 
 @router.get("/{child_id}/photo", response_class=StreamingResponse)
-async def get_child_photo(
+def get_child_photo(
     child_id: int,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
@@ -137,7 +138,7 @@ async def get_child_photo(
 
 
 @router.delete("/{child_id}/photo", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_child_photo(
+def delete_child_photo(
     child_id: int,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
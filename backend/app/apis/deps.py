@@ -1,12 +1,18 @@
-from typing import Generator
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import AsyncGenerator, Callable, Generator, Optional
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.core.config import settings
 from app.core.security import decode_access_token
-from app.db import crud
-from app.models.models import Parent
-from app.doctor.cruds import doctor as doctor_crud
+from app.core.principal_cache import principal_cache, invalidate_principal
+from app.core.http_cache import CacheVersion
+from app.db import crud_async
+from app.models.models import Child, Parent
+from app.doctor.models import Doctor
 from app.schemas.schemas import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -18,8 +24,12 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-async def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
-  
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -37,15 +47,26 @@ async def get_current_user(db: Session = Depends(get_db), token: str = Depends(o
     except Exception:
         raise credentials_exception
 
-    if token_data.user_type == "doctor":
-        user = doctor_crud.get_doctor_by_email(db, email=token_data.email)
-    elif token_data.user_type == "parent":
-        user = crud.get_parent_by_email(db, email=token_data.email)
-    else:
+    # Token signature/expiry is still verified above on every request; the cache
+    # only skips the user lookup and returns a detached copy of the row.
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return cached
+
+    if token_data.user_type not in ("doctor", "parent"):
         raise credentials_exception
+    generation = principal_cache.generation
+    # Own short-lived session: the connection goes back to the pool before the
+    # route runs instead of idling in a transaction for the whole request
+    async with AsyncSessionLocal() as db:
+        if token_data.user_type == "doctor":
+            user = await crud_async.get_doctor_by_email(db, email=token_data.email)
+        else:
+            user = await crud_async.get_parent_by_email(db, email=token_data.email)
 
     if user is None:
         raise credentials_exception
+    principal_cache.put(token, token_data.user_type, user, generation=generation)
     return user
 
 
@@ -53,3 +74,94 @@ async def require_doctor_user(current_user = Depends(get_current_user)):
     if isinstance(current_user, Parent):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only doctors can perform this action")
     return current_user
+
+
+async def require_admin(x_admin_key: str | None = Header(None)):
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin API is disabled")
+    if not x_admin_key or not hmac.compare_digest(x_admin_key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin key")
+    return True
+
+
+async def require_metrics_access(authorization: str | None = Header(None)):
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if settings.METRICS_BEARER_TOKEN:
+        scheme, _, token = (authorization or "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(
+            token.encode(), settings.METRICS_BEARER_TOKEN.encode()
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    return True
+
+
+def child_cache_version(version: Callable[[Session, int], CacheVersion]):
+    """conditional() version for a parent's /child/{child_id} route.
+
+    None (no caching) unless the child is the caller's, so the route still
+    answers strangers with its own 403/404.
+    """
+    def dependency(
+        child_id: int,
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user),
+    ) -> Optional[CacheVersion]:
+        if not isinstance(current_user, Parent):
+            return None
+        owned = (
+            db.query(Child.child_id)
+            .filter(Child.child_id == child_id, Child.parent_id == current_user.parent_id)
+            .first()
+        )
+        return version(db, child_id) if owned else None
+    return dependency
+
+
+def reference_cache_version(version: Callable[[Session], CacheVersion]):
+    """conditional() version for an authenticated read of reference data."""
+    def dependency(db: Session = Depends(get_db), current_user=Depends(get_current_user)) -> CacheVersion:
+        return version(db)
+    return dependency
+
+
+# Drop cached principals whenever the underlying parent/doctor row is updated
+# (profile edits, deactivation, verification) or deleted. The flush only
+# records the identity; the cache is cleared once the change has committed, so
+# a concurrent request cannot re-cache the row as it was before the commit.
+_PENDING_PRINCIPALS = "invalidate_principals"
+
+
+def _defer_invalidation(target, user_type: str, ident) -> None:
+    session = object_session(target)
+    if session is None:
+        invalidate_principal(user_type, ident)
+        return
+    session.info.setdefault(_PENDING_PRINCIPALS, set()).add((user_type, ident))
+
+
+@event.listens_for(Parent, "after_update")
+@event.listens_for(Parent, "after_delete")
+def _invalidate_parent_principal(mapper, connection, target):
+    _defer_invalidation(target, "parent", target.parent_id)
+
+
+@event.listens_for(Doctor, "after_update")
+@event.listens_for(Doctor, "after_delete")
+def _invalidate_doctor_principal(mapper, connection, target):
+    _defer_invalidation(target, "doctor", target.doctor_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session):
+    for user_type, ident in session.info.pop(_PENDING_PRINCIPALS, ()):
+        invalidate_principal(user_type, ident)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_principals(session):
+    session.info.pop(_PENDING_PRINCIPALS, None)
@@ -2,8 +2,11 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.apis.deps import get_current_user, get_db
+from app.apis.deps import child_cache_version, get_current_user, get_db, reference_cache_version
+from app.core.http_cache import conditional
+from app.core.responses import trusted_list_response
 from app.db import crud
+from app.db.crud_versions import child_food_list_version, food_list_version
 from app.schemas.schemas import FoodBrief as FoodSchema, FoodAgeGroupEnum
 from app.models.models import Parent as ParentModel
 
@@ -19,17 +22,25 @@ def seed_food_master(
     return {"status": "ok"}
 
 
-@router.get("/{age_group}", response_model=List[FoodSchema])
+@router.get(
+    "/{age_group}",
+    response_model=List[FoodSchema],
+    dependencies=[conditional(reference_cache_version(food_list_version))],
+)
 def list_foods(
     age_group: FoodAgeGroupEnum,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     crud.seed_food_master(db)
-    return crud.list_foods_by_age_group(db, age_group)
+    return trusted_list_response(FoodSchema, crud.list_foods_by_age_group(db, age_group))
 
 
-@router.get("/child/{child_id}", response_model=List[FoodSchema])
+@router.get(
+    "/child/{child_id}",
+    response_model=List[FoodSchema],
+    dependencies=[conditional(child_cache_version(child_food_list_version))],
+)
 def list_foods_for_child(
     child_id: int,
     db: Session = Depends(get_db),
@@ -49,4 +60,4 @@ def list_foods_for_child(
         'SchoolAge': FoodAgeGroupEnum.SCHOOLAGE,
     }
     food_group = gmap.get(group.value if hasattr(group, 'value') else str(group)) or FoodAgeGroupEnum.ALL
-    return crud.list_foods_by_age_group(db, food_group)
+    return trusted_list_response(FoodSchema, crud.list_foods_by_age_group(db, food_group))
@@ -1,9 +1,11 @@
 from typing import List, Literal
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.apis.deps import get_current_user, get_db
-from app.db import crud
+from app.apis.deps import get_async_db, get_current_user, get_db
+from app.core.responses import trusted_list_response
+from app.db import crud, crud_async
 from app.schemas.schemas import (
     ChildIllnessLog,
     ChildIllnessLogCreate,
@@ -37,31 +39,32 @@ def create_illness_log(
 
 
 @router.get("/list/{child_id}", response_model=List[ChildIllnessLog])
-def list_illness_logs(
+async def list_illness_logs(
     child_id: int,
     status_filter: Literal['current','resolved','history','all'] = Query('all', alias='status'),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
     parent = _require_parent(current_user)
-    child = crud.get_child_by_id_and_parent(db, child_id=child_id, parent_id=parent.parent_id)
+    child = await crud_async.get_child_by_id_and_parent(db, child_id=child_id, parent_id=parent.parent_id)
     if not child:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
-    return crud.list_child_illness_logs(db, child_id=child_id, status=status_filter)
+    rows = await crud_async.list_child_illness_logs(db, child_id=child_id, status=status_filter)
+    return trusted_list_response(ChildIllnessLog, rows)
 
 
 @router.get("/get/{log_id}", response_model=ChildIllnessLog)
-def get_illness_log(
+async def get_illness_log(
     log_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
     parent = _require_parent(current_user)
-    row = crud.get_child_illness_log_by_id(db, log_id=log_id)
+    row = await crud_async.get_child_illness_log_by_id(db, log_id=log_id)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Log not found")
     # ensure ownership
-    child = crud.get_child_by_id_and_parent(db, child_id=row.child_id, parent_id=parent.parent_id)
+    child = await crud_async.get_child_by_id_and_parent(db, child_id=row.child_id, parent_id=parent.parent_id)
     if not child:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found for this log")
     return row
@@ -10,7 +10,7 @@ from app.apis.deps import get_db, get_current_user
 from app.db import crud
 from app.db import crud_nutrition
 from app.models.models import Parent as ParentModel
-from app.schemas.schemas import WeeklyNutritionSummaryResponse
+from app.schemas.schemas import NutritionHistoryResponse, WeeklyNutritionSummaryResponse
 
 router = APIRouter()
 
@@ -46,6 +46,22 @@ def get_child_weekly_nutrition_summary(
     return summary
 
 
+@router.get("/child/{child_id}/history", response_model=NutritionHistoryResponse)
+def get_child_nutrition_history(
+    child_id: int,
+    weeks: int = Query(12, ge=1, le=104),
+    end: Optional[date] = Query(None, description="A day in the last week to include (default today)"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    parent = _require_parent(current_user)
+    db_child = crud.get_child_by_id_and_parent(db, child_id=child_id, parent_id=parent.parent_id)
+    if not db_child:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized for this child")
+
+    return crud_nutrition.get_child_nutrition_history(db, child=db_child, weeks=weeks, end=end)
+
+
 @router.post("/seed-recipes", response_model=dict)
 def seed_nutrition_recipes(
     db: Session = Depends(get_db),
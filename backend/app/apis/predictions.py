@@ -1,17 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, text
 from sqlalchemy.orm import Session
 
-from app.apis.deps import get_current_user, get_db
+from app.apis.deps import child_cache_version, get_current_user, get_db
+from app.db.session import SessionLocal
 from app.db import crud
-from app.models.models import Parent as ParentModel, ChildPredictionReport, ChildMealLog as ChildMealLogModel
+from app.db.crud_changes import record_change
+from app.db.crud_versions import prediction_reports_version
+from app.core.http_cache import conditional
+from app.core.metrics import prediction_requests_total, prediction_stage_seconds
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, keyset_after, keyset_before
+from app.core.responses import dumps, trusted_list_response, trusted_rows
+from app.core.single_flight import SingleFlight
+from app.models.models import Parent as ParentModel, ChildPredictionReport
 from app.schemas.schemas import (
+    ChangeEntityEnum,
     VaccinationAgeGroupEnum,
     ChildPredictionResponse,
     PredictionDataframe,
     ChildPredictionReportBase,
     ChildPredictionTrendPoint,
 )
-from app.services.prediction_common import build_features_for_group, dataframe_for_model
+from app.services.prediction_common import (
+    REPORT_PREDICTION_FIELDS,
+    build_features_for_group,
+    dataframe_for_model,
+    feature_fingerprint,
+    finalize_predictions,
+    prediction_report_values,
+)
+from app.services.downsampling import lttb_indices
 from app.services.prediction_infant import predict_infant, INFANT_FEATURES
 from app.services.prediction_toddler import predict_toddler, TODDLER_FEATURES
 from app.services.prediction_preschool import predict_preschool, PRESCHOOL_FEATURES
@@ -70,31 +91,160 @@ def _milestone_delay_flag(p):
     return "High delay risk"
 
 
-def _add_prediction_flags(row):
-    try:
-        setattr(row, "weight_zscore_flag", _zscore_flag(getattr(row, "weight_zscore", None)))
-    except Exception:
-        pass
+# Probabilities below these thresholds are hidden from parents
+_ILLNESS_PROB_FIELDS = ("prob_fever", "prob_cold", "prob_diarrhea")
+_ILLNESS_PROB_MIN = 0.5
+_MILESTONE_PROB_FIELDS = (
+    "milestone_sit_delay_prob",
+    "milestones_language_delay_prob",
+    "milestones_walking_delay_prob",
+    "milestone_speech_delay_prob",
+    "milestone_social_play_delay_prob",
+    "milestone_learning_delay_prob",
+    "milestone_social_skill_delay_prob",
+)
+_MILESTONE_PROB_MIN = 0.3
+
+_FEEDING_TYPE_LABELS = {
+    VaccinationAgeGroupEnum.INFANT: {0: "Breastmilk", 1: "Formula", 2: "Mixed"},
+    VaccinationAgeGroupEnum.TODDLER: {0: "FamilyFood", 1: "Mixed", 2: "Milk"},
+    VaccinationAgeGroupEnum.PRESCHOOL: {0: "FamilyFood", 1: "Mixed"},
+}
+_DEFAULT_FEEDING_TYPE_LABELS = {0: "FamilyFood"}  # SCHOOL_AGE or anything else
+_VACCINATION_STATUS_LABELS = {0: "Up-to-date", 1: "Partial", 2: "Delayed"}
+_NUTRITION_FLAG_LABELS = {0: "Normal", 1: "Nutrition risk"}
+
+# Only the columns the report/trend responses read; listings never load full rows
+_REPORT_COLUMNS = tuple(
+    getattr(ChildPredictionReport, name)
+    for name in (
+        "id",
+        "child_id",
+        "age_group",
+        "created_at",
+        "age_days",
+        "age_months",
+        "weight_kg",
+        "height_cm",
+        "muac_cm",
+        "sleep_hours",
+        "bmi",
+        "weight_zscore",
+        "height_zscore",
+        "avg_weight_gain",
+        "weight_velocity",
+        "feeding_type",
+        "feeding_frequency",
+        "vaccination_status",
+        "illness_fever",
+        "illness_cold",
+        "illness_diarrhea",
+        "growth_percentile",
+        "nutrition_flag",
+        *_ILLNESS_PROB_FIELDS,
+        *_MILESTONE_PROB_FIELDS,
+    )
+)
+_TREND_COLUMNS = tuple(
+    getattr(ChildPredictionReport, name)
+    for name in (
+        "id",
+        "created_at",
+        "age_group",
+        "age_days",
+        "age_months",
+        "age_years",
+        "weight_kg",
+        "height_cm",
+        "bmi",
+        "growth_percentile",
+        "nutrition_flag",
+    )
+)
+
+
+def _prediction_flags(values) -> dict:
+    """Parent-friendly flags derived from (already masked) report values."""
+    return {
+        "weight_zscore_flag": _zscore_flag(values.get("weight_zscore")),
+        "height_zscore_flag": _zscore_flag(values.get("height_zscore")),
+        "fever_risk_flag": _illness_risk_flag(values.get("prob_fever")),
+        "cold_risk_flag": _illness_risk_flag(values.get("prob_cold")),
+        "diarrhea_risk_flag": _illness_risk_flag(values.get("prob_diarrhea")),
+        "milestone_sit_delay_flag": _milestone_delay_flag(values.get("milestone_sit_delay_prob")),
+        "milestones_language_delay_flag": _milestone_delay_flag(values.get("milestones_language_delay_prob")),
+        "milestones_walking_delay_flag": _milestone_delay_flag(values.get("milestones_walking_delay_prob")),
+        "milestone_speech_delay_flag": _milestone_delay_flag(values.get("milestone_speech_delay_prob")),
+        "milestone_social_play_delay_flag": _milestone_delay_flag(values.get("milestone_social_play_delay_prob")),
+        "milestone_learning_delay_flag": _milestone_delay_flag(values.get("milestone_learning_delay_prob")),
+        "milestone_social_skill_delay_flag": _milestone_delay_flag(values.get("milestone_social_skill_delay_prob")),
+    }
+
+
+def _mask_below(value, threshold: float):
     try:
-        setattr(row, "height_zscore_flag", _zscore_flag(getattr(row, "height_zscore", None)))
-    except Exception:
+        if value is not None and float(value) < threshold:
+            return None
+    except (TypeError, ValueError):
         pass
+    return value
+
+
+def _label(mapping: dict, value):
     try:
-        setattr(row, "fever_risk_flag", _illness_risk_flag(getattr(row, "prob_fever", None)))
-        setattr(row, "cold_risk_flag", _illness_risk_flag(getattr(row, "prob_cold", None)))
-        setattr(row, "diarrhea_risk_flag", _illness_risk_flag(getattr(row, "prob_diarrhea", None)))
-    except Exception:
-        pass
+        return mapping.get(int(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _present_report(values, *, zero_infant_muac: bool = False) -> dict:
+    """Masked, labelled response dict for one projected report row (input is not modified)."""
+    out = dict(values)
+    if zero_infant_muac:
+        # MUAC is not meaningful under 6 months; single-report views show 0
+        age_months = None
+        try:
+            if out.get("age_months") is not None:
+                age_months = int(out["age_months"])
+            elif out.get("age_days") is not None:
+                age_months = int(out["age_days"] / 30.44)
+        except (TypeError, ValueError):
+            age_months = None
+        if age_months is not None and age_months < 6:
+            out["muac_cm"] = 0.0
+
+    # Hide low illness risks and milestone delay probabilities in response
+    for name in _ILLNESS_PROB_FIELDS:
+        out[name] = _mask_below(out.get(name), _ILLNESS_PROB_MIN)
+    for name in _MILESTONE_PROB_FIELDS:
+        out[name] = _mask_below(out.get(name), _MILESTONE_PROB_MIN)
+
+    # After masking, derive parent-friendly flags from the remaining probabilities
+    out.update(_prediction_flags(out))
+    out["feeding_type_label"] = _label(
+        _FEEDING_TYPE_LABELS.get(out.get("age_group"), _DEFAULT_FEEDING_TYPE_LABELS), out.get("feeding_type")
+    )
+    out["vaccination_status_label"] = _label(_VACCINATION_STATUS_LABELS, out.get("vaccination_status"))
+    out["nutrition_flag_label"] = _label(_NUTRITION_FLAG_LABELS, out.get("nutrition_flag"))
+    return out
+
+
+def _parse_cursor(value: str | None, name: str):
+    if value is None:
+        return None
     try:
-        setattr(row, "milestone_sit_delay_flag", _milestone_delay_flag(getattr(row, "milestone_sit_delay_prob", None)))
-        setattr(row, "milestones_language_delay_flag", _milestone_delay_flag(getattr(row, "milestones_language_delay_prob", None)))
-        setattr(row, "milestones_walking_delay_flag", _milestone_delay_flag(getattr(row, "milestones_walking_delay_prob", None)))
-        setattr(row, "milestone_speech_delay_flag", _milestone_delay_flag(getattr(row, "milestone_speech_delay_prob", None)))
-        setattr(row, "milestone_social_play_delay_flag", _milestone_delay_flag(getattr(row, "milestone_social_play_delay_prob", None)))
-        setattr(row, "milestone_learning_delay_flag", _milestone_delay_flag(getattr(row, "milestone_learning_delay_prob", None)))
-        setattr(row, "milestone_social_skill_delay_flag", _milestone_delay_flag(getattr(row, "milestone_social_skill_delay_prob", None)))
-    except Exception:
-        pass
+        return decode_cursor(value)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid {name}")
+
+
+def _set_next_cursor(headers: dict, rows: list, limit: int) -> list:
+    """Trim the probe row fetched past `limit` and put the next page cursor in `headers`."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last["created_at"], last["id"])
+    return rows
 
 
 def _require_parent(user):
@@ -103,6 +253,89 @@ def _require_parent(user):
     return user
 
 
+_FEATURES_BY_GROUP = {
+    VaccinationAgeGroupEnum.INFANT: INFANT_FEATURES,
+    VaccinationAgeGroupEnum.TODDLER: TODDLER_FEATURES,
+    VaccinationAgeGroupEnum.PRESCHOOL: PRESCHOOL_FEATURES,
+    VaccinationAgeGroupEnum.SCHOOL_AGE: SCHOOLAGE_FEATURES,
+}
+
+_PREDICTORS = {
+    VaccinationAgeGroupEnum.INFANT: predict_infant,
+    VaccinationAgeGroupEnum.TODDLER: predict_toddler,
+    VaccinationAgeGroupEnum.PRESCHOOL: predict_preschool,
+    VaccinationAgeGroupEnum.SCHOOL_AGE: predict_schoolage,
+}
+
+# In-process coalescing of concurrent POST /predictions/child/{id} calls, keyed
+# by (child_id, feature_hash); other workers are serialized by _lock_fingerprint.
+_prediction_flight = SingleFlight()
+
+
+def _find_report(db: Session, child_id: int, feature_hash: str) -> ChildPredictionReport | None:
+    return (
+        db.query(ChildPredictionReport)
+        .filter(
+            ChildPredictionReport.child_id == child_id,
+            ChildPredictionReport.feature_hash == feature_hash,
+        )
+        .order_by(ChildPredictionReport.created_at.desc(), ChildPredictionReport.id.desc())
+        .first()
+    )
+
+
+def _report_result(report: ChildPredictionReport, outcome: str = "reused") -> dict:
+    return {
+        "preds": {name: getattr(report, name) for name in REPORT_PREDICTION_FIELDS},
+        "report_id": report.id,
+        "created_at": report.created_at,
+        "outcome": outcome,
+    }
+
+
+def _lock_fingerprint(db: Session, child_id: int, feature_hash: str) -> None:
+    """Transaction-scoped Postgres advisory lock on (child_id, feature_hash).
+
+    Serializes the check-then-insert across API workers; released on commit or
+    rollback. Other dialects rely on the in-process single-flight only.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    db.execute(
+        text("SELECT pg_advisory_xact_lock(:child_id, :fingerprint)"),
+        {"child_id": child_id, "fingerprint": int(feature_hash[:8], 16) - 2**31},
+    )
+
+
+def _evaluate_and_store(db: Session, child_id: int, group: VaccinationAgeGroupEnum, features: dict, feature_hash: str) -> dict:
+    _lock_fingerprint(db, child_id, feature_hash)
+    # Another worker may have stored this fingerprint while we waited for the lock
+    existing = _find_report(db, child_id, feature_hash)
+    if existing is not None:
+        result = _report_result(existing)
+        db.commit()
+        return result
+
+    # Run models to get new predictions based on current features
+    with prediction_stage_seconds.time(stage="inference", age_group=group.value):
+        preds = _PREDICTORS.get(group, predict_schoolage)(features)
+    # Drop delay probabilities for achieved milestones; round scores for compact storage/display
+    preds = finalize_predictions(features, preds)
+
+    # Persist a unified prediction report row for potential retraining
+    report = ChildPredictionReport(
+        **prediction_report_values(child_id, group, features, preds, feature_hash=feature_hash)
+    )
+    with prediction_stage_seconds.time(stage="persistence", age_group=group.value):
+        db.add(report)
+        db.flush()
+        record_change(db, ChangeEntityEnum.PREDICTION_REPORT, child_id=child_id, entity_id=report.id)
+        db.commit()
+    result = _report_result(report, outcome="computed")
+    result["preds"] = preds
+    return result
+
+
 @router.post("/child/{child_id}", response_model=ChildPredictionResponse)
 def get_predictions_for_child(
     child_id: int,
@@ -115,7 +348,8 @@ def get_predictions_for_child(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
     try:
         group = crud.compute_child_age_group(db_child.date_of_birth)
-        features, info = build_features_for_group(db, db_child, group)
+        with prediction_stage_seconds.time(stage="feature_build", age_group=group.value):
+            features, info = build_features_for_group(db, db_child, group)
         required_missing = info.get("required_missing", [])
         # If required inputs are missing, return a 422 error with details
         if required_missing:
@@ -128,220 +362,35 @@ def get_predictions_for_child(
                     "is_existing": bool(info.get("is_existing", False)),
                 },
             )
-        # Check latest existing prediction report for this child
-        last_report: ChildPredictionReport | None = (
-            db.query(ChildPredictionReport)
-            .filter(ChildPredictionReport.child_id == child_id)
-            .order_by(ChildPredictionReport.created_at.desc())
-            .first()
-        )
-
-        # Fields that should trigger a re-prediction if changed (exclude age fields)
-        change_sensitive_fields = [
-            "is_existing",
-            "sex",
-            "weight_kg",
-            "height_cm",
-            "muac_cm",
-            "bmi",
-            "weight_zscore",
-            "height_zscore",
-            "feeding_type",
-            "feeding_frequency",
-            "vaccination_status",
-            "sleep_hours",
-            "illness_fever",
-            "illness_cold",
-            "illness_diarrhea",
-            "milestone_smile",
-            "milestone_roll",
-            "milestone_sit",
-            "milestones_language",
-            "milestones_walking",
-            "milestone_speech_clarity",
-            "milestone_social_play",
-            "milestone_learning_skill",
-            "milestone_social_skill",
-            "avg_weight_gain",
-            "weight_velocity",
-            "illness_freq_trend",
-        ]
-
-        use_cached = False
-        if last_report is not None and last_report.age_group == group:
-            # Compare non-age inputs; if all equal, we can reuse the last predictions
-            use_cached = True
-            for field in change_sensitive_fields:
-                if features.get(field) != getattr(last_report, field):
-                    use_cached = False
-                    break
-
-            # Additionally, if there are newer meal logs than the last report,
-            # force a fresh prediction so food pattern changes are reflected.
-            if use_cached:
-                latest_meal_log = (
-                    db.query(ChildMealLogModel)
-                    .filter(ChildMealLogModel.child_id == child_id)
-                    .order_by(ChildMealLogModel.created_at.desc())
-                    .first()
-                )
-                if latest_meal_log is not None and latest_meal_log.created_at > last_report.created_at:
-                    use_cached = False
-
-        # Route to category-specific predictors (or reuse cached predictions)
-        if group == VaccinationAgeGroupEnum.INFANT:
-            expected_cols = INFANT_FEATURES
-        elif group == VaccinationAgeGroupEnum.TODDLER:
-            expected_cols = TODDLER_FEATURES
-        elif group == VaccinationAgeGroupEnum.PRESCHOOL:
-            expected_cols = PRESCHOOL_FEATURES
+        # Reuse the latest report built from an identical feature vector (same
+        # model inputs incl. age, age group and model files) -- one (child_id, feature_hash) lookup
+        feature_hash = feature_fingerprint(group, features)
+        last_report = _find_report(db, child_id, feature_hash)
+        if last_report is not None:
+            result = _report_result(last_report)
+            prediction_requests_total.inc(result="reused")
         else:
-            expected_cols = SCHOOLAGE_FEATURES
-        if use_cached and last_report is not None:
-            # Reuse last predictions; only age fields may differ
-            preds = {
-                "growth_percentile": last_report.growth_percentile,
-                "nutrition_flag": last_report.nutrition_flag,
-                "prob_fever": last_report.prob_fever,
-                "prob_cold": last_report.prob_cold,
-                "prob_diarrhea": last_report.prob_diarrhea,
-                "milestone_sit_delay_prob": last_report.milestone_sit_delay_prob,
-                "milestones_language_delay_prob": last_report.milestones_language_delay_prob,
-                "milestones_walking_delay_prob": last_report.milestones_walking_delay_prob,
-                "milestone_speech_delay_prob": last_report.milestone_speech_delay_prob,
-                "milestone_social_play_delay_prob": last_report.milestone_social_play_delay_prob,
-                "milestone_learning_delay_prob": last_report.milestone_learning_delay_prob,
-                "milestone_social_skill_delay_prob": last_report.milestone_social_skill_delay_prob,
-            }
-        else:
-            # Run models to get new predictions based on current features
-            if group == VaccinationAgeGroupEnum.INFANT:
-                preds = predict_infant(features)
-            elif group == VaccinationAgeGroupEnum.TODDLER:
-                preds = predict_toddler(features)
-            elif group == VaccinationAgeGroupEnum.PRESCHOOL:
-                preds = predict_preschool(features)
-            else:
-                preds = predict_schoolage(features)
-
-        # If a milestone is already archived (flag = 1), do not keep its delay probability
-        milestone_flag_to_prob = {
-            "milestone_sit": "milestone_sit_delay_prob",
-            "milestones_language": "milestones_language_delay_prob",
-            "milestones_walking": "milestones_walking_delay_prob",
-            "milestone_speech_clarity": "milestone_speech_delay_prob",
-            "milestone_social_play": "milestone_social_play_delay_prob",
-            "milestone_learning_skill": "milestone_learning_delay_prob",
-            "milestone_social_skill": "milestone_social_skill_delay_prob",
-        }
-        for flag_field, prob_field in milestone_flag_to_prob.items():
-            try:
-                if features.get(flag_field) == 1:
-                    preds[prob_field] = None
-            except Exception:
-                # If anything goes wrong, fail silently and keep existing value
-                continue
+            # Concurrent requests for the same child and inputs share one evaluation
+            result, shared = _prediction_flight.do(
+                (child_id, feature_hash),
+                lambda: _evaluate_and_store(db, db_child.child_id, group, features, feature_hash),
+            )
+            prediction_requests_total.inc(result="shared" if shared else result["outcome"])
 
         # Build a DataFrame-like payload with ordered model features and predictions
+        expected_cols = _FEATURES_BY_GROUP.get(group, SCHOOLAGE_FEATURES)
+        preds = result["preds"]
         df = dataframe_for_model(features, expected_cols)
         feature_values = list(map(lambda x: x if x is not None else 0, df.iloc[0].tolist()))
 
-        # Round key prediction outputs to 3 decimal places for compact storage/display
-        def _round_pred_value(name: str, value):
-            if value is None:
-                return None
-            # Integers (e.g., nutrition_flag) are left as-is
-            if name in {"nutrition_flag"}:
-                return value
-            # Main probability / score outputs -> 3 decimals
-            if name in {
-                "growth_percentile",
-                "prob_fever",
-                "prob_cold",
-                "prob_diarrhea",
-                "milestone_sit_delay_prob",
-                "milestones_language_delay_prob",
-                "milestones_walking_delay_prob",
-                "milestone_speech_delay_prob",
-                "milestone_social_play_delay_prob",
-                "milestone_learning_delay_prob",
-                "milestone_social_skill_delay_prob",
-            }:
-                try:
-                    return round(float(value), 3)
-                except (TypeError, ValueError):
-                    return value
-            return value
-
-        preds = {k: _round_pred_value(k, v) for k, v in preds.items()}
-
         pred_cols = list(preds.keys())
         pred_values = [preds[k] for k in pred_cols]
         combined_columns = expected_cols + pred_cols
         combined_values = feature_values + pred_values
 
         dataframe_payload = PredictionDataframe(columns=combined_columns, values=[combined_values])
-
-        # Persist a unified prediction report row for potential retraining
-        if not use_cached:
-            report = ChildPredictionReport(
-                child_id=db_child.child_id,
-                age_group=group,
-                is_existing=features.get("is_existing"),
-                age_days=features.get("age_days"),
-                age_months=features.get("age_months"),
-                age_years=features.get("age_years"),
-                sex=features.get("sex"),
-                weight_kg=features.get("weight_kg"),
-                height_cm=features.get("height_cm"),
-                muac_cm=features.get("muac_cm"),
-                bmi=features.get("bmi"),
-                weight_zscore=features.get("weight_zscore"),
-                height_zscore=features.get("height_zscore"),
-                feeding_type=features.get("feeding_type"),
-                feeding_frequency=features.get("feeding_frequency"),
-                vaccination_status=features.get("vaccination_status"),
-                sleep_hours=features.get("sleep_hours"),
-                illness_fever=features.get("illness_fever"),
-                illness_cold=features.get("illness_cold"),
-                illness_diarrhea=features.get("illness_diarrhea"),
-                milestone_smile=features.get("milestone_smile"),
-                milestone_roll=features.get("milestone_roll"),
-                milestone_sit=features.get("milestone_sit"),
-                milestones_language=features.get("milestones_language"),
-                milestones_walking=features.get("milestones_walking"),
-                milestone_speech_clarity=features.get("milestone_speech_clarity"),
-                milestone_social_play=features.get("milestone_social_play"),
-                milestone_learning_skill=features.get("milestone_learning_skill"),
-                milestone_social_skill=features.get("milestone_social_skill"),
-                avg_weight_gain=features.get("avg_weight_gain"),
-                weight_velocity=features.get("weight_velocity"),
-                illness_freq_trend=features.get("illness_freq_trend"),
-                growth_percentile=preds.get("growth_percentile"),
-                nutrition_flag=preds.get("nutrition_flag"),
-                prob_fever=preds.get("prob_fever"),
-                prob_cold=preds.get("prob_cold"),
-                prob_diarrhea=preds.get("prob_diarrhea"),
-                milestone_sit_delay_prob=preds.get("milestone_sit_delay_prob"),
-                milestones_language_delay_prob=preds.get("milestones_language_delay_prob"),
-                milestones_walking_delay_prob=preds.get("milestones_walking_delay_prob"),
-                milestone_speech_delay_prob=preds.get("milestone_speech_delay_prob"),
-                milestone_social_play_delay_prob=preds.get("milestone_social_play_delay_prob"),
-                milestone_learning_delay_prob=preds.get("milestone_learning_delay_prob"),
-                milestone_social_skill_delay_prob=preds.get("milestone_social_skill_delay_prob"),
-            )
-            db.add(report)
-            db.commit()
-            report_id = report.id
-            created_at = report.created_at
-        else:
-            # Using cached report
-            if last_report is not None:
-                report_id = last_report.id
-                created_at = last_report.created_at
-            else:
-                report_id = None
-                created_at = None
+        report_id = result["report_id"]
+        created_at = result["created_at"]
 
         return ChildPredictionResponse(
             age_group=info.get("age_group"),
@@ -357,9 +406,20 @@ def get_predictions_for_child(
         raise HTTPException(status_code=500, detail=f"Prediction failed: {e}")
 
 
-@router.get("/child/{child_id}/reports", response_model=list[ChildPredictionReportBase])
+# Report reads all depend only on the child's (insert-only) report rows
+_reports_cache = conditional(child_cache_version(prediction_reports_version))
+
+
+@router.get(
+    "/child/{child_id}/reports",
+    response_model=list[ChildPredictionReportBase],
+    dependencies=[_reports_cache],
+)
 def list_prediction_reports_for_child(
     child_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page (older reports)"),
+    since: str | None = Query(None, description="Only reports newer than this cursor"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -367,92 +427,31 @@ def list_prediction_reports_for_child(
     db_child = crud.get_child_by_id_and_parent(db, child_id=child_id, parent_id=parent.parent_id)
     if not db_child:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
-    rows: list[ChildPredictionReport] = (
-        db.query(ChildPredictionReport)
-        .filter(ChildPredictionReport.child_id == child_id)
-        .order_by(ChildPredictionReport.created_at.desc())
-        .all()
+    # Newest first; keyset on (created_at, id) so deep pages cost the same as the first
+    stmt = (
+        select(*_REPORT_COLUMNS)
+        .where(ChildPredictionReport.child_id == child_id)
+        .order_by(ChildPredictionReport.created_at.desc(), ChildPredictionReport.id.desc())
+        .limit(limit + 1)
     )
+    before = _parse_cursor(cursor, "cursor")
+    if before is not None:
+        stmt = stmt.where(keyset_before(ChildPredictionReport.created_at, ChildPredictionReport.id, before))
+    after = _parse_cursor(since, "since")
+    if after is not None:
+        stmt = stmt.where(keyset_after(ChildPredictionReport.created_at, ChildPredictionReport.id, after))
+    headers = {}
+    rows = _set_next_cursor(headers, db.execute(stmt).mappings().all(), limit)
     # Mask low illness probabilities (<0.5) and milestone delay probabilities (<0.3),
     # and then add human-readable labels and flags
-    masked: list[ChildPredictionReport] = []
-    for r in rows:
-        # Hide low illness risks and milestone delay probabilities in response
-        for attr in ("prob_fever", "prob_cold", "prob_diarrhea"):
-            try:
-                v = getattr(r, attr)
-                if v is not None and float(v) < 0.5:
-                    setattr(r, attr, None)
-            except (TypeError, ValueError):
-                continue
-
-        # Milestone delay probabilities: hide if < 0.3 (30%)
-        for attr in (
-            "milestone_sit_delay_prob",
-            "milestones_language_delay_prob",
-            "milestones_walking_delay_prob",
-            "milestone_speech_delay_prob",
-            "milestone_social_play_delay_prob",
-            "milestone_learning_delay_prob",
-            "milestone_social_skill_delay_prob",
-        ):
-            try:
-                v = getattr(r, attr)
-                if v is not None and float(v) < 0.3:
-                    setattr(r, attr, None)
-            except (TypeError, ValueError):
-                continue
-
-        # After masking, derive parent-friendly flags from the remaining probabilities
-        _add_prediction_flags(r)
-
-        # Feeding type label per age group
-        ft = r.feeding_type
-        ag = r.age_group
-        label = None
-        try:
-            # VaccinationAgeGroupEnum is used on the model
-            if ag == VaccinationAgeGroupEnum.INFANT:
-                mapping = {0: "Breastmilk", 1: "Formula", 2: "Mixed"}
-            elif ag == VaccinationAgeGroupEnum.TODDLER:
-                mapping = {0: "FamilyFood", 1: "Mixed", 2: "Milk"}
-            elif ag == VaccinationAgeGroupEnum.PRESCHOOL:
-                mapping = {0: "FamilyFood", 1: "Mixed"}
-            else:  # SCHOOL_AGE or anything else
-                mapping = {0: "FamilyFood"}
-            if ft is not None:
-                label = mapping.get(int(ft))
-        except Exception:
-            label = None
-        setattr(r, "feeding_type_label", label)
-
-        # Vaccination status label (0=Up-to-date, 1=Partial, 2=Delayed)
-        vs = r.vaccination_status
-        vs_label = None
-        try:
-            vs_mapping = {0: "Up-to-date", 1: "Partial", 2: "Delayed"}
-            if vs is not None:
-                vs_label = vs_mapping.get(int(vs))
-        except Exception:
-            vs_label = None
-        setattr(r, "vaccination_status_label", vs_label)
-
-        # Nutrition flag label (0=Normal, 1=Nutrition risk)
-        nf = r.nutrition_flag
-        nf_label = None
-        try:
-            nf_mapping = {0: "Normal", 1: "Nutrition risk"}
-            if nf is not None:
-                nf_label = nf_mapping.get(int(nf))
-        except Exception:
-            nf_label = None
-        setattr(r, "nutrition_flag_label", nf_label)
-
-        masked.append(r)
-    return masked
+    return trusted_list_response(ChildPredictionReportBase, map(_present_report, rows), headers=headers)
 
 
-@router.get("/child/{child_id}/reports/{report_id}", response_model=ChildPredictionReportBase)
+@router.get(
+    "/child/{child_id}/reports/{report_id}",
+    response_model=ChildPredictionReportBase,
+    dependencies=[_reports_cache],
+)
 def get_prediction_report(
     child_id: int,
     report_id: int,
@@ -463,101 +462,22 @@ def get_prediction_report(
     db_child = crud.get_child_by_id_and_parent(db, child_id=child_id, parent_id=parent.parent_id)
     if not db_child:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
-    row: ChildPredictionReport | None = (
-        db.query(ChildPredictionReport)
-        .filter(
+    row = db.execute(
+        select(*_REPORT_COLUMNS).where(
             ChildPredictionReport.child_id == child_id,
             ChildPredictionReport.id == report_id,
         )
-        .first()
-    )
+    ).mappings().first()
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prediction report not found")
-    age_months = None
-    try:
-        if row.age_months is not None:
-            age_months = int(row.age_months)
-        elif row.age_days is not None:
-            age_months = int(row.age_days / 30.44)
-    except Exception:
-        age_months = None
-    if age_months is not None and age_months < 6:
-        try:
-            setattr(row, "muac_cm", 0.0)
-        except Exception:
-            pass
-    for attr in ("prob_fever", "prob_cold", "prob_diarrhea"):
-        try:
-            v = getattr(row, attr)
-            if v is not None and float(v) < 0.5:
-                setattr(row, attr, None)
-        except (TypeError, ValueError):
-            continue
-
-    for attr in (
-        "milestone_sit_delay_prob",
-        "milestones_language_delay_prob",
-        "milestones_walking_delay_prob",
-        "milestone_speech_delay_prob",
-        "milestone_social_play_delay_prob",
-        "milestone_learning_delay_prob",
-        "milestone_social_skill_delay_prob",
-    ):
-        try:
-            v = getattr(row, attr)
-            if v is not None and float(v) < 0.3:
-                setattr(row, attr, None)
-        except (TypeError, ValueError):
-            continue
-
-    # After masking, derive parent-friendly flags from the remaining probabilities
-    _add_prediction_flags(row)
-
-    # Feeding type label per age group
-    ft = row.feeding_type
-    ag = row.age_group
-    label = None
-    try:
-        if ag == VaccinationAgeGroupEnum.INFANT:
-            mapping = {0: "Breastmilk", 1: "Formula", 2: "Mixed"}
-        elif ag == VaccinationAgeGroupEnum.TODDLER:
-            mapping = {0: "FamilyFood", 1: "Mixed", 2: "Milk"}
-        elif ag == VaccinationAgeGroupEnum.PRESCHOOL:
-            mapping = {0: "FamilyFood", 1: "Mixed"}
-        else:  # SCHOOL_AGE or anything else
-            mapping = {0: "FamilyFood"}
-        if ft is not None:
-            label = mapping.get(int(ft))
-    except Exception:
-        label = None
-    setattr(row, "feeding_type_label", label)
-
-    # Vaccination status label (0=Up-to-date, 1=Partial, 2=Delayed)
-    vs = row.vaccination_status
-    vs_label = None
-    try:
-        vs_mapping = {0: "Up-to-date", 1: "Partial", 2: "Delayed"}
-        if vs is not None:
-            vs_label = vs_mapping.get(int(vs))
-    except Exception:
-        vs_label = None
-    setattr(row, "vaccination_status_label", vs_label)
-
-    # Nutrition flag label (0=Normal, 1=Nutrition risk)
-    nf = row.nutrition_flag
-    nf_label = None
-    try:
-        nf_mapping = {0: "Normal", 1: "Nutrition risk"}
-        if nf is not None:
-            nf_label = nf_mapping.get(int(nf))
-    except Exception:
-        nf_label = None
-    setattr(row, "nutrition_flag_label", nf_label)
+    return _present_report(row, zero_infant_muac=True)
 
-    return row
 
-
-@router.get("/child/{child_id}/latest-report", response_model=ChildPredictionReportBase)
+@router.get(
+    "/child/{child_id}/latest-report",
+    response_model=ChildPredictionReportBase,
+    dependencies=[_reports_cache],
+)
 def get_latest_prediction_report_for_child(
     child_id: int,
     db: Session = Depends(get_db),
@@ -567,101 +487,157 @@ def get_latest_prediction_report_for_child(
     db_child = crud.get_child_by_id_and_parent(db, child_id=child_id, parent_id=parent.parent_id)
     if not db_child:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
-    row: ChildPredictionReport | None = (
-        db.query(ChildPredictionReport)
-        .filter(ChildPredictionReport.child_id == child_id)
-        .order_by(ChildPredictionReport.created_at.desc())
-        .first()
-    )
+    row = db.execute(
+        select(*_REPORT_COLUMNS)
+        .where(ChildPredictionReport.child_id == child_id)
+        .order_by(ChildPredictionReport.created_at.desc(), ChildPredictionReport.id.desc())
+        .limit(1)
+    ).mappings().first()
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prediction report not found")
-    age_months = None
-    try:
-        if row.age_months is not None:
-            age_months = int(row.age_months)
-        elif row.age_days is not None:
-            age_months = int(row.age_days / 30.44)
-    except Exception:
-        age_months = None
-    if age_months is not None and age_months < 6:
-        try:
-            setattr(row, "muac_cm", 0.0)
-        except Exception:
-            pass
-    for attr in ("prob_fever", "prob_cold", "prob_diarrhea"):
-        try:
-            v = getattr(row, attr)
-            if v is not None and float(v) < 0.5:
-                setattr(row, attr, None)
-        except (TypeError, ValueError):
-            continue
-
-    for attr in (
-        "milestone_sit_delay_prob",
-        "milestones_language_delay_prob",
-        "milestones_walking_delay_prob",
-        "milestone_speech_delay_prob",
-        "milestone_social_play_delay_prob",
-        "milestone_learning_delay_prob",
-        "milestone_social_skill_delay_prob",
-    ):
-        try:
-            v = getattr(row, attr)
-            if v is not None and float(v) < 0.3:
-                setattr(row, attr, None)
-        except (TypeError, ValueError):
-            continue
+    return _present_report(row, zero_infant_muac=True)
 
-    # After masking, derive parent-friendly flags from the remaining probabilities
-    _add_prediction_flags(row)
 
-    # Feeding type label per age group
-    ft = row.feeding_type
-    ag = row.age_group
-    label = None
-    try:
-        if ag == VaccinationAgeGroupEnum.INFANT:
-            mapping = {0: "Breastmilk", 1: "Formula", 2: "Mixed"}
-        elif ag == VaccinationAgeGroupEnum.TODDLER:
-            mapping = {0: "FamilyFood", 1: "Mixed", 2: "Milk"}
-        elif ag == VaccinationAgeGroupEnum.PRESCHOOL:
-            mapping = {0: "FamilyFood", 1: "Mixed"}
-        else:  # SCHOOL_AGE or anything else
-            mapping = {0: "FamilyFood"}
-        if ft is not None:
-            label = mapping.get(int(ft))
-    except Exception:
-        label = None
-    setattr(row, "feeding_type_label", label)
-
-    # Vaccination status label (0=Up-to-date, 1=Partial, 2=Delayed)
-    vs = row.vaccination_status
-    vs_label = None
-    try:
-        vs_mapping = {0: "Up-to-date", 1: "Partial", 2: "Delayed"}
-        if vs is not None:
-            vs_label = vs_mapping.get(int(vs))
-    except Exception:
-        vs_label = None
-    setattr(row, "vaccination_status_label", vs_label)
-
-    # Nutrition flag label (0=Normal, 1=Nutrition risk)
-    nf = row.nutrition_flag
-    nf_label = None
-    try:
-        nf_mapping = {0: "Normal", 1: "Nutrition risk"}
-        if nf is not None:
-            nf_label = nf_mapping.get(int(nf))
-    except Exception:
-        nf_label = None
-    setattr(row, "nutrition_flag_label", nf_label)
+def _trend_bucket(db: Session, resolution: str, column):
+    """Bucket key for `resolution` (day/week/month): date_trunc on Postgres, date/strftime on SQLite.
+
+    SQLite weeks are keyed by their Monday, like date_trunc('week'), so a week
+    spanning New Year stays one bucket on both dialects.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        if resolution == "week":
+            return func.date(column, "weekday 0", "-6 days")
+        return func.strftime({"day": "%Y-%m-%d", "month": "%Y-%m"}[resolution], column)
+    return func.date_trunc(resolution, column)
+
+
+def _trend_filters(child_id: int, after) -> list:
+    filters = [ChildPredictionReport.child_id == child_id]
+    if after is not None:
+        filters.append(keyset_after(ChildPredictionReport.created_at, ChildPredictionReport.id, after))
+    return filters
+
+
+def _trend_statement(db: Session, filters: list, resolution: str | None):
+    """Trend rows oldest->newest; with a resolution, one aggregated point per bucket.
+
+    A bucket is represented by its latest report (id, created_at, age fields) and
+    carries the bucket's mean measurements and its worst nutrition flag.
+    """
+    if resolution is None:
+        return select(*_TREND_COLUMNS).where(*filters).order_by(
+            ChildPredictionReport.created_at.asc(), ChildPredictionReport.id.asc()
+        )
+    bucket = _trend_bucket(db, resolution, ChildPredictionReport.created_at)
+    agg = (
+        select(
+            bucket.label("bucket"),
+            func.avg(ChildPredictionReport.weight_kg).label("weight_kg"),
+            func.avg(ChildPredictionReport.height_cm).label("height_cm"),
+            func.avg(ChildPredictionReport.bmi).label("bmi"),
+            func.avg(ChildPredictionReport.growth_percentile).label("growth_percentile"),
+            func.max(ChildPredictionReport.nutrition_flag).label("nutrition_flag"),
+        )
+        .where(*filters)
+        .group_by(bucket)
+        .subquery()
+    )
+    # Latest report per bucket by (created_at, id), the order the trend is read in
+    latest = (
+        select(
+            ChildPredictionReport.id,
+            ChildPredictionReport.created_at,
+            ChildPredictionReport.age_group,
+            ChildPredictionReport.age_days,
+            ChildPredictionReport.age_months,
+            ChildPredictionReport.age_years,
+            bucket.label("bucket"),
+            func.row_number()
+            .over(
+                partition_by=bucket,
+                order_by=(ChildPredictionReport.created_at.desc(), ChildPredictionReport.id.desc()),
+            )
+            .label("rank"),
+        )
+        .where(*filters)
+        .subquery()
+    )
+    return (
+        select(
+            latest.c.id,
+            latest.c.created_at,
+            latest.c.age_group,
+            latest.c.age_days,
+            latest.c.age_months,
+            latest.c.age_years,
+            agg.c.weight_kg,
+            agg.c.height_cm,
+            agg.c.bmi,
+            agg.c.growth_percentile,
+            agg.c.nutrition_flag,
+        )
+        .join(agg, agg.c.bucket == latest.c.bucket)
+        .where(latest.c.rank == 1)
+        .order_by(latest.c.created_at.asc(), latest.c.id.asc())
+    )
+
 
-    return row
+def _rounded_trend_point(row) -> dict:
+    point = dict(row)
+    for name in ("weight_kg", "height_cm", "bmi", "growth_percentile"):
+        if point.get(name) is not None:
+            point[name] = round(float(point[name]), 3)
+    return point
 
 
-@router.get("/child/{child_id}/trend", response_model=list[ChildPredictionTrendPoint])
+def _downsample_trend(points: list, max_points: int) -> list:
+    """LTTB over growth percentile (weight when no percentile was predicted)."""
+    if len(points) <= max_points:
+        return points
+    key = "growth_percentile" if any(p.get("growth_percentile") is not None for p in points) else "weight_kg"
+    xs = [p["created_at"].timestamp() for p in points]
+    ys = [p.get(key) for p in points]
+    return [points[i] for i in lttb_indices(xs, ys, max_points)]
+
+
+_TREND_STREAM_BATCH = 500
+
+
+def _stream_trend_json(stmt):
+    """Serialize trend rows as one JSON array while reading them from a server-side cursor.
+
+    Runs after the route returns, so it uses its own session rather than the
+    request's.
+    """
+    db = SessionLocal()
+    try:
+        yield b"["
+        first = True
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=_TREND_STREAM_BATCH))
+        for partition in result.mappings().partitions():
+            chunk = b",".join(dumps(point) for point in trusted_rows(ChildPredictionTrendPoint, partition))
+            yield chunk if first else b"," + chunk
+            first = False
+        yield b"]"
+    finally:
+        db.close()
+
+
+@router.get(
+    "/child/{child_id}/trend",
+    response_model=list[ChildPredictionTrendPoint],
+    dependencies=[_reports_cache],
+)
 def get_prediction_trend_for_child(
     child_id: int,
+    limit: int = Query(500, ge=1, le=2000),
+    since: str | None = Query(None, description="Only points after this cursor (X-Next-Cursor of the previous page)"),
+    resolution: Literal["day", "week", "month"] | None = Query(
+        None, description="Aggregate to one point per calendar day/week/month"
+    ),
+    max_points: int | None = Query(
+        None, ge=3, le=2000, description="Downsample the whole range to at most this many points (LTTB); no paging"
+    ),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -669,34 +645,28 @@ def get_prediction_trend_for_child(
     db_child = crud.get_child_by_id_and_parent(db, child_id=child_id, parent_id=parent.parent_id)
     if not db_child:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
-    # Order oldest->newest for charting
-    rows: list[ChildPredictionReport] = (
-        db.query(ChildPredictionReport)
-        .filter(ChildPredictionReport.child_id == child_id)
-        .order_by(ChildPredictionReport.created_at.asc())
-        .all()
-    )
-    # Only expose fields needed for charts / growth trend
-    points: list[ChildPredictionTrendPoint] = []
-    for r in rows:
-        points.append(
-            ChildPredictionTrendPoint(
-                id=r.id,
-                created_at=r.created_at,
-                age_group=r.age_group,
-                age_days=r.age_days,
-                age_months=r.age_months,
-                age_years=r.age_years,
-                weight_kg=r.weight_kg,
-                height_cm=r.height_cm,
-                bmi=r.bmi,
-                growth_percentile=r.growth_percentile,
-                nutrition_flag=r.nutrition_flag,
-            )
-        )
-    return points
-
-
-
-
-
+    # Order oldest->newest for charting; only the fields needed for charts / growth trend
+    filters = _trend_filters(child_id, _parse_cursor(since, "since"))
+    stmt = _trend_statement(db, filters, resolution)
+
+    if max_points is not None:
+        points = [_rounded_trend_point(r) for r in db.execute(stmt).mappings()]
+        return trusted_list_response(ChildPredictionTrendPoint, _downsample_trend(points, max_points))
+
+    headers = {}
+    if resolution is not None:
+        rows = _set_next_cursor(headers, db.execute(stmt.limit(limit + 1)).mappings().all(), limit)
+        return trusted_list_response(ChildPredictionTrendPoint, map(_rounded_trend_point, rows), headers=headers)
+
+    # Full resolution: stream the page instead of materializing it; a two-row
+    # probe at the page boundary decides the next cursor up front
+    boundary = db.execute(
+        select(ChildPredictionReport.created_at, ChildPredictionReport.id)
+        .where(*filters)
+        .order_by(ChildPredictionReport.created_at.asc(), ChildPredictionReport.id.asc())
+        .offset(limit - 1)
+        .limit(2)
+    ).all()
+    if len(boundary) > 1:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(boundary[0].created_at, boundary[0].id)
+    return StreamingResponse(_stream_trend_json(stmt.limit(limit)), media_type="application/json", headers=headers)
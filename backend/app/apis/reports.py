@@ -2,9 +2,11 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, status
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.apis.deps import get_current_user, get_db
+from app.apis.deps import get_async_db, get_current_user, get_db
+from app.core.responses import trusted_list_response
 from app.models.models import Parent as ParentModel
 from app.schemas.schemas import ChildMedicalReport as ChildMedicalReportSchema, ReportTypeEnum
 from app.services.report_service import ChildReportService
@@ -54,18 +56,19 @@ async def upload_child_report(
 )
 async def list_child_reports(
     child_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
     parent = _require_parent(current_user)
-    return _service.list_reports(db, parent=parent, child_id=child_id)
+    rows = await _service.list_reports_async(db, parent=parent, child_id=child_id)
+    return trusted_list_response(ChildMedicalReportSchema, rows)
 
 
 @router.get(
     "/children/{child_id}/reports/{report_id}",
     response_class=StreamingResponse,
 )
-async def get_child_report(
+def get_child_report(
     child_id: int,
     report_id: int,
     db: Session = Depends(get_db),
@@ -75,7 +78,7 @@ async def get_child_report(
     report = _service.get_report(db, parent=parent, child_id=child_id, report_id=report_id)
     plaintext = _service.load_report_bytes(report)
 
-    async def file_iterator():
+    def file_iterator():
         yield plaintext
 
     return StreamingResponse(file_iterator(), media_type=report.mime_type)
@@ -85,7 +88,7 @@ async def get_child_report(
     "/children/{child_id}/reports/{report_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-async def delete_child_report(
+def delete_child_report(
     child_id: int,
     report_id: int,
     db: Session = Depends(get_db),
@@ -0,0 +1,134 @@
+from typing import Any, Callable, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.apis.deps import get_current_user, get_db
+from app.apis.predictions import _REPORT_COLUMNS, _present_report
+from app.core.config import settings
+from app.db.crud_changes import change_head, format_cursor, parse_cursor, read_changes, valid_cursor
+from app.db.crud_sync import apply_sync_batch
+from app.models.models import (
+    ChildIllnessLog as ChildIllnessLogModel,
+    ChildMedicalReport as ChildMedicalReportModel,
+    ChildMilestoneStatus as ChildMilestoneStatusModel,
+    ChildPredictionReport,
+    ChildVaccineStatus as ChildVaccineStatusModel,
+    Parent as ParentModel,
+)
+from app.schemas.schemas import (
+    ChangeEntityEnum,
+    ChildIllnessLog as ChildIllnessLogSchema,
+    ChildMedicalReport as ChildMedicalReportSchema,
+    ChildMilestoneStatus as ChildMilestoneStatusSchema,
+    ChildPredictionReportBase,
+    ChildVaccineStatus as ChildVaccineStatusSchema,
+    SyncBatchRequest,
+    SyncBatchResponse,
+    SyncChangesResponse,
+    SyncEntryStatusEnum,
+)
+
+router = APIRouter()
+
+
+def _require_parent(user):
+    if not isinstance(user, ParentModel):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only parents can access this endpoint")
+    return user
+
+
+@router.post("/batch", response_model=SyncBatchResponse)
+def sync_batch(
+    payload: SyncBatchRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Apply meal logs, measurements and illness logs recorded offline.
+
+    Each entry carries a client-generated idempotency_key; resending an
+    entry (for example after a timeout) reports it as a duplicate with the
+    original record id. Invalid entries are rejected individually and do not
+    block the rest of the batch.
+    """
+    parent = _require_parent(current_user)
+    if len(payload.entries) > settings.SYNC_MAX_BATCH_ENTRIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.SYNC_MAX_BATCH_ENTRIES} entries per batch",
+        )
+    results = apply_sync_batch(db, parent_id=parent.parent_id, entries=payload.entries)
+    counts = {s: 0 for s in SyncEntryStatusEnum}
+    for r in results:
+        counts[r.status] += 1
+    return {
+        "results": results,
+        "created": counts[SyncEntryStatusEnum.CREATED],
+        "duplicates": counts[SyncEntryStatusEnum.DUPLICATE],
+        "rejected": counts[SyncEntryStatusEnum.REJECTED],
+    }
+
+
+def _orm_loader(model, pk, schema) -> Callable[[Session, List[int]], Dict[int, Dict[str, Any]]]:
+    def load(db: Session, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        rows = db.query(model).filter(pk.in_(ids)).all()
+        return {
+            getattr(r, pk.key): schema.model_validate(r, from_attributes=True).model_dump(mode="json", exclude_none=True)
+            for r in rows
+        }
+    return load
+
+
+def _load_prediction_reports(db: Session, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    rows = db.execute(select(*_REPORT_COLUMNS).where(ChildPredictionReport.id.in_(ids))).mappings().all()
+    return {
+        r["id"]: ChildPredictionReportBase.model_validate(_present_report(r)).model_dump(mode="json", exclude_none=True)
+        for r in rows
+    }
+
+
+# One query per entity type with changes; rows are shaped like the entity's own endpoints
+_LOADERS = {
+    ChangeEntityEnum.ILLNESS_LOG: _orm_loader(ChildIllnessLogModel, ChildIllnessLogModel.id, ChildIllnessLogSchema),
+    ChangeEntityEnum.VACCINE_STATUS: _orm_loader(
+        ChildVaccineStatusModel, ChildVaccineStatusModel.id, ChildVaccineStatusSchema
+    ),
+    ChangeEntityEnum.MILESTONE_STATUS: _orm_loader(
+        ChildMilestoneStatusModel, ChildMilestoneStatusModel.id, ChildMilestoneStatusSchema
+    ),
+    ChangeEntityEnum.PREDICTION_REPORT: _load_prediction_reports,
+    ChangeEntityEnum.MEDICAL_REPORT: _orm_loader(
+        ChildMedicalReportModel, ChildMedicalReportModel.report_id, ChildMedicalReportSchema
+    ),
+}
+
+
+@router.get("/changes", response_model=SyncChangesResponse)
+def sync_changes(
+    cursor: str | None = Query(None, description="cursor from the previous response"),
+    limit: int = Query(500, ge=1, le=2000, description="most change rows read per page"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Illness logs, vaccine and milestone statuses, prediction reports and
+    medical report metadata changed since `cursor`.
+
+    Call without a cursor to get a starting cursor, then load the full
+    lists; anything changed in between is sent again on the next call. Keep
+    calling with the returned cursor while has_more is true.
+    """
+    parent = _require_parent(current_user)
+    position = parse_cursor(cursor)
+    if not valid_cursor(db, position):
+        return {"cursor": format_cursor(change_head(db)), "has_more": False, "reset": True, "changes": {}}
+    page = read_changes(db, parent_id=parent.parent_id, cursor=position, limit=limit)
+    changes = {}
+    for entity_type in ChangeEntityEnum:
+        ids = page.upserts.get(entity_type, [])
+        rows = _LOADERS[entity_type](db, ids) if ids else {}
+        # Rows removed without their own tombstone (e.g. with the child) are sent as deletes
+        deletes = sorted(page.deletes.get(entity_type, []) + [i for i in ids if i not in rows])
+        if rows or deletes:
+            changes[entity_type] = {"upserts": [rows[i] for i in ids if i in rows], "deletes": deletes}
+    return {"cursor": format_cursor(page.cursor), "has_more": page.has_more, "changes": changes}
@@ -25,7 +25,7 @@ async def get_current_parent(
     return current_user
 
 @router.get("/parent-home", response_model=ParentHomeSummary)
-async def read_user_home(
+def read_user_home(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -148,7 +148,7 @@ async def read_user_home(
 
 
 @router.post("/parent-photo", status_code=status.HTTP_201_CREATED)
-async def upload_parent_photo(
+def upload_parent_photo(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
@@ -176,7 +176,7 @@ async def upload_parent_photo(
 
 
 @router.get("/parent-photo", response_class=StreamingResponse)
-async def get_parent_photo(
+def get_parent_photo(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -198,7 +198,7 @@ async def get_parent_photo(
 
 
 @router.delete("/parent-photo", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_parent_photo(
+def delete_parent_photo(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -214,7 +214,7 @@ async def delete_parent_photo(
     return None
 
 @router.put("/update-parent", response_model=ParentProfile)
-async def update_parent_profile(
+def update_parent_profile(
     updates: ParentUpdate,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
@@ -233,5 +233,9 @@ async def update_parent_profile(
         if existing and existing.parent_id != current_user.parent_id:
             raise HTTPException(status_code=400, detail="Phone number already in use")
 
-    updated = crud.update_parent(db, db_parent=current_user, updates=updates)
+    # current_user may be a detached cached principal; update the live row instead
+    db_parent = crud.get_parent_by_id_active(db, parent_id=current_user.parent_id)
+    if not db_parent:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parent not found")
+    updated = crud.update_parent(db, db_parent=db_parent, updates=updates)
     return updated
@@ -1,11 +1,12 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from datetime import date, timedelta
-import re
+from datetime import date
 
-from app.apis.deps import get_current_user, get_db
+from app.apis.deps import child_cache_version, get_current_user, get_db, reference_cache_version
+from app.core.http_cache import conditional
 from app.db import crud
+from app.db.crud_versions import vaccination_schedule_version, vaccine_statuses_version
 from app.schemas.schemas import (
     VaccinationSchedule as VaccinationScheduleSchema,
     ChildVaccineStatus as ChildVaccineStatusSchema,
@@ -16,6 +17,7 @@ from app.schemas.schemas import (
     Parent as ParentSchema,
 )
 from app.models.models import Parent as ParentModel
+from app.services.vaccine_schedule import schedule_plan
 
 router = APIRouter()
 
@@ -46,7 +48,11 @@ def normalize_text_fields(
     return {"status": "ok", **result}
 
 
-@router.get("/schedule/{age_group}", response_model=List[VaccinationScheduleSchema])
+@router.get(
+    "/schedule/{age_group}",
+    response_model=List[VaccinationScheduleSchema],
+    dependencies=[conditional(reference_cache_version(vaccination_schedule_version))],
+)
 def get_schedule_by_group(
     age_group: VaccinationAgeGroupEnum,
     db: Session = Depends(get_db),
@@ -57,7 +63,11 @@ def get_schedule_by_group(
 
 
 
-@router.get("/child/{child_id}/statuses", response_model=List[ChildVaccineStatusBrief])
+@router.get(
+    "/child/{child_id}/statuses",
+    response_model=List[ChildVaccineStatusBrief],
+    dependencies=[conditional(child_cache_version(vaccine_statuses_version))],
+)
 def list_child_statuses_for_current_group(
     child_id: int,
     db: Session = Depends(get_db),
@@ -74,79 +84,6 @@ def list_child_statuses_for_current_group(
     existing_rows = crud.list_child_vaccine_statuses_by_group(db, child_id=child_id, age_group=group)
     existing_map = {(r.schedule_id, r.dose_number): r for r in existing_rows}
 
-    def normalize(s: str) -> str:
-        if not s:
-            return s
-        return (
-            s.replace('\u2013', '-')
-             .replace('\u2014', '-')
-             .replace('\u2212', '-')
-             .replace('\u2011', '-')
-             .replace('\u00A0', ' ')
-        )
-
-    def parse_due_date(age_text: str, dose_number: int, dob: date) -> date | None:
-        if not age_text:
-            return None
-        txt = normalize(age_text).lower()
-        # Handle lists like "6, 10, 14 weeks"
-        m_list = re.findall(r"(\d+)\s*,?", txt)
-        unit = None
-        if 'week' in txt:
-            unit = 'week'
-        elif 'month' in txt:
-            unit = 'month'
-        elif 'year' in txt:
-            unit = 'year'
-
-        if 'at birth' in txt:
-            return dob  # due at DOB
-
-        # Range like '15-18 months' => take upper bound
-        m_range = re.search(r"(\d+)\s*[-]\s*(\d+)", txt)
-        if m_range and unit:
-            upper = int(m_range.group(2))
-            if unit == 'week':
-                return dob + timedelta(days=upper * 7)
-            if unit == 'month':
-                return dob + timedelta(days=upper * 30)
-            if unit == 'year':
-                return dob + timedelta(days=upper * 365)
-
-        # Comma list per dose
-        if m_list and unit:
-            idx = max(0, min(len(m_list)-1, dose_number-1))
-            val = int(m_list[idx])
-            if unit == 'week':
-                return dob + timedelta(days=val * 7)
-            if unit == 'month':
-                return dob + timedelta(days=val * 30)
-            if unit == 'year':
-                return dob + timedelta(days=val * 365)
-
-        # Single value
-        m_single = re.search(r"(\d+)", txt)
-        if m_single and unit:
-            val = int(m_single.group(1))
-            if unit == 'week':
-                return dob + timedelta(days=val * 7)
-            if unit == 'month':
-                return dob + timedelta(days=val * 30)
-            if unit == 'year':
-                return dob + timedelta(days=val * 365)
-
-        # Recurring phrases
-        if 'every year' in txt:
-            # first annual due at 12 months
-            return dob + timedelta(days=365)
-        if 'every 6 months' in txt:
-            # assume first due at 9 months if present, else 6 months
-            if '9 months' in txt:
-                return dob + timedelta(days=9 * 30)
-            return dob + timedelta(days=6 * 30)
-
-        return None
-
     today = date.today()
     result: list[dict] = []
     from app.schemas.schemas import VaccineStatusEnum as _VSE
@@ -167,7 +104,7 @@ def list_child_statuses_for_current_group(
         else:
             # Next dose index is completed+1
             next_dose = completed + 1
-            due = parse_due_date(sch.recommended_age, next_dose, db_child.date_of_birth)
+            due = schedule_plan(sch).due_date(next_dose, db_child.date_of_birth)
             if due is not None and today > due:
                 display_status = _VSE.MISSED
             else:
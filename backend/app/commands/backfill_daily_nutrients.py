@@ -0,0 +1,64 @@
+"""Rebuild child_daily_nutrients from the raw meal logs.
+
+Migration e4b8d1f6a9c3 fills the rollup and new meal logs maintain it
+themselves; this repairs it after bulk imports or manual edits to meal items.
+Children are processed in child_id ranges, with one
+INSERT ... SELECT ... GROUP BY and one commit per range. Existing rollup rows
+are overwritten with recomputed values, so a rerun is safe, and so is
+resuming with --after-child-id. It can run while the API takes meal logs:
+each range locks its children rows until its commit (see
+rebuild_daily_nutrients), which briefly holds off meal logs for them.
+
+    python -m app.commands.backfill_daily_nutrients --chunk-size 2000
+    python -m app.commands.backfill_daily_nutrients --since 2026-01-01
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+
+from app.db.crud_daily_nutrients import rebuild_daily_nutrients
+from app.db.session import SessionLocal
+from app.models.models import Child
+
+
+def run(*, chunk_size: int = 2000, after_child_id: int = 0, since: Optional[date] = None) -> Dict[str, Any]:
+    started = time.perf_counter()
+    last_id = after_child_id
+    children = 0
+    rows = 0
+    db = SessionLocal()
+    try:
+        while True:
+            ids = db.execute(
+                select(Child.child_id).where(Child.child_id > last_id).order_by(Child.child_id).limit(chunk_size)
+            ).scalars().all()
+            if not ids:
+                break
+            rows += rebuild_daily_nutrients(db, first_child_id=ids[0], last_child_id=ids[-1], since=since)
+            db.commit()
+            children += len(ids)
+            last_id = ids[-1]
+            print(f"child_id<={last_id}: {children} children, {rows} daily rows ({time.perf_counter() - started:.1f}s)")
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - started
+    print(f"Done: {rows} daily rows for {children} children in {elapsed:.1f}s")
+    return {"children": children, "rows": rows, "last_child_id": last_id, "seconds": elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=2000, help="children per INSERT ... SELECT")
+    parser.add_argument("--after-child-id", type=int, default=0, help="resume after this child_id")
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="only rebuild days on or after this date")
+    args = parser.parse_args()
+    run(chunk_size=args.chunk_size, after_child_id=args.after_child_id, since=args.since)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Export the pickled XGBoost models to XGBoost's native format.
+
+Writes `<model>.ubj` (or `.json`) next to every `<model>.pkl` under MODELS_DIR,
+records feature names, target, age group and checksums in
+MODELS_DIR/manifest.json, then checks that the exported model predicts the
+same as the pickle on random inputs. Serve the exports with MODEL_FORMAT=native.
+
+    python -m app.commands.export_native_models --format ubj --verify-rows 512
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from typing import Any, Dict, List
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.services.cohort_scoring import GROUP_MODELS
+from app.services.native_models import (
+    NATIVE_FORMATS,
+    export_model,
+    load_manifest,
+    load_native,
+    model_key,
+    write_manifest,
+)
+from app.services.prediction_common import MODEL_FOLDERS
+
+
+def iter_model_paths():
+    """(age group, target, pickle path, feature columns) for every configured model."""
+    for group, (models, features) in GROUP_MODELS.items():
+        folder = os.path.join(settings.MODELS_DIR, MODEL_FOLDERS[group])
+        for target, fname in models.items():
+            yield group, target, os.path.join(folder, fname), features
+
+
+def random_frame(features: List[str], rows: int, seed: int = 0) -> pd.DataFrame:
+    """Inputs spanning plausible ranges: binary flags, small codes and body measurements."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for name in features:
+        if name.startswith("milestone") or name.startswith("illness_") or name in ("is_existing", "sex"):
+            col = rng.integers(0, 2, rows).astype(float)
+        elif name == "age_days":
+            col = rng.uniform(0, 6570, rows)
+        elif name.endswith("_zscore"):
+            col = rng.normal(0, 1.5, rows)
+        else:
+            col = rng.uniform(0, 120, rows)
+        data[name] = col
+    return pd.DataFrame(data, columns=features)
+
+
+def max_abs_diff(a: Any, b: Any, df: pd.DataFrame) -> float:
+    return float(np.max(np.abs(np.asarray(a.predict(df), dtype=float) - np.asarray(b.predict(df), dtype=float))))
+
+
+def run(fmt: str, verify_rows: int) -> int:
+    entries: Dict[str, Dict[str, Any]] = dict(load_manifest())
+    exported = failures = 0
+    for group, target, path, features in iter_model_paths():
+        if not os.path.exists(path):
+            print(f"skip {path} (missing)")
+            continue
+        model = joblib.load(path)
+        entry = export_model(model, path, age_group=group.value, target=target, fmt=fmt)
+        if entry["features"] and entry["features"] != features:
+            print(f"warning: {path} was trained on {len(entry['features'])} columns that differ from the serving order")
+        entries[model_key(path)] = entry
+        exported += 1
+
+    write_manifest(entries)
+    print(f"Exported {exported} models to {fmt}; manifest: {settings.MODELS_DIR}/manifest.json")
+
+    if verify_rows <= 0:
+        return 0
+    for group, target, path, features in iter_model_paths():
+        if not os.path.exists(path):
+            continue
+        native = load_native(path)
+        if native is None:
+            print(f"FAIL {model_key(path)}: native copy not loadable")
+            failures += 1
+            continue
+        diff = max_abs_diff(joblib.load(path), native, random_frame(features, verify_rows))
+        ok = diff <= 1e-6
+        failures += 0 if ok else 1
+        print(f"{'ok  ' if ok else 'FAIL'} {model_key(path)}: max |pickle - native| = {diff:.3g}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=NATIVE_FORMATS, default="ubj")
+    parser.add_argument("--verify-rows", type=int, default=256, help="random rows for the parity check (0 skips it)")
+    args = parser.parse_args()
+    failures = run(args.format, args.verify_rows)
+    if failures:
+        raise SystemExit(f"{failures} models failed the parity check")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Export ChildPredictionReport rows per age group for model retraining.
+
+Each run exports only the reports committed since the previous run. The
+(xact_id, id) of the last exported row per age group is kept in
+<out-dir>/watermark.json and advanced after every completed file, so an
+interrupted run resumes cleanly:
+
+    python -m app.commands.export_prediction_reports --out-dir exports/prediction_reports --format npz
+    python -m app.commands.export_prediction_reports --format parquet --age-group Infant --full
+
+Columns: id, xact_id, child_id, created_at, the group's model features in training
+order, then its targets. Parquet needs pyarrow.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List, Optional
+
+from app.db.session import SessionLocal
+from app.schemas.schemas import VaccinationAgeGroupEnum
+from app.services.report_export import (
+    DEFAULT_BATCH_SIZE,
+    EXPORT_FORMATS,
+    export_group,
+    read_watermark,
+    require_pyarrow,
+    resume_after,
+    write_watermark,
+)
+
+DEFAULT_OUT_DIR = "exports/prediction_reports"
+
+
+def run(
+    *,
+    out_dir: str,
+    fmt: str,
+    groups: Optional[List[VaccinationAgeGroupEnum]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    full: bool = False,
+) -> Dict[str, Any]:
+    if fmt == "parquet":
+        require_pyarrow()
+    state = {"groups": {}} if full else read_watermark(out_dir)
+    summary: Dict[str, Any] = {}
+    db = SessionLocal()
+    try:
+        for group in groups or list(VaccinationAgeGroupEnum):
+            mark = state["groups"].setdefault(group.value, {"last_xact_id": 0, "last_id": 0, "rows": 0})
+            mark["last_xact_id"], mark["last_id"] = resume_after(db, mark)
+            started = time.perf_counter()
+
+            def advance(last, rows: int, mark=mark) -> None:
+                mark["last_xact_id"], mark["last_id"] = last
+                mark["rows"] += rows
+                write_watermark(out_dir, state)
+
+            result = export_group(
+                db,
+                group,
+                out_dir,
+                fmt=fmt,
+                after=(mark["last_xact_id"], mark["last_id"]),
+                batch_size=batch_size,
+                on_part=advance,
+            )
+            summary[group.value] = result
+            print(
+                f"{group.value}: {result['rows']} new rows in {result['files']} file(s), "
+                f"watermark xact_id={mark['last_xact_id']} id={mark['last_id']} "
+                f"({time.perf_counter() - started:.1f}s)"
+            )
+    finally:
+        db.close()
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR)
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="parquet")
+    parser.add_argument(
+        "--age-group", action="append", choices=[g.value for g in VaccinationAgeGroupEnum],
+        help="repeatable; defaults to every age group",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--full", action="store_true", help="ignore the watermark and export everything again")
+    args = parser.parse_args()
+    try:
+        run(
+            out_dir=args.out_dir,
+            fmt=args.format,
+            groups=[VaccinationAgeGroupEnum(g) for g in args.age_group] if args.age_group else None,
+            batch_size=args.batch_size,
+            full=args.full,
+        )
+    except RuntimeError as exc:
+        raise SystemExit(str(exc))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,489 @@
+"""Generate a reproducible synthetic dataset for load and scale testing.
+
+Creates N parents with M children each, spread evenly over the four age
+groups, and gives every child a plausible history:
+
+- anthropometry visits whose weight/height follow the WHO (< 24 months) and
+  CDC curves at a per-child z-score that drifts slowly between visits
+- weekly meal logs over the last --meal-weeks weeks (the API accepts one log
+  per child per 7 days), each with FoodMaster items for the child's age group
+  plus some custom (estimated) items
+- illness logs over the last 180 days
+- vaccine statuses for the age group's schedule (completed/missed/pending)
+- achieved milestone statuses for the age group's milestones
+
+A few percent of children lack a recent illness log or any milestone, so the
+prediction endpoint's "missing inputs" path gets exercised too.
+
+Reference data (FoodMaster, schedules, milestones, nutrition requirements)
+is seeded first with the same upserts the admin endpoints use. Rows are
+written in batches with bulk insert() statements, or COPY on Postgres
+(psycopg). The same --seed and --as-of always produce the same rows; every
+parent can log in with password "Synthetic@123":
+
+    python -m app.commands.generate_synthetic_dataset --parents 1000 --children-per-parent 2 --seed 7
+
+Parents are tagged synthetic.s<seed>.p<n>@example.com. A seed can only be
+generated once per database.
+"""
+from __future__ import annotations
+
+import argparse
+import enum
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db import crud
+from app.db.crud_daily_nutrients import rebuild_daily_nutrients
+from app.db.session import SessionLocal
+from app.models.models import (
+    Child,
+    ChildAnthropometry,
+    ChildIllnessLog,
+    ChildMealItem,
+    ChildMealLog,
+    ChildMilestone,
+    ChildMilestoneStatus,
+    ChildVaccineStatus,
+    FoodMaster,
+    Parent,
+)
+from app.schemas.schemas import (
+    AchievedDifficultyEnum,
+    FoodAgeGroupEnum,
+    IllnessSeverityEnum,
+    MealTypeEnum,
+    ResolvedByEnum,
+    VaccinationAgeGroupEnum,
+    VaccineStatusEnum,
+)
+from app.services.prediction_common import lms_params, value_from_lms
+
+SYNTHETIC_PASSWORD = "Synthetic@123"
+DEFAULT_CHUNK_PARENTS = 200
+
+# Age at as_of in days per group (crud.compute_child_age_group boundaries)
+AGE_DAYS: Dict[VaccinationAgeGroupEnum, Tuple[int, int]] = {
+    VaccinationAgeGroupEnum.INFANT: (30, 360),
+    VaccinationAgeGroupEnum.TODDLER: (370, 1455),
+    VaccinationAgeGroupEnum.PRESCHOOL: (1465, 2185),
+    VaccinationAgeGroupEnum.SCHOOL_AGE: (2200, 3650),
+}
+VISIT_EVERY_DAYS = {
+    VaccinationAgeGroupEnum.INFANT: 30,
+    VaccinationAgeGroupEnum.TODDLER: 45,
+    VaccinationAgeGroupEnum.PRESCHOOL: 60,
+    VaccinationAgeGroupEnum.SCHOOL_AGE: 90,
+}
+SLEEP_HOURS = {
+    VaccinationAgeGroupEnum.INFANT: 14.0,
+    VaccinationAgeGroupEnum.TODDLER: 12.0,
+    VaccinationAgeGroupEnum.PRESCHOOL: 11.0,
+    VaccinationAgeGroupEnum.SCHOOL_AGE: 10.0,
+}
+ILLNESS_RATE_180D = {
+    VaccinationAgeGroupEnum.INFANT: 1.2,
+    VaccinationAgeGroupEnum.TODDLER: 2.0,
+    VaccinationAgeGroupEnum.PRESCHOOL: 1.5,
+    VaccinationAgeGroupEnum.SCHOOL_AGE: 1.0,
+}
+FOOD_CATEGORIES = {
+    VaccinationAgeGroupEnum.INFANT: (FoodAgeGroupEnum.INFANT,),
+    VaccinationAgeGroupEnum.TODDLER: (FoodAgeGroupEnum.TODDLER, FoodAgeGroupEnum.ALL),
+    VaccinationAgeGroupEnum.PRESCHOOL: (FoodAgeGroupEnum.PRESCHOOL, FoodAgeGroupEnum.ALL),
+    VaccinationAgeGroupEnum.SCHOOL_AGE: (FoodAgeGroupEnum.SCHOOLAGE, FoodAgeGroupEnum.ALL),
+}
+# name, kcal/100g, protein/100g (the rest scaled from kcal), typical serving g
+CUSTOM_FOODS = [
+    ("Homemade dal water", 35, 2.0, 100),
+    ("Ragi malt", 95, 2.5, 120),
+    ("Poha", 130, 2.6, 100),
+    ("Paneer bhurji", 260, 14.0, 60),
+    ("Vegetable pulao", 150, 3.5, 150),
+    ("Biscuits", 450, 7.0, 25),
+]
+SYMPTOMS = [
+    "fever", "cold", "cough", "sore_throat", "headache", "stomach_ache",
+    "nausea", "vomiting", "diarrhea", "rash", "fatigue", "loss_of_appetite",
+]
+LMS_STEP_MONTHS = 0.25
+# Share of children given every input POST /predictions requires
+COMPLETE_SHARE = 0.9
+
+
+class _Curves:
+    """WHO/CDC LMS tabulated on a fine month grid so a child's series is a few np.interp calls."""
+
+    def __init__(self, max_months: float) -> None:
+        self.grid = np.arange(0.0, max_months + LMS_STEP_MONTHS, LMS_STEP_MONTHS)
+        self.lms: Dict[Tuple[str, int], np.ndarray] = {}
+        for measure in ("weight", "height"):
+            for sex_code in (0, 1):
+                self.lms[(measure, sex_code)] = np.array(
+                    [lms_params(measure, sex_code, m) for m in self.grid], dtype=float
+                )
+
+    def values(self, measure: str, sex_code: int, agemos: np.ndarray, z: np.ndarray) -> np.ndarray:
+        table = self.lms[(measure, sex_code)]
+        L, M, S = (np.interp(agemos, self.grid, table[:, i]) for i in range(3))
+        return np.array([value_from_lms(zi, li, mi, si) for zi, li, mi, si in zip(z, L, M, S)])
+
+
+# -------- Bulk writes --------
+
+def _copy_value(value: Any) -> Any:
+    # SQLAlchemy Enum columns store member names
+    return value.name if isinstance(value, enum.Enum) else value
+
+
+def _write(db: Session, model, rows: List[Dict[str, Any]], *, use_copy: bool) -> None:
+    if not rows:
+        return
+    if not use_copy:
+        db.execute(insert(model), rows)
+        return
+    columns = list(rows[0].keys())
+    driver_conn = db.connection().connection.driver_connection
+    sql = f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN"
+    with driver_conn.cursor() as cur:
+        with cur.copy(sql) as copy:
+            for row in rows:
+                copy.write_row([_copy_value(row[c]) for c in columns])
+
+
+def _insert_returning(db: Session, model, pk, rows: List[Dict[str, Any]]) -> List[int]:
+    """Bulk insert that returns the new primary keys in row order."""
+    if not rows:
+        return []
+    result = db.execute(insert(model).returning(pk, sort_by_parameter_order=True), rows)
+    return [r[0] for r in result]
+
+
+# -------- Per-child history --------
+
+class _Generator:
+    def __init__(self, db: Session, *, seed: int, as_of: date, meal_weeks: int, history_days: int) -> None:
+        self.rng = np.random.default_rng(seed)
+        self.as_of = as_of
+        self.meal_weeks = meal_weeks
+        self.history_days = history_days
+        self.curves = _Curves(max(hi for _, hi in AGE_DAYS.values()) / 30.0 + 1)
+        foods = db.query(FoodMaster).order_by(FoodMaster.food_id).all()
+        self.foods = {
+            group: [f for f in foods if f.category_age_group in cats]
+            for group, cats in FOOD_CATEGORIES.items()
+        }
+        self.schedules = {
+            group: crud.list_schedule_by_age_group(db, group) for group in VaccinationAgeGroupEnum
+        }
+        milestones = db.query(ChildMilestone).order_by(ChildMilestone.id).all()
+        self.milestones = {
+            group: [m.id for m in milestones if m.category == group] for group in VaccinationAgeGroupEnum
+        }
+
+    def _moment(self, day: date) -> datetime:
+        return datetime.combine(day, datetime.min.time()) + timedelta(seconds=int(self.rng.integers(6 * 3600, 22 * 3600)))
+
+    def _day_between(self, start: date, end: date) -> date:
+        span = max((end - start).days, 0)
+        return start + timedelta(days=int(self.rng.integers(0, span + 1)))
+
+    def child_row(self, parent_id: int, index: int, group: VaccinationAgeGroupEnum) -> Dict[str, Any]:
+        lo, hi = AGE_DAYS[group]
+        return {
+            "parent_id": parent_id,
+            "full_name": f"Synthetic Child {index}",
+            "gender": "Male" if self.rng.random() < 0.5 else "Female",
+            "blood_group": str(self.rng.choice(["A+", "B+", "O+", "AB+", "A-", "B-", "O-"])),
+            "date_of_birth": self.as_of - timedelta(days=int(self.rng.integers(lo, hi + 1))),
+        }
+
+    def anthropometry(self, child_id: int, child: Dict[str, Any], group: VaccinationAgeGroupEnum) -> List[Dict[str, Any]]:
+        dob: date = child["date_of_birth"]
+        sex_code = 0 if child["gender"] == "Male" else 1
+        last = self.as_of - timedelta(days=int(self.rng.integers(0, 15)))
+        first = max(dob + timedelta(days=7), self.as_of - timedelta(days=self.history_days))
+        step = VISIT_EVERY_DAYS[group]
+        days = []
+        day = last
+        while day >= first:
+            days.append(day)
+            day -= timedelta(days=int(step + self.rng.integers(-7, 8)))
+        days.reverse()
+        n = len(days)
+        agemos = np.array([(d - dob).days / 30.0 for d in days])
+        # Persistent growth position with a slow random walk between visits
+        zw = np.clip(self.rng.normal(-0.4, 1.0) + np.cumsum(self.rng.normal(0, 0.08, n)), -4, 3)
+        zh = np.clip(self.rng.normal(-0.5, 1.0) + np.cumsum(self.rng.normal(0, 0.05, n)), -4, 3)
+        weights = self.curves.values("weight", sex_code, agemos, zw)
+        heights = self.curves.values("height", sex_code, agemos, zh)
+        rows = []
+        for d, m, w, h in zip(days, agemos, weights, heights):
+            muac = None
+            if m >= 6:
+                # Same relation prediction_common uses to estimate MUAC, plus noise
+                muac = float(np.clip(10.5 + 0.25 * w + 0.02 * (h - 60) + 0.3 * sex_code + self.rng.normal(0, 0.4), 9, 22))
+            moment = self._moment(d)
+            rows.append({
+                "child_id": child_id,
+                "log_date": d,
+                "height_cm": round(float(h), 1),
+                "weight_kg": round(float(w), 2),
+                "muac_cm": round(muac, 1) if muac is not None else None,
+                "avg_sleep_hours_per_day": round(float(SLEEP_HOURS[group] + self.rng.normal(0, 0.8)), 1),
+                "created_at": moment,
+                "updated_at": moment,
+            })
+        return rows
+
+    def meal_logs(self, child_id: int, group: VaccinationAgeGroupEnum) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """(meal log row, its item rows without meal_log_id) per logged week."""
+        foods = self.foods[group]
+        out = []
+        # Each child logs on its own weekday; skipped weeks keep logs >= 7 days apart.
+        # The current week is always logged: predictions need a log from the last 7 days.
+        weekday = int(self.rng.integers(0, 7))
+        for week in range(self.meal_weeks - 1, -1, -1):
+            if week and self.rng.random() > 0.8:
+                continue
+            day = self.as_of - timedelta(days=week * 7 + weekday)
+            items = []
+            for _ in range(int(self.rng.integers(2, 6))):
+                meal_type = MealTypeEnum(str(self.rng.choice([m.value for m in MealTypeEnum])))
+                if foods and (group == VaccinationAgeGroupEnum.INFANT or self.rng.random() < 0.8):
+                    food = foods[int(self.rng.integers(0, len(foods)))]
+                    serving = round(float((food.avg_serving_g or 100.0) * self.rng.uniform(0.6, 1.4)), 1)
+                    items.append(self._master_item(meal_type, food, serving))
+                else:
+                    items.append(self._custom_item(meal_type))
+            out.append(({"child_id": child_id, "log_date": day, "notes": None, "created_at": self._moment(day)}, items))
+        return out
+
+    def _item(self, meal_type: MealTypeEnum, food_id: Optional[int], custom: Optional[str], serving: float, estimated: bool, nutrients: Dict[str, Optional[float]]) -> Dict[str, Any]:
+        return {
+            "meal_type": meal_type,
+            "food_id": food_id,
+            "custom_food_name": custom,
+            "serving_size_g": serving,
+            "meal_frequency": int(self.rng.integers(1, 3)),
+            "is_ai_estimated": estimated,
+            **{k: (round(v, 2) if v is not None else None) for k, v in nutrients.items()},
+        }
+
+    def _master_item(self, meal_type: MealTypeEnum, food: FoodMaster, serving: float) -> Dict[str, Any]:
+        # Same scaling as crud._compute_nutrition_from_master
+        r = serving / (food.avg_serving_g or 100.0)
+        nutrients = {
+            k: (float(getattr(food, k)) * r if getattr(food, k) is not None else None)
+            for k in ("energy_kcal", "protein_g", "carb_g", "fat_g", "iron_mg", "calcium_mg", "vitamin_a_mcg", "vitamin_c_mg")
+        }
+        return self._item(meal_type, food.food_id, None, serving, False, nutrients)
+
+    def _custom_item(self, meal_type: MealTypeEnum) -> Dict[str, Any]:
+        name, kcal, protein, typical = CUSTOM_FOODS[int(self.rng.integers(0, len(CUSTOM_FOODS)))]
+        serving = round(float(typical * self.rng.uniform(0.6, 1.4)), 1)
+        r = serving / 100.0
+        nutrients = {
+            "energy_kcal": kcal * r,
+            "protein_g": protein * r,
+            "carb_g": kcal * 0.13 * r,
+            "fat_g": kcal * 0.03 * r,
+            "iron_mg": kcal * 0.004 * r,
+            "calcium_mg": kcal * 0.2 * r,
+            "vitamin_a_mcg": kcal * 0.1 * r,
+            "vitamin_c_mg": kcal * 0.01 * r,
+        }
+        return self._item(meal_type, None, name, serving, True, nutrients)
+
+    def illnesses(self, child_id: int, child: Dict[str, Any], group: VaccinationAgeGroupEnum) -> List[Dict[str, Any]]:
+        rows = []
+        start = max(child["date_of_birth"], self.as_of - timedelta(days=180))
+        days = [self._day_between(start, self.as_of) for _ in range(int(self.rng.poisson(ILLNESS_RATE_180D[group])))]
+        # Predictions need an illness log in the last 90 days; leave ~10% of children without one
+        recent = self.as_of - timedelta(days=90)
+        if not any(d >= recent for d in days) and self.rng.random() < COMPLETE_SHARE:
+            days.append(self._day_between(max(recent, child["date_of_birth"]), self.as_of))
+        for day in sorted(days):
+            created = self._moment(day)
+            flags = {s: False for s in SYMPTOMS}
+            for s in self.rng.choice(SYMPTOMS, size=int(self.rng.integers(1, 4)), replace=False):
+                flags[str(s)] = True
+            current = (self.as_of - day).days < 7 and self.rng.random() < 0.6
+            resolved = None if current else created + timedelta(days=int(self.rng.integers(2, 10)))
+            rows.append({
+                "child_id": child_id,
+                **flags,
+                "temperature_c": round(float(self.rng.uniform(37.8, 39.8)), 1) if flags["fever"] else None,
+                "temperature_time": created if flags["fever"] else None,
+                "symptom_start_date": created - timedelta(days=int(self.rng.integers(0, 4))),
+                "severity": IllnessSeverityEnum(str(self.rng.choice(["Mild", "Mild", "Moderate", "Severe"]))),
+                "is_current": bool(current),
+                "resolved_on": resolved,
+                "resolved_by": None if current else (ResolvedByEnum.PARENT if self.rng.random() < 0.7 else ResolvedByEnum.DOCTOR),
+                "notes": None,
+                "created_at": created,
+                "updated_at": resolved or created,
+            })
+        return rows
+
+    def vaccine_statuses(self, child_id: int, child: Dict[str, Any], group: VaccinationAgeGroupEnum) -> List[Dict[str, Any]]:
+        # Same rows as crud.initialize_child_vaccine_statuses_for_group, with a realistic completion mix
+        rows = []
+        for schedule in self.schedules[group]:
+            for dose in range(1, (schedule.doses_required or 1) + 1):
+                roll = self.rng.random()
+                status = VaccineStatusEnum.COMPLETED if roll < 0.75 else VaccineStatusEnum.MISSED if roll < 0.8 else VaccineStatusEnum.PENDING
+                rows.append({
+                    "child_id": child_id,
+                    "schedule_id": schedule.id,
+                    "dose_number": dose,
+                    "status": status,
+                    "scheduled_text": schedule.recommended_age,
+                    "scheduled_date": None,
+                    "actual_date": self._day_between(child["date_of_birth"], self.as_of) if status == VaccineStatusEnum.COMPLETED else None,
+                })
+        return rows
+
+    def milestone_statuses(self, child_id: int, child: Dict[str, Any], group: VaccinationAgeGroupEnum) -> List[Dict[str, Any]]:
+        rows = []
+        milestone_ids = self.milestones[group]
+        achieved = self.rng.random(len(milestone_ids)) < 0.7
+        if milestone_ids and not achieved.any() and self.rng.random() < COMPLETE_SHARE:
+            achieved[0] = True
+        for milestone_id, hit in zip(milestone_ids, achieved):
+            if not hit:
+                continue
+            rows.append({
+                "child_id": child_id,
+                "milestone_id": milestone_id,
+                "achieved_date": self._day_between(child["date_of_birth"], self.as_of),
+                "difficulty": AchievedDifficultyEnum(str(self.rng.choice([d.value for d in AchievedDifficultyEnum]))),
+                "special_milestone": bool(self.rng.random() < 0.05),
+            })
+        return rows
+
+
+# -------- Driver --------
+
+def _seed_reference_data(db: Session) -> None:
+    crud.seed_food_master(db)
+    crud.seed_all_vaccination_schedules(db)
+    crud.seed_all_child_milestones(db)
+    crud.seed_nutrition_requirements(db)
+    db.commit()
+
+
+def synthetic_parent_email(seed: int, index: int) -> str:
+    return f"synthetic.s{seed}.p{index}@example.com"
+
+
+def run(
+    *,
+    parents: int,
+    children_per_parent: int,
+    seed: int,
+    as_of: date,
+    meal_weeks: int = 12,
+    history_days: int = 540,
+    chunk_parents: int = DEFAULT_CHUNK_PARENTS,
+    use_copy: Optional[bool] = None,
+) -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        if db.query(Parent.parent_id).filter(Parent.email == synthetic_parent_email(seed, 0)).first():
+            raise SystemExit(f"Synthetic data for seed {seed} already exists in this database")
+        if use_copy is None:
+            use_copy = db.get_bind().dialect.name == "postgresql" and db.get_bind().dialect.driver == "psycopg"
+        _seed_reference_data(db)
+        gen = _Generator(db, seed=seed, as_of=as_of, meal_weeks=meal_weeks, history_days=history_days)
+        password_hash = get_password_hash(SYNTHETIC_PASSWORD)
+        groups = list(VaccinationAgeGroupEnum)
+        counts: Dict[str, int] = {}
+        started = time.perf_counter()
+
+        for chunk_start in range(0, parents, chunk_parents):
+            chunk = range(chunk_start, min(chunk_start + chunk_parents, parents))
+            parent_ids = _insert_returning(db, Parent, Parent.parent_id, [
+                {
+                    "full_name": f"Synthetic Parent {i}",
+                    "email": synthetic_parent_email(seed, i),
+                    "phone_number": f"9{seed % 100000:05d}{i:07d}",
+                    "password_hash": password_hash,
+                    "is_active": True,
+                }
+                for i in chunk
+            ])
+            child_rows, child_groups = [], []
+            for i, parent_id in zip(chunk, parent_ids):
+                for j in range(children_per_parent):
+                    n = i * children_per_parent + j
+                    group = groups[n % len(groups)]
+                    child_rows.append(gen.child_row(parent_id, n, group))
+                    child_groups.append(group)
+            child_ids = _insert_returning(db, Child, Child.child_id, child_rows)
+
+            tables: Dict[Any, List[Dict[str, Any]]] = {
+                ChildAnthropometry: [], ChildIllnessLog: [], ChildVaccineStatus: [], ChildMilestoneStatus: [],
+            }
+            meal_logs, meal_items = [], []
+            for child_id, child, group in zip(child_ids, child_rows, child_groups):
+                tables[ChildAnthropometry] += gen.anthropometry(child_id, child, group)
+                tables[ChildIllnessLog] += gen.illnesses(child_id, child, group)
+                tables[ChildVaccineStatus] += gen.vaccine_statuses(child_id, child, group)
+                tables[ChildMilestoneStatus] += gen.milestone_statuses(child_id, child, group)
+                for log, items in gen.meal_logs(child_id, group):
+                    meal_logs.append(log)
+                    meal_items.append(items)
+            for model, rows in tables.items():
+                _write(db, model, rows, use_copy=use_copy)
+                counts[model.__tablename__] = counts.get(model.__tablename__, 0) + len(rows)
+            log_ids = _insert_returning(db, ChildMealLog, ChildMealLog.id, meal_logs)
+            item_rows = [{"meal_log_id": log_id, **item} for log_id, items in zip(log_ids, meal_items) for item in items]
+            _write(db, ChildMealItem, item_rows, use_copy=use_copy)
+            if child_ids:
+                rebuild_daily_nutrients(db, first_child_id=min(child_ids), last_child_id=max(child_ids))
+            db.commit()
+
+            counts["parents"] = counts.get("parents", 0) + len(parent_ids)
+            counts["children"] = counts.get("children", 0) + len(child_ids)
+            counts["child_meal_log"] = counts.get("child_meal_log", 0) + len(log_ids)
+            counts["child_meal_item"] = counts.get("child_meal_item", 0) + len(item_rows)
+            print(f"  {counts['parents']}/{parents} parents, {counts['children']} children ({time.perf_counter() - started:.1f}s)")
+        return counts
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parents", type=int, default=100)
+    parser.add_argument("--children-per-parent", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(), help="'today' of the generated history (YYYY-MM-DD)")
+    parser.add_argument("--meal-weeks", type=int, default=12, help="weeks of meal logs per child (one log a week)")
+    parser.add_argument("--history-days", type=int, default=540, help="anthropometry history per child")
+    parser.add_argument("--chunk-parents", type=int, default=DEFAULT_CHUNK_PARENTS, help="parents per transaction")
+    parser.add_argument("--no-copy", action="store_true", help="use insert() batches even on Postgres")
+    args = parser.parse_args()
+    counts = run(
+        parents=args.parents,
+        children_per_parent=args.children_per_parent,
+        seed=args.seed,
+        as_of=args.as_of,
+        meal_weeks=args.meal_weeks,
+        history_days=args.history_days,
+        chunk_parents=args.chunk_parents,
+        use_copy=False if args.no_copy else None,
+    )
+    for table, n in counts.items():
+        print(f"{table}: {n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Nightly cohort re-scoring.
+
+Streams every child in child_id order, builds prediction features set-wise
+per chunk, runs the per-age-group models on a process pool (models are
+preloaded once per worker) and bulk-inserts one ChildPredictionReport per
+eligible child. Children still missing required inputs are skipped, exactly
+like POST /predictions/child/{child_id} would reject them, and children whose
+feature fingerprint already has a report are left alone ("unchanged").
+
+Progress is checkpointed after every committed chunk, so an interrupted run
+resumes where it stopped (same day only; a new day starts a fresh pass):
+
+    python -m app.commands.rescore_cohort --chunk-size 500 --workers 3
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.db.session import SessionLocal
+from app.services.cohort_scoring import (
+    CohortFeatureLoader,
+    bulk_insert_reports,
+    default_worker_count,
+    existing_feature_hashes,
+    iter_child_chunks,
+    predict_group_batch,
+    preload_models,
+    report_rows,
+)
+from app.services.prediction_common import feature_fingerprint
+
+DEFAULT_CHECKPOINT = "rescore_cohort.checkpoint.json"
+
+
+def _fresh_state(as_of: date) -> Dict[str, Any]:
+    return {"as_of": as_of.isoformat(), "last_child_id": 0, "scored": 0, "skipped": 0, "unchanged": 0}
+
+
+def _read_checkpoint(path: str, as_of: date) -> Dict[str, Any]:
+    fresh = _fresh_state(as_of)
+    if not os.path.exists(path):
+        return fresh
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("as_of") != as_of.isoformat():
+        return fresh
+    return {**fresh, **data}
+
+
+def _write_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+class _PendingChunk:
+    def __init__(self, last_child_id: int, skipped: int, unchanged: int) -> None:
+        self.last_child_id = last_child_id
+        self.skipped = skipped
+        self.unchanged = unchanged
+        # (scored entries, future or inline predictions) per age group
+        self.parts: List[Tuple[List[Tuple[int, Any, Dict[str, Any], str]], Any]] = []
+
+
+def run(
+    *,
+    chunk_size: int,
+    workers: int,
+    checkpoint_path: str,
+    restart: bool = False,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    as_of = date.today()
+    state = _fresh_state(as_of) if restart else _read_checkpoint(checkpoint_path, as_of)
+    if state["last_child_id"]:
+        print(f"Resuming after child_id={state['last_child_id']} ({state['scored']} scored so far today)")
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=preload_models) if workers > 0 else None
+    if pool is None:
+        preload_models()
+    # Keep a couple of chunks in flight so feature building overlaps inference
+    max_inflight = max(2, workers * 2)
+    pending: Deque[_PendingChunk] = deque()
+    started = time.perf_counter()
+    processed = 0
+
+    db = SessionLocal()
+    write_db = SessionLocal()
+    try:
+        loader = CohortFeatureLoader(db, today=as_of)
+
+        def drain_one() -> None:
+            chunk = pending.popleft()
+            rows: List[Dict[str, Any]] = []
+            for scored, result in chunk.parts:
+                preds = result.result() if isinstance(result, Future) else result
+                rows.extend(report_rows(scored, preds))
+            bulk_insert_reports(write_db, rows)
+            write_db.commit()
+            state["last_child_id"] = chunk.last_child_id
+            state["scored"] += len(rows)
+            state["skipped"] += chunk.skipped
+            state["unchanged"] += chunk.unchanged
+            _write_checkpoint(checkpoint_path, state)
+            elapsed = time.perf_counter() - started
+            print(
+                f"child_id<={chunk.last_child_id}: scored={state['scored']} skipped={state['skipped']} "
+                f"unchanged={state['unchanged']} "
+                f"({processed / elapsed:.1f} children/s)"
+            )
+
+        for children in iter_child_chunks(db, chunk_size=chunk_size, after_child_id=state["last_child_id"]):
+            built = loader.build(children)
+            eligible: List[Tuple[int, Any, Dict[str, Any], str]] = []
+            skipped = 0
+            for child, group, features, info in built:
+                if info.get("required_missing"):
+                    skipped += 1
+                    continue
+                eligible.append((child.child_id, group, features, feature_fingerprint(group, features)))
+            # Same fingerprint => same predictions as an existing report; don't re-score
+            existing = existing_feature_hashes(db, [(child_id, h) for child_id, _, _, h in eligible])
+            by_group: Dict[Any, List[Tuple[int, Any, Dict[str, Any], str]]] = {}
+            for entry in eligible:
+                if (entry[0], entry[3]) not in existing:
+                    by_group.setdefault(entry[1], []).append(entry)
+
+            chunk = _PendingChunk(children[-1].child_id, skipped, len(existing))
+            for group, scored in by_group.items():
+                feature_rows = [features for _, _, features, _ in scored]
+                if pool is not None:
+                    chunk.parts.append((scored, pool.submit(predict_group_batch, group.value, feature_rows)))
+                else:
+                    chunk.parts.append((scored, predict_group_batch(group.value, feature_rows)))
+            pending.append(chunk)
+            processed += len(children)
+            # Release identity-map memory; rows for this chunk are no longer needed
+            db.expunge_all()
+            # End the chunk's read transaction: one snapshot held for the whole
+            # nightly run would hold back vacuum on the log tables on Postgres
+            db.rollback()
+
+            while len(pending) > max_inflight:
+                drain_one()
+            if limit is not None and processed >= limit:
+                break
+
+        while pending:
+            drain_one()
+    finally:
+        db.close()
+        write_db.close()
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Done: {processed} children in {elapsed:.1f}s ({rate:.1f} children/s), "
+        f"{state['scored']} reports written today, {state['skipped']} skipped (missing inputs), "
+        f"{state['unchanged']} unchanged"
+    )
+    return {**state, "processed": processed, "seconds": elapsed, "children_per_sec": rate}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=default_worker_count(), help="0 runs inference in-process")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="ignore today's checkpoint and start from the first child")
+    parser.add_argument("--limit", type=int, default=None, help="stop after roughly this many children")
+    args = parser.parse_args()
+    run(
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart,
+        limit=args.limit,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""List every dose that is overdue or due soon, for the reminder jobs.
+
+Streams children in child_id order and writes one line per dose as it
+goes, so memory stays flat at any population size:
+
+    python -m app.commands.vaccination_due_sweep --within-days 7 > due.jsonl
+    python -m app.commands.vaccination_due_sweep --format csv --out due.csv --no-overdue
+
+Columns: child_id, parent_id, schedule_id, vaccine_name, dose_number,
+due_date, overdue. Progress goes to stderr.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import date
+from typing import Any, Dict, Optional
+
+from app.db.session import SessionLocal
+from app.services.vaccination_due import DEFAULT_CHUNK_SIZE, DueDose, due_dose_record, iter_due_doses
+
+
+def run(
+    *,
+    out,
+    fmt: str = "jsonl",
+    within_days: int = 7,
+    include_overdue: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    today: Optional[date] = None,
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    counts = {"due": 0, "overdue": 0, "children": 0}
+    last_child_id = None
+    writer = csv.writer(out) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(DueDose._fields)
+    db = SessionLocal()
+    try:
+        for dose in iter_due_doses(
+            db, within_days=within_days, today=today, chunk_size=chunk_size, include_overdue=include_overdue
+        ):
+            if writer is not None:
+                writer.writerow(dose)
+            else:
+                out.write(json.dumps(due_dose_record(dose)) + "\n")
+            counts["overdue" if dose.overdue else "due"] += 1
+            if dose.child_id != last_child_id:
+                counts["children"] += 1
+                last_child_id = dose.child_id
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - started
+    print(
+        f"{counts['due']} due within {within_days}d, {counts['overdue']} overdue, "
+        f"{counts['children']} children ({elapsed:.1f}s)",
+        file=sys.stderr,
+    )
+    return {**counts, "seconds": elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--within-days", type=int, default=7)
+    parser.add_argument("--no-overdue", action="store_true", help="only doses that are not yet overdue")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--out", default="-", help="output file, '-' for stdout")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8", newline="")
+    try:
+        run(
+            out=out,
+            fmt=args.format,
+            within_days=args.within_days,
+            include_overdue=not args.no_overdue,
+            chunk_size=args.chunk_size,
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
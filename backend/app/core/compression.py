@@ -0,0 +1,148 @@
+"""Negotiated zstd / gzip response compression.
+
+CompressionMiddleware compresses bodies of text-like media types (JSON,
+NDJSON, CSV, text) when the request's Accept-Encoding allows it. zstd wins
+over gzip at equal q-values. Single-message bodies under `minimum_size` are
+sent as-is. Streaming bodies (trend streams, NDJSON sweeps) are compressed
+chunk by chunk and flushed after each chunk, so clients still receive rows as
+they are produced. Responses that already carry a Content-Encoding and binary
+types (report files, Arrow exports) are passed through untouched.
+"""
+from __future__ import annotations
+
+import zlib
+from typing import Dict, Optional
+
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+
+# Server preference at equal q-values
+ENCODINGS = ("zstd", "gzip")
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/javascript",
+    "image/svg+xml",
+})
+
+
+def _compressible(content_type: Optional[str]) -> bool:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return media_type.startswith("text/") or media_type.endswith("+json") or media_type in COMPRESSIBLE_TYPES
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best of ENCODINGS for an Accept-Encoding header, or None for identity."""
+    prefs: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        prefs[name] = q
+    best, best_q = None, 0.0
+    for name in ENCODINGS:
+        q = prefs.get(name, prefs.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class _GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def encode(self, data: bytes, *, final: bool) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        self._z = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def encode(self, data: bytes, *, final: bool) -> bytes:
+        flush = zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        return self._z.compress(data) + self._z.flush(flush)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing response bodies per Accept-Encoding."""
+
+    def __init__(self, app, *, minimum_size: int = 1024, gzip_level: int = 6, zstd_level: int = 3) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "zstd": zstd_level}
+
+    def _encoder(self, encoding: str):
+        if encoding == "zstd":
+            return _ZstdEncoder(self.levels["zstd"])
+        return _GzipEncoder(self.levels["gzip"])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[dict] = None
+        encoder = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, encoder, passthrough
+            kind = message["type"]
+            if kind == "http.response.start":
+                # Held back until the first body chunk shows whether to compress
+                start = message
+                return
+            if passthrough or kind != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if encoder is None:
+                headers = MutableHeaders(raw=list(start["headers"]))
+                if (
+                    "content-encoding" in headers
+                    or start["status"] < 200
+                    or start["status"] in (204, 304)
+                    or not _compressible(headers.get("content-type"))
+                    or (not more and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                encoder = self._encoder(encoding)
+                compressed = encoder.encode(body, final=not more)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more:
+                    if "content-length" in headers:
+                        del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(compressed))
+                await send({**start, "headers": headers.raw})
+                start = None
+                await send({"type": "http.response.body", "body": compressed, "more_body": more})
+                return
+
+            await send({"type": "http.response.body", "body": encoder.encode(body, final=not more), "more_body": more})
+
+        await self.app(scope, receive, send_wrapper)
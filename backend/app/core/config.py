@@ -2,15 +2,65 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Sanrakshya API"
+    # Debug mode: adds X-DB-* query stats headers to every response
+    DEBUG: bool = False
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 1 day
     DATABASE_URL: str
+    # Async engine URL; derived from DATABASE_URL (psycopg3 async driver) when unset
+    ASYNC_DATABASE_URL: str | None = None
+    # Connection pool sizing. Each worker process holds up to
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW sync connections plus
+    # ASYNC_DB_POOL_SIZE + ASYNC_DB_MAX_OVERFLOW async ones; the async engine
+    # only serves the principal lookup and the few AsyncSession routes.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    ASYNC_DB_POOL_SIZE: int = 5
+    ASYNC_DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_CONNECT_TIMEOUT: int = 10
+    # Statements slower than this are logged individually (sanrakshya.db logger)
+    SLOW_QUERY_MS: float = 200.0
     GROQ_API_KEY: str | None = None
     GEMINI_API_KEY: str | None = None
     MODELS_DIR: str = "app/ai_models"
+    # "pickle" loads the joblib files; "native" prefers the XGBoost UBJSON/JSON
+    # exports listed in MODELS_DIR/manifest.json (app.commands.export_native_models)
+    MODEL_FORMAT: str = "pickle"
+    # Load every model at app import so pre-fork servers (gunicorn --preload)
+    # share them copy-on-write across workers
+    MODEL_PRELOAD: bool = False
     REPORTS_BASE_DIR: str = "sanrakshya-reports/reports"
     REPORTS_MASTER_KEY: str
+    # Authenticated-principal cache used by get_current_user (0 disables it).
+    # Edits clear it only in the worker that made them; other workers may keep
+    # a deactivated or changed user for up to this many seconds.
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 2048
+    # bcrypt work factor for new hashes; existing hashes are upgraded on login
+    BCRYPT_ROUNDS: int = 12
+    # Threads dedicated to bcrypt so logins never run on the event loop
+    PASSWORD_HASH_WORKERS: int = 4
+    # Shared secret for /admin endpoints (X-Admin-Key header); unset disables them
+    ADMIN_API_KEY: str | None = None
+    # GET /metrics answers 404 unless enabled. With a token set, scrapers must
+    # send "Authorization: Bearer <token>" (Prometheus: authorization.credentials);
+    # without one, keep the port off the public network.
+    METRICS_ENABLED: bool = False
+    METRICS_BEARER_TOKEN: str | None = None
+    # How often a worker checks whether reference tables behind its in-memory
+    # indexes (nutrition recipes, food master) were reseeded elsewhere
+    REFERENCE_INDEX_RECHECK_SECONDS: float = 60.0
+    # Most entries accepted by one POST /sync/batch request
+    SYNC_MAX_BATCH_ENTRIES: int = 500
+    # zstd/gzip response compression, negotiated from Accept-Encoding; bodies
+    # smaller than COMPRESSION_MIN_BYTES are sent uncompressed
+    RESPONSE_COMPRESSION: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024
+    GZIP_LEVEL: int = 6
+    ZSTD_LEVEL: int = 3
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,104 @@
+"""Conditional GET: weak ETags from cheap per-resource version tokens.
+
+A route opts in declaratively:
+
+    @router.get("/child/{child_id}/reports", dependencies=[conditional(reports_version)])
+
+`reports_version` is an ordinary dependency (FastAPI shares its db session and
+current user with the route) returning a CacheVersion, or None when the
+request should not be cached, e.g. the child is not the caller's and the
+route should raise its usual error. The version is read before the route
+runs. When If-None-Match matches, the request ends there with a bodiless
+304. Otherwise CacheValidatorsMiddleware adds ETag, Last-Modified and
+Cache-Control to the route's 200, including Response objects the route
+builds itself.
+
+Reading the version first means a write that lands before the route's own
+queries yields a body newer than its tag, so the next revalidation sees a
+different tag and refetches. That holds only if every committed write
+changes the version, whatever order writers commit in; timestamps do not
+guarantee that, so the tokens are built from write counters
+(app.db.crud_versions).
+Last-Modified is informational (max(updated_at) does not move on deletes),
+so If-Modified-Since is not used to answer 304.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from starlette.datastructures import MutableHeaders
+
+# Per-user responses that must be revalidated before each reuse
+CACHE_CONTROL = "private, no-cache"
+_STATE_KEY = "cache_validators"
+
+
+class CacheVersion(NamedTuple):
+    parts: Tuple[Any, ...]  # values with a stable repr
+    last_modified: Optional[datetime] = None
+
+
+def _etag(request: Request, version: CacheVersion) -> str:
+    # Weak: the compression middleware may re-encode the same representation
+    key = repr((request.url.path, request.url.query, version.parts)).encode("utf-8")
+    return f'W/"{hashlib.blake2b(key, digest_size=12).hexdigest()}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:]
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _http_date(value: datetime) -> str:
+    # Naive database timestamps are UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def conditional(version: Callable[..., Optional[CacheVersion]]):
+    """Route dependency: 304 when If-None-Match matches `version`, validators on the 200 otherwise."""
+
+    def check(request: Request, current: Optional[CacheVersion] = Depends(version)) -> None:
+        if current is None or request.method != "GET":
+            return
+        headers: Dict[str, str] = {"ETag": _etag(request, current), "Cache-Control": CACHE_CONTROL}
+        if current.last_modified is not None:
+            headers["Last-Modified"] = _http_date(current.last_modified)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, headers["ETag"]):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        setattr(request.state, _STATE_KEY, headers)
+
+    return Depends(check)
+
+
+class CacheValidatorsMiddleware:
+    """Adds the validators `conditional` stored on the request to its 200 response."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # request.state writes into this dict, which the inner app shares
+        state = scope.setdefault("state", {})
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                validators = state.get(_STATE_KEY)
+                if validators:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in validators.items():
+                        headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
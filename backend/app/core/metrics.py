@@ -0,0 +1,306 @@
+"""In-process Prometheus-style metrics.
+
+A deliberately small registry (counters, gauges, histograms with labels)
+rendered in the Prometheus text exposition format by GET /metrics, so the
+API can be scraped locally without running any extra service or adding a
+client library. The endpoint is off unless METRICS_ENABLED is set, and takes
+a bearer token when METRICS_BEARER_TOKEN is set:
+
+    scrape_configs:
+      - job_name: sanrakshya
+        authorization:
+          credentials: <METRICS_BEARER_TOKEN>
+
+Metric objects are module-level singletons; instrumented code imports them
+directly:
+
+    from app.core.metrics import prediction_stage_seconds
+    with prediction_stage_seconds.time(stage="inference", age_group=group):
+        ...
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(line + "\n" for line in self.samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Gauge whose values are either set explicitly or read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._callbacks: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def set_function(self, fn: Callable[[], float], **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._callbacks[key] = fn
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = dict(self._values)
+            callbacks = dict(self._callbacks)
+        for key, fn in callbacks.items():
+            try:
+                values[key] = float(fn())
+            except Exception:
+                continue
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            series[0][idx] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s[0])) for k, (c, s) in self._series.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(m.render() for m in metrics)
+
+
+registry = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route", "status"),
+))
+db_pool_checkout_wait_seconds = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection.",
+    ("engine",),
+))
+db_pool_connections = registry.register(Gauge(
+    "db_pool_connections", "DB pool connections by state (in_use, idle, overflow).",
+    ("engine", "state"),
+))
+model_cache_requests_total = registry.register(Counter(
+    "model_cache_requests_total", "Model cache lookups by result (hit, miss, missing).",
+    ("result",),
+))
+model_load_seconds = registry.register(Histogram(
+    "model_load_seconds", "Time to load a model file from disk.",
+    ("model",),
+))
+prediction_stage_seconds = registry.register(Histogram(
+    "prediction_stage_seconds", "Prediction pipeline stage latency.",
+    ("stage", "age_group"),
+))
+prediction_requests_total = registry.register(Counter(
+    "prediction_requests_total", "Prediction requests by outcome (reused, computed, shared).",
+    ("result",),
+))
+llm_request_seconds = registry.register(Histogram(
+    "llm_request_seconds", "LLM call latency.",
+    ("client",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0),
+))
+llm_errors_total = registry.register(Counter(
+    "llm_errors_total", "LLM calls that failed or returned unusable output.",
+    ("client",),
+))
+vector_search_seconds = registry.register(Histogram(
+    "vector_search_seconds", "Retriever latency (query embedding + FAISS similarity search).",
+    ("index",),
+))
+
+
+def _wrap_pool_connect(engine: Engine, name: str) -> None:
+    pool = engine.pool
+    connect = pool.connect
+
+    def timed_connect(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return connect(*args, **kwargs)
+        finally:
+            db_pool_checkout_wait_seconds.observe(time.perf_counter() - start, engine=name)
+
+    pool.connect = timed_connect
+
+
+def install_pool_metrics(engine: Engine, name: str) -> None:
+    """Expose pool occupancy gauges and checkout wait time for a sync Engine."""
+    _wrap_pool_connect(engine, name)
+    # dispose() swaps in a fresh pool; instrument the replacement as well
+    event.listen(engine, "engine_disposed", lambda conn: _wrap_pool_connect(engine, name))
+
+    def _stat(attr: str) -> Callable[[], float]:
+        def read() -> float:
+            fn = getattr(engine.pool, attr, None)
+            return float(fn()) if callable(fn) else 0.0
+        return read
+
+    db_pool_connections.set_function(_stat("checkedout"), engine=name, state="in_use")
+    db_pool_connections.set_function(_stat("checkedin"), engine=name, state="idle")
+    db_pool_connections.set_function(lambda: max(0.0, _stat("overflow")()), engine=name, state="overflow")
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per matched route template."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            # Unmatched paths share one label so random URLs cannot blow up cardinality
+            template = getattr(route, "path", None) or "<unmatched>"
+            http_request_duration_seconds.observe(
+                time.perf_counter() - start,
+                method=scope.get("method", ""),
+                route=template,
+                status=str(status_code),
+            )
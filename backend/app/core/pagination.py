@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from typing import Tuple
+
+from sqlalchemy import and_, or_
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque keyset cursor for a (created_at, id) position."""
+    raw = f"{created_at.isoformat()}|{int(row_id)}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError for anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        ts, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except Exception as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+
+
+def keyset_before(created_col, id_col, position: Tuple[datetime, int]):
+    """Rows strictly before position in (created_at, id) order (next page of a DESC listing)."""
+    created_at, row_id = position
+    return or_(created_col < created_at, and_(created_col == created_at, id_col < row_id))
+
+
+def keyset_after(created_col, id_col, position: Tuple[datetime, int]):
+    """Rows strictly after position in (created_at, id) order (ASC paging and `since`)."""
+    created_at, row_id = position
+    return or_(created_col > created_at, and_(created_col == created_at, id_col > row_id))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import inspect
+
+from app.core.config import settings
+
+
+class PrincipalCache:
+    """Short-lived, bounded cache of authenticated principals keyed by bearer token.
+
+    Entries hold a plain snapshot of the user's column values (not the ORM
+    instance), so every hit hands out a fresh detached object that is not bound
+    to any session. Entries are indexed by (user_type, primary key) so a change
+    to the underlying parent/doctor row can drop every token issued for it.
+
+    Invalidation only reaches this process: other workers keep serving a
+    changed or deactivated user until their entry expires, so
+    PRINCIPAL_CACHE_TTL_SECONDS bounds that window.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[str, Any], type, Dict[str, Any]]]" = OrderedDict()
+        self._by_identity: Dict[Tuple[str, Any], set[str]] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; see put(generation=...)
+        self._generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, token: str):
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires_at, identity, cls, values = entry
+            if expires_at <= now:
+                self._drop(token)
+                return None
+            self._entries.move_to_end(token)
+        return cls(**values)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def put(self, token: str, user_type: str, user, *, generation: Optional[int] = None) -> None:
+        """Cache `user` for `token`.
+
+        Pass the `generation` read before loading the user: if an
+        invalidation ran in between, the row may predate it and is not cached.
+        """
+        if not self.enabled or user is None:
+            return
+        state = inspect(user)
+        mapper = state.mapper
+        # Only already-loaded columns: touching an unloaded one would lazy-load,
+        # which an AsyncSession cannot do implicitly.
+        loaded = state.dict
+        values = {attr.key: loaded[attr.key] for attr in mapper.column_attrs if attr.key in loaded}
+        identity = (user_type, state.identity[0] if state.identity else None)
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if token in self._entries:
+                self._drop(token)
+            self._entries[token] = (expires_at, identity, mapper.class_, values)
+            self._by_identity.setdefault(identity, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+
+    def invalidate(self, user_type: str, ident: Any) -> None:
+        with self._lock:
+            self._generation += 1
+            for token in list(self._by_identity.get((user_type, ident), ())):
+                self._drop(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_identity.clear()
+
+    def _drop(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        identity = entry[1]
+        tokens = self._by_identity.get(identity)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                self._by_identity.pop(identity, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+
+def invalidate_principal(user_type: str, ident: Optional[Any]) -> None:
+    if ident is None:
+        return
+    principal_cache.invalidate(user_type, ident)
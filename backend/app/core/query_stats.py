@@ -0,0 +1,206 @@
+"""Per-request SQL statement accounting.
+
+Engine event hooks (installed by app.db.session) record every statement into
+the QueryStats bound to the current context. QueryStatsMiddleware binds a
+fresh QueryStats per HTTP request, logs a structured summary line and, in
+DEBUG mode, exposes the numbers as X-DB-* response headers. Tests and
+scripts can use assert_query_budget to pin how many statements a code path
+may issue.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger("sanrakshya.db")
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+def _param_shape(parameters: Any, executemany: bool) -> Any:
+    # Only types, never values: parameters routinely carry PII and password hashes
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return {"rows": len(parameters), "row": _param_shape(parameters[0], False)}
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(v).__name__ for v in parameters]
+    return type(parameters).__name__
+
+
+class QueryStats:
+    """Statement count, total DB time and the N slowest statements."""
+
+    def __init__(self, keep_slowest: int = 5, parent: Optional["QueryStats"] = None) -> None:
+        self.statements = 0
+        self.db_time = 0.0
+        self.keep_slowest = keep_slowest
+        self._slowest: List[Tuple[float, int, str, Any]] = []
+        # sync routes run in the threadpool and share the request's stats object
+        self._lock = threading.Lock()
+        # nested trackers (e.g. a test budget around a request) also see the statements
+        self.parent = parent
+
+    def record(self, statement: str, parameters: Any, executemany: bool, elapsed: float) -> None:
+        if self.parent is not None:
+            self.parent.record(statement, parameters, executemany, elapsed)
+        with self._lock:
+            self.statements += 1
+            self.db_time += elapsed
+            item = (elapsed, self.statements, statement, (parameters, executemany))
+            if len(self._slowest) < self.keep_slowest:
+                heapq.heappush(self._slowest, item)
+            elif elapsed > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+
+    @property
+    def db_time_ms(self) -> float:
+        return self.db_time * 1000.0
+
+    def slowest(self) -> List[dict]:
+        with self._lock:
+            items = sorted(self._slowest, reverse=True)
+        return [
+            {
+                "ms": round(elapsed * 1000.0, 2),
+                "statement": " ".join(statement.split())[:300],
+                "params": _param_shape(params, executemany),
+            }
+            for elapsed, _, statement, (params, executemany) in items
+        ]
+
+    def as_dict(self) -> dict:
+        return {
+            "statements": self.statements,
+            "db_ms": round(self.db_time_ms, 2),
+            "slowest": self.slowest(),
+        }
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(keep_slowest: int = 5) -> Iterator[QueryStats]:
+    stats = QueryStats(keep_slowest=keep_slowest, parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def assert_query_budget(max_statements: int, max_db_ms: Optional[float] = None) -> Iterator[QueryStats]:
+    """Fail if the wrapped block issues more statements (or DB time) than budgeted.
+
+        with assert_query_budget(4):
+            client.get("/children/list-children", headers=auth)
+
+    Works with TestClient because the request runs in the caller's context.
+    """
+    with track_queries(keep_slowest=max_statements + 1) as stats:
+        yield stats
+    problems = []
+    if stats.statements > max_statements:
+        problems.append(f"{stats.statements} statements (budget {max_statements})")
+    if max_db_ms is not None and stats.db_time_ms > max_db_ms:
+        problems.append(f"{stats.db_time_ms:.1f} ms in the database (budget {max_db_ms} ms)")
+    if problems:
+        detail = json.dumps(stats.slowest(), indent=2)
+        raise AssertionError("Query budget exceeded: " + ", ".join(problems) + "\n" + detail)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start_time")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, parameters, executemany, elapsed)
+    if elapsed * 1000.0 >= settings.SLOW_QUERY_MS:
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "ms": round(elapsed * 1000.0, 2),
+            "statement": " ".join(statement.split())[:300],
+            "params": _param_shape(parameters, executemany),
+        }))
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is not None:
+        starts = conn.info.get("query_start_time")
+        if starts:
+            starts.pop()
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """Attach the statement timing hooks to a sync Engine (or AsyncEngine.sync_engine)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware binding a QueryStats to each HTTP request."""
+
+    def __init__(self, app, *, expose_headers: bool = False) -> None:
+        self.app = app
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+        with track_queries() as stats:
+
+            async def send_wrapper(message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    if self.expose_headers:
+                        headers = list(message.get("headers", []))
+                        headers.append((b"x-db-query-count", str(stats.statements).encode()))
+                        headers.append((b"x-db-time-ms", f"{stats.db_time_ms:.2f}".encode()))
+                        top = stats.slowest()[:1]
+                        if top:
+                            headers.append((b"x-db-slowest-ms", str(top[0]["ms"]).encode()))
+                        message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if stats.statements and logger.isEnabledFor(logging.INFO):
+                    logger.info(json.dumps({
+                        "event": "db_request",
+                        "method": scope.get("method"),
+                        "path": scope.get("path"),
+                        "status": status_code,
+                        "duration_ms": round((time.perf_counter() - started) * 1000.0, 2),
+                        **stats.as_dict(),
+                    }))
@@ -1,20 +1,58 @@
+import asyncio
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from app.core.config import settings
 
+# bcrypt is deliberately slow (~250 ms at cost 12) and holds no GIL while hashing,
+# so async callers offload it to this bounded pool instead of blocking the loop.
+_password_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.PASSWORD_HASH_WORKERS),
+    thread_name_prefix="bcrypt",
+)
+
 
 def get_password_hash(password: str):
     # Truncate password to 72 bytes as required by bcrypt
     truncated_password_bytes = password.encode('utf-8')[:72]
     # Hash the truncated password directly using bcrypt
-    return bcrypt.hashpw(truncated_password_bytes, bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(truncated_password_bytes, bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode('utf-8')
 
 def verify_password(plain_password: str, hashed_password: str):
     plain_password_bytes = plain_password.encode('utf-8')
     hashed_password_bytes = hashed_password.encode('utf-8')
     return bcrypt.checkpw(plain_password_bytes, hashed_password_bytes)
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    # bcrypt hashes look like $2b$<cost>$<salt+digest>
+    try:
+        cost = int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return True
+    return cost != settings.BCRYPT_ROUNDS
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password off the event loop.
+
+    Returns (verified, new_hash). new_hash is set only when the password matched
+    and the stored hash was produced with a different BCRYPT_ROUNDS, so the
+    caller can persist it and the cost change takes effect transparently.
+    """
+    if not await verify_password_async(plain_password, hashed_password):
+        return False, None
+    if password_needs_rehash(hashed_password):
+        return True, await get_password_hash_async(plain_password)
+    return True, None
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Generic, Optional, Tuple, TypeVar
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+def table_stamp(db: Session, model) -> Tuple[Any, ...]:
+    """(row count, max(updated_at)): changes whenever a row is added, removed or updated."""
+    return tuple(db.query(func.count(), func.max(model.updated_at)).select_from(model).one())
+
+
+class TableSnapshot(Generic[T]):
+    """A per-process structure derived from a small reference table.
+
+    ``build(db)`` is run on first use. It runs again when ``table_stamp``
+    changes, which is checked at most every REFERENCE_INDEX_RECHECK_SECONDS,
+    so other workers pick up a reseed within that window. ``refresh(db)``
+    rebuilds right away, and ``invalidate()`` forces the stamp check on the
+    next ``get``.
+    """
+
+    def __init__(self, model, build: Callable[[Session], T]) -> None:
+        self.model = model
+        self._build = build
+        self._lock = threading.Lock()
+        self._value: Optional[T] = None
+        self._stamp: Tuple[Any, ...] = ()
+        self._checked_at = 0.0
+
+    def refresh(self, db: Session) -> T:
+        stamp = table_stamp(db, self.model)
+        value = self._build(db)
+        with self._lock:
+            self._value, self._stamp, self._checked_at = value, stamp, time.monotonic()
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._checked_at = 0.0
+
+    def get(self, db: Session) -> T:
+        value = self._value
+        if value is None:
+            return self.refresh(db)
+        if time.monotonic() - self._checked_at < settings.REFERENCE_INDEX_RECHECK_SECONDS:
+            return value
+        if table_stamp(db, self.model) != self._stamp:
+            return self.refresh(db)
+        with self._lock:
+            self._checked_at = time.monotonic()
+        return value
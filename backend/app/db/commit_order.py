@@ -0,0 +1,56 @@
+"""Reading append-only tables in commit order.
+
+Ids come from a sequence at insert time, not at commit time. On Postgres, a
+transaction that inserted id 10 can commit after one that inserted id 11.
+A reader between the two commits sees 11 but not 10, and a cursor that moves
+past 11 never returns to 10.
+
+Tables read incrementally (change_log, child_prediction_reports) therefore
+carry xact_id, the id of the transaction that wrote the row. Postgres fills
+it through the current_xact_id() server default. Readers page in
+(xact_id, id) order and only up to committed_horizon(), the oldest
+transaction that is still running. Every transaction below the horizon has
+finished, and any transaction that commits later has an id at or above it,
+so a cursor never moves past a row that can still appear. The cost is that
+a long-running writer holds readers back until it commits.
+
+SQLite runs one write transaction at a time, so ids are already in commit
+order. There, xact_id is 0 and the horizon is unbounded.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import BigInteger, text, true
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class current_xact_id(FunctionElement):
+    """Server default for xact_id columns: the writing transaction's id (0 off Postgres)."""
+
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(current_xact_id)
+def _current_xact_id_default(element, compiler, **kw) -> str:
+    return "0"
+
+
+@compiles(current_xact_id, "postgresql")
+def _current_xact_id_postgresql(element, compiler, **kw) -> str:
+    return "(pg_current_xact_id()::text::bigint)"
+
+
+def committed_horizon(db: Session) -> Optional[int]:
+    """Oldest transaction id still running (rows below it are final); None when unbounded."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    return db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")).scalar()
+
+
+def committed(xact_col, horizon: Optional[int]):
+    """Filter keeping rows whose writer is below `horizon` (see committed_horizon)."""
+    return true() if horizon is None else xact_col < horizon
@@ -9,6 +9,8 @@ from app.models.models import (
     ChildVaccineStatus,
     ChildMilestone,
     ChildMilestoneStatus,
+    ChildPredictionReport,
+    ChildMedicalReport,
     NutritionRequirement,
 )
 from app.schemas.schemas import (
@@ -33,6 +35,10 @@ from app.models.models import ChildAnthropometry as ChildAnthropometryModel
 from app.schemas.schemas import ChildIllnessLogCreate, ChildIllnessLogUpdate, ResolveIllnessLogRequest
 from app.schemas.schemas import ChildAnthropometryCreate as ChildAnthropometryCreateSchema
 from app.models.models import FoodMaster
+from app.services.food_index import invalidate_food_index
+from app.db.crud_daily_nutrients import add_daily_nutrients, item_totals
+from app.db.crud_changes import record_change, record_changes
+from app.schemas.schemas import ChangeEntityEnum, ChangeOpEnum
 from app.models.models import ChildMealLog as ChildMealLogModel
 from app.models.models import ChildMealItem as ChildMealItemModel
 from app.schemas.schemas import FoodAgeGroupEnum
@@ -70,6 +76,7 @@ def create_child_meal_log(
     )
     db.add(row)
     db.flush()
+    items = []
     for item in payload.items:
         if (item.food_id is None and not item.custom_food_name) or (item.food_id is not None and item.custom_food_name):
             raise ValueError("Each item must provide either food_id or custom_food_name")
@@ -105,7 +112,7 @@ def create_child_meal_log(
                 'vitamin_a_mcg': 0.0,
                 'vitamin_c_mg': 0.0,
             }
-        db.add(ChildMealItemModel(
+        items.append(ChildMealItemModel(
             meal_log_id=row.id,
             meal_type=item.meal_type,
             food_id=item.food_id,
@@ -122,6 +129,11 @@ def create_child_meal_log(
             vitamin_a_mcg=nutrients.get('vitamin_a_mcg'),
             vitamin_c_mg=nutrients.get('vitamin_c_mg'),
         ))
+    db.add_all(items)
+    # Same transaction as the items, so the rollup never drifts from them
+    add_daily_nutrients(
+        db, child_id=child_id, log_date=row.log_date, totals=item_totals(items), item_count=len(items)
+    )
     db.commit()
     db.refresh(row)
     return row
@@ -230,6 +242,11 @@ def update_parent(db: Session, db_parent: Parent, updates):
     db.refresh(db_parent)
     return db_parent
 
+def update_parent_password_hash(db: Session, db_parent: Parent, password_hash: str):
+    db_parent.password_hash = password_hash
+    db.commit()
+    return db_parent
+
 # Children CRUD
 def list_children_by_parent(db: Session, parent_id: int):
     return db.query(Child).filter(Child.parent_id == parent_id).all()
@@ -302,7 +319,21 @@ def update_child(db: Session, db_child: Child, updates: ChildUpdate):
     db.refresh(db_child)
     return db_child
 
+# Synced rows removed by the children.child_id ON DELETE CASCADE
+_CHILD_SYNCED_ENTITIES = (
+    (ChangeEntityEnum.ILLNESS_LOG, ChildIllnessLog, ChildIllnessLog.id),
+    (ChangeEntityEnum.VACCINE_STATUS, ChildVaccineStatus, ChildVaccineStatus.id),
+    (ChangeEntityEnum.MILESTONE_STATUS, ChildMilestoneStatus, ChildMilestoneStatus.id),
+    (ChangeEntityEnum.PREDICTION_REPORT, ChildPredictionReport, ChildPredictionReport.id),
+    (ChangeEntityEnum.MEDICAL_REPORT, ChildMedicalReport, ChildMedicalReport.report_id),
+)
+
+
 def delete_child(db: Session, db_child: Child):
+    # Tombstone every cascaded row first: record_changes looks the parent up from the child
+    for entity_type, model, id_column in _CHILD_SYNCED_ENTITIES:
+        ids = db.query(id_column).filter(model.child_id == db_child.child_id).all()
+        record_changes(db, entity_type, [(db_child.child_id, entity_id) for (entity_id,) in ids], ChangeOpEnum.DELETE)
     db.delete(db_child)
     db.commit()
     return True
@@ -425,6 +456,7 @@ def _upsert_food(
                 changed = True
         if changed:
             db.commit(); db.refresh(existing)
+            invalidate_food_index()
         return existing
     row = FoodMaster(
         food_name=food_name,
@@ -433,6 +465,7 @@ def _upsert_food(
     )
     db.add(row)
     db.commit(); db.refresh(row)
+    invalidate_food_index()
     return row
 
 def list_foods_by_age_group(db: Session, age_group: FoodAgeGroupEnum):
@@ -529,15 +562,16 @@ def normalize_all_text_fields(db: Session):
             sch_changed += 1
     # Normalize child status scheduled_text
     statuses = db.query(ChildVaccineStatus).all()
-    st_changed = 0
+    st_changed = []
     for st in statuses:
         new_sched = _normalize(st.scheduled_text)
         if new_sched != st.scheduled_text:
             st.scheduled_text = new_sched
-            st_changed += 1
+            st_changed.append((st.child_id, st.id))
+    record_changes(db, ChangeEntityEnum.VACCINE_STATUS, st_changed)
     if sch_changed or st_changed:
         db.commit()
-    return {"schedules_updated": sch_changed, "statuses_updated": st_changed}
+    return {"schedules_updated": sch_changed, "statuses_updated": len(st_changed)}
 
 def seed_all_vaccination_schedules(db: Session):
     # Bulk dataset provided by user: (name, disease, recommended_age, doses, category, age_group)
@@ -642,6 +676,9 @@ def initialize_child_vaccine_statuses_for_group(db: Session, child_id: int, age_
             )
             db.add(cvs)
             created.append(cvs)
+    if created:
+        db.flush()
+        record_changes(db, ChangeEntityEnum.VACCINE_STATUS, [(c.child_id, c.id) for c in created])
     db.commit()
     # refresh to get IDs
     for item in created:
@@ -675,6 +712,7 @@ def update_child_vaccine_status(db: Session, db_status: ChildVaccineStatus, upda
         db_status.notes = updates.notes
     if updates.side_effects is not None:
         db_status.side_effects = updates.side_effects
+    record_change(db, ChangeEntityEnum.VACCINE_STATUS, child_id=db_status.child_id, entity_id=db_status.id)
     db.commit()
     db.refresh(db_status)
     return db_status
@@ -727,6 +765,8 @@ def record_vaccine_given(
         notes=notes,
     )
     db.add(new_row)
+    db.flush()
+    record_change(db, ChangeEntityEnum.VACCINE_STATUS, child_id=child_id, entity_id=new_row.id)
     db.commit()
     db.refresh(new_row)
     return new_row
@@ -856,6 +896,7 @@ def upsert_child_milestone_status(db: Session, *, payload: ChildMilestoneStatusC
         if getattr(payload, 'special_milestone', None) is not None and row.special_milestone != payload.special_milestone:
             row.special_milestone = payload.special_milestone; changed = True
         if changed:
+            record_change(db, ChangeEntityEnum.MILESTONE_STATUS, child_id=row.child_id, entity_id=row.id)
             db.commit(); db.refresh(row)
         return row
     new_row = ChildMilestoneStatus(
@@ -866,6 +907,8 @@ def upsert_child_milestone_status(db: Session, *, payload: ChildMilestoneStatusC
         special_milestone=payload.special_milestone,
     )
     db.add(new_row)
+    db.flush()
+    record_change(db, ChangeEntityEnum.MILESTONE_STATUS, child_id=new_row.child_id, entity_id=new_row.id)
     db.commit()
     db.refresh(new_row)
     return new_row
@@ -884,7 +927,7 @@ def ensure_status_rows_for_child_group(db: Session, *, child: Child):
     """
     group = compute_child_age_group(child.date_of_birth)
     milestones = list_milestones_by_age_group(db, group)
-    created = 0
+    created = []
     for m in milestones:
         exists = get_child_milestone_status(db, child_id=child.child_id, milestone_id=m.id)
         if exists:
@@ -898,8 +941,10 @@ def ensure_status_rows_for_child_group(db: Session, *, child: Child):
             special_milestone=False,
         )
         db.add(row)
-        created += 1
+        created.append(row)
     if created:
+        db.flush()
+        record_changes(db, ChangeEntityEnum.MILESTONE_STATUS, [(r.child_id, r.id) for r in created])
         db.commit()
     # return full list after ensuring
     return list_child_milestone_statuses(db, child_id=child.child_id)
@@ -951,6 +996,8 @@ def create_child_illness_log(db: Session, child_id: int, payload: ChildIllnessLo
             from app.schemas.schemas import ResolvedByEnum
             row.resolved_by = ResolvedByEnum.PARENT
     db.add(row)
+    db.flush()
+    record_change(db, ChangeEntityEnum.ILLNESS_LOG, child_id=child_id, entity_id=row.id)
     db.commit()
     db.refresh(row)
     return row
@@ -981,6 +1028,7 @@ def update_child_illness_log(db: Session, *, row: ChildIllnessLog, updates: Chil
         value = getattr(updates, field, None)
         if value is not None:
             setattr(row, field, value)
+    record_change(db, ChangeEntityEnum.ILLNESS_LOG, child_id=row.child_id, entity_id=row.id)
     db.commit(); db.refresh(row)
     return row
 
@@ -990,6 +1038,7 @@ def resolve_child_illness_log(db: Session, *, row: ChildIllnessLog, req: Resolve
         row.resolved_on = req.resolved_on
     if getattr(req, 'resolved_by', None) is not None:
         row.resolved_by = req.resolved_by
+    record_change(db, ChangeEntityEnum.ILLNESS_LOG, child_id=row.child_id, entity_id=row.id)
     db.commit(); db.refresh(row)
     return row
 
@@ -0,0 +1,70 @@
+"""AsyncSession counterparts of the read-only CRUD helpers used on hot paths.
+
+Results are fully loaded before returning (no lazy attributes), because the
+AsyncSession cannot lazy-load once the calling coroutine has moved on.
+"""
+from __future__ import annotations
+
+from typing import List, Literal, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.doctor.models import Doctor
+from app.models.models import Child, ChildIllnessLog, ChildMedicalReport, Parent
+
+
+async def get_parent_by_email(db: AsyncSession, email: str) -> Optional[Parent]:
+    result = await db.execute(
+        select(Parent).where(Parent.email == email, Parent.is_active == True).limit(1)
+    )
+    return result.scalars().first()
+
+
+async def get_doctor_by_email(db: AsyncSession, email: str) -> Optional[Doctor]:
+    # Unlike the sync helper, specialization is not deferred: it could not be
+    # lazy-loaded later when the doctor is serialized.
+    result = await db.execute(select(Doctor).where(Doctor.email == email).limit(1))
+    return result.scalars().first()
+
+
+async def list_children_by_parent(db: AsyncSession, parent_id: int) -> List[Child]:
+    result = await db.execute(select(Child).where(Child.parent_id == parent_id))
+    return list(result.scalars().all())
+
+
+async def get_child_by_id_and_parent(db: AsyncSession, child_id: int, parent_id: int) -> Optional[Child]:
+    result = await db.execute(
+        select(Child).where(Child.child_id == child_id, Child.parent_id == parent_id).limit(1)
+    )
+    return result.scalars().first()
+
+
+async def list_child_illness_logs(
+    db: AsyncSession,
+    *,
+    child_id: int,
+    status: Literal['current', 'resolved', 'history', 'all'] = 'all',
+) -> List[ChildIllnessLog]:
+    stmt = select(ChildIllnessLog).where(ChildIllnessLog.child_id == child_id)
+    if status == 'current':
+        stmt = stmt.where(ChildIllnessLog.is_current == True)
+    elif status == 'resolved':
+        stmt = stmt.where(ChildIllnessLog.resolved_on.isnot(None))
+    elif status == 'history':
+        stmt = stmt.where(ChildIllnessLog.is_current == False)
+    result = await db.execute(stmt.order_by(ChildIllnessLog.created_at.desc()))
+    return list(result.scalars().all())
+
+
+async def get_child_illness_log_by_id(db: AsyncSession, *, log_id: int) -> Optional[ChildIllnessLog]:
+    return await db.get(ChildIllnessLog, log_id)
+
+
+async def list_child_reports(db: AsyncSession, *, child_id: int) -> List[ChildMedicalReport]:
+    result = await db.execute(
+        select(ChildMedicalReport)
+        .where(ChildMedicalReport.child_id == child_id)
+        .order_by(ChildMedicalReport.created_at.desc())
+    )
+    return list(result.scalars().all())
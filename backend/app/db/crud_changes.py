@@ -0,0 +1,123 @@
+"""change_log: the per-parent change feed behind GET /sync/changes.
+
+Write paths call record_changes before their commit, so a change row
+commits or rolls back with the write it describes. The feed reads one
+parent's rows after a cursor and keeps only the last operation per entity,
+so an entity edited ten times while the app was closed is sent once.
+
+Rows are read in (xact_id, id) order and only up to the committed horizon
+(app.db.commit_order), so a cursor never steps past a change whose write
+has not committed yet. The cursor is the "<xact_id>.<id>" of the last row
+read.
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.pagination import keyset_after
+from app.db.commit_order import committed, committed_horizon
+from app.models.models import ChangeLog, Child
+from app.schemas.schemas import ChangeEntityEnum, ChangeOpEnum
+
+
+def record_changes(
+    db: Session,
+    entity_type: ChangeEntityEnum,
+    changes: Iterable[Tuple[int, int]],
+    op: ChangeOpEnum = ChangeOpEnum.UPSERT,
+) -> None:
+    """Append (child_id, entity_id) changes to the children's parents' feeds. Does not commit."""
+    changes = list(changes)
+    if not changes:
+        return
+    parents = dict(
+        db.query(Child.child_id, Child.parent_id)
+        .filter(Child.child_id.in_({child_id for child_id, _ in changes}))
+        .all()
+    )
+    db.execute(insert(ChangeLog), [
+        {
+            "parent_id": parents[child_id],
+            "child_id": child_id,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "op": op,
+        }
+        for child_id, entity_id in changes
+    ])
+
+
+def record_change(
+    db: Session,
+    entity_type: ChangeEntityEnum,
+    *,
+    child_id: int,
+    entity_id: int,
+    op: ChangeOpEnum = ChangeOpEnum.UPSERT,
+) -> None:
+    record_changes(db, entity_type, [(child_id, entity_id)], op)
+
+
+def format_cursor(position: Tuple[int, int]) -> str:
+    xact_id, change_id = position
+    return f"{int(xact_id)}.{int(change_id)}"
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[Tuple[int, int]]:
+    """(xact_id, id) of a cursor, or None when it is missing or malformed."""
+    try:
+        xact_id, change_id = (cursor or "").split(".")
+        return int(xact_id), int(change_id)
+    except ValueError:
+        return None
+
+
+def change_head(db: Session) -> Tuple[int, int]:
+    """Position of the newest committed change; a cursor for 'everything up to now'."""
+    row = (
+        db.query(ChangeLog.xact_id, ChangeLog.id)
+        .filter(committed(ChangeLog.xact_id, committed_horizon(db)))
+        .order_by(ChangeLog.xact_id.desc(), ChangeLog.id.desc())
+        .first()
+    )
+    return (row.xact_id, row.id) if row else (0, 0)
+
+
+class ChangePage(NamedTuple):
+    upserts: Dict[ChangeEntityEnum, List[int]]
+    deletes: Dict[ChangeEntityEnum, List[int]]
+    cursor: Tuple[int, int]
+    has_more: bool
+
+
+def read_changes(db: Session, *, parent_id: int, cursor: Tuple[int, int], limit: int) -> ChangePage:
+    """Up to `limit` committed change rows after `cursor`, compacted to the last op per entity."""
+    rows = (
+        db.query(ChangeLog.xact_id, ChangeLog.id, ChangeLog.entity_type, ChangeLog.entity_id, ChangeLog.op)
+        .filter(
+            ChangeLog.parent_id == parent_id,
+            keyset_after(ChangeLog.xact_id, ChangeLog.id, cursor),
+            committed(ChangeLog.xact_id, committed_horizon(db)),
+        )
+        .order_by(ChangeLog.xact_id.asc(), ChangeLog.id.asc())
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    last: Dict[Tuple[ChangeEntityEnum, int], ChangeOpEnum] = {}
+    for _, _, entity_type, entity_id, op in rows:
+        last[(entity_type, entity_id)] = op
+    upserts: Dict[ChangeEntityEnum, List[int]] = {}
+    deletes: Dict[ChangeEntityEnum, List[int]] = {}
+    for (entity_type, entity_id), op in sorted(last.items()):
+        target = upserts if op == ChangeOpEnum.UPSERT else deletes
+        target.setdefault(entity_type, []).append(entity_id)
+    position = (rows[-1].xact_id, rows[-1].id) if rows else cursor
+    return ChangePage(upserts, deletes, position, has_more)
+
+
+def valid_cursor(db: Session, cursor: Optional[Tuple[int, int]]) -> bool:
+    # Unknown cursors (none yet, malformed, or ahead of this database) need a full refetch
+    return cursor is not None and (0, 0) <= cursor <= change_head(db)
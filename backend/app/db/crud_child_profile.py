@@ -1,4 +1,4 @@
-from datetime import date, timedelta
+from datetime import date
 from typing import Optional, Dict, Any, List
 
 from sqlalchemy.orm import Session
@@ -16,6 +16,7 @@ from app.schemas.schemas import VaccineStatusEnum, VaccineCategoryEnum, Vaccinat
 from app.services.prediction_common import latest_anthro, compute_who_zscores, trend_anthro, sex_to_int
 from app.db.crud_nutrition import get_child_weekly_nutrition_summary
 from app.db.crud import compute_child_age_group
+from app.services.vaccine_schedule import schedule_plan
 
 
 def _classify_wfa(z: Optional[float]) -> str:
@@ -65,30 +66,6 @@ def _age_ym(dob: date, as_of: date) -> Dict[str, int]:
     return {"years": int(years), "months": int(months)}
 
 
-def _parse_recommended_min_months(txt: Optional[str]) -> Optional[int]:
-    if not txt:
-        return None
-    t = txt.strip().lower()
-    import re
-    m = re.search(r"(\d+)\s*years?", t)
-    if m:
-        return int(m.group(1)) * 12
-    m = re.search(r"(\d+)(?:\s*[-–]\s*\d+)?\s*months?", t)
-    if m:
-        return int(m.group(1))
-    m = re.search(r"(\d+)\s*weeks?", t)
-    if m:
-        w = int(m.group(1))
-        return max(0, int(round(w / 4.345)))
-    m = re.search(r"(\d+)\s*days?", t)
-    if m:
-        d = int(m.group(1))
-        return max(0, int(round(d / 30.0)))
-    if "birth" in t or "newborn" in t:
-        return 0
-    return None
-
-
 def _vaccination_summary(db: Session, child: Child) -> Dict[str, Any]:
     today = date.today()
     # Determine child's current vaccination age group
@@ -120,56 +97,6 @@ def _vaccination_summary(db: Session, child: Child) -> Dict[str, Any]:
     next_due_date: Optional[date] = None
     next_due_name: Optional[str] = None
     next_due_recommended_age: Optional[str] = None
-    def _parse_due_date(age_text: Optional[str], dose_number: int, dob: date) -> Optional[date]:
-        if not age_text:
-            return None
-        txt = age_text.replace('\u2013', '-').replace('\u2014', '-').replace('\u2212', '-').replace('\u2011', '-').replace('\u00A0', ' ')
-        txt = txt.lower()
-        import re
-        m_list = re.findall(r"(\d+)\s*,?", txt)
-        unit = None
-        if 'week' in txt:
-            unit = 'week'
-        elif 'month' in txt:
-            unit = 'month'
-        elif 'year' in txt:
-            unit = 'year'
-        if 'at birth' in txt:
-            return dob
-        m_range = re.search(r"(\d+)\s*[-]\s*(\d+)", txt)
-        if m_range and unit:
-            upper = int(m_range.group(2))
-            if unit == 'week':
-                return dob + timedelta(days=upper * 7)
-            if unit == 'month':
-                return dob + timedelta(days=upper * 30)
-            if unit == 'year':
-                return dob + timedelta(days=upper * 365)
-        if m_list and unit:
-            idx = max(0, min(len(m_list) - 1, dose_number - 1))
-            val = int(m_list[idx])
-            if unit == 'week':
-                return dob + timedelta(days=val * 7)
-            if unit == 'month':
-                return dob + timedelta(days=val * 30)
-            if unit == 'year':
-                return dob + timedelta(days=val * 365)
-        m_single = re.search(r"(\d+)", txt)
-        if m_single and unit:
-            val = int(m_single.group(1))
-            if unit == 'week':
-                return dob + timedelta(days=val * 7)
-            if unit == 'month':
-                return dob + timedelta(days=val * 30)
-            if unit == 'year':
-                return dob + timedelta(days=val * 365)
-        if 'every year' in txt:
-            return dob + timedelta(days=365)
-        if 'every 6 months' in txt:
-            if '9 months' in txt:
-                return dob + timedelta(days=9 * 30)
-            return dob + timedelta(days=6 * 30)
-        return None
     # Walk through each core schedule and each required dose in CURRENT age group to find missed and next due
     for sch in schedules:
         total = getattr(sch, "doses_required", None) or 1
@@ -189,8 +116,7 @@ def _vaccination_summary(db: Session, child: Child) -> Dict[str, Any]:
             if st is not None and getattr(st, "scheduled_date", None) is not None:
                 due = getattr(st, "scheduled_date")
             else:
-                age_text = getattr(sch, 'recommended_age', None)
-                due = _parse_due_date(age_text, dose_number, child.date_of_birth) if age_text is not None else None
+                due = schedule_plan(sch).due_date(dose_number, child.date_of_birth)
             if due is None:
                 continue
             # Count overdue doses as missed for CURRENT age group
@@ -248,8 +174,7 @@ def _vaccination_summary(db: Session, child: Child) -> Dict[str, Any]:
                     if st is not None and getattr(st, "scheduled_date", None) is not None:
                         due = getattr(st, "scheduled_date")
                     else:
-                        age_text = getattr(sch, 'recommended_age', None)
-                        due = _parse_due_date(age_text, dose_number, child.date_of_birth) if age_text is not None else None
+                        due = schedule_plan(sch).due_date(dose_number, child.date_of_birth)
                     if due is None:
                         continue
                     # For next age group we only care about upcoming doses (do not affect missed_count)
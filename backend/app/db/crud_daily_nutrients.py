@@ -0,0 +1,149 @@
+"""child_daily_nutrients: per-day nutrient rollups of ChildMealItem.
+
+Readers (weekly summary, nutrition history) sum at most a few rollup rows
+instead of re-aggregating every meal item in the window. Writers add their
+items' totals with an upsert in the same transaction that inserts the items,
+so the rollup commits or rolls back together with the log.
+"""
+from datetime import date
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.db.data_versions import bump_child_versions
+from app.models.models import (
+    Child,
+    ChildDailyNutrients,
+    ChildMealItem as ChildMealItemModel,
+    ChildMealLog as ChildMealLogModel,
+)
+from app.services.food_index import FOOD_NUTRIENTS
+
+
+def _insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(ChildDailyNutrients)
+    if dialect == "sqlite":
+        return sqlite.insert(ChildDailyNutrients)
+    raise NotImplementedError(f"child_daily_nutrients upsert is not implemented for {dialect}")
+
+
+def item_totals(items: Iterable[ChildMealItemModel]) -> Dict[str, float]:
+    """SUM(nutrient * meal_frequency) over items, like the SQL aggregate (NULL counts as 0)."""
+    totals = {k: 0.0 for k in FOOD_NUTRIENTS}
+    for it in items:
+        freq = it.meal_frequency if it.meal_frequency is not None else 1
+        for k in FOOD_NUTRIENTS:
+            totals[k] += float(getattr(it, k) or 0.0) * freq
+    return totals
+
+
+def add_daily_nutrients(
+    db: Session,
+    *,
+    child_id: int,
+    log_date: date,
+    totals: Dict[str, float],
+    item_count: int,
+) -> None:
+    """Add totals to the child's row for log_date (created if missing). Does not commit."""
+    bump_child_versions(db, [child_id])
+    stmt = _insert(db).values(child_id=child_id, log_date=log_date, item_count=item_count, **totals)
+    table = ChildDailyNutrients.__table__
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.child_id, table.c.log_date],
+        set_={
+            "item_count": table.c.item_count + stmt.excluded.item_count,
+            "updated_at": func.now(),
+            **{k: table.c[k] + stmt.excluded[k] for k in FOOD_NUTRIENTS},
+        },
+    )
+    db.execute(stmt)
+
+
+def meal_item_nutrient_sums() -> list:
+    """SUM(nutrient * meal_frequency) over raw ChildMealItem rows, labelled by nutrient."""
+    return [
+        func.coalesce(
+            func.sum(func.coalesce(getattr(ChildMealItemModel, k), 0.0) * ChildMealItemModel.meal_frequency),
+            0.0,
+        ).label(k)
+        for k in FOOD_NUTRIENTS
+    ]
+
+
+def daily_nutrient_sums() -> list:
+    """SUM of each rollup column over the selected days, labelled by nutrient."""
+    return [func.coalesce(func.sum(getattr(ChildDailyNutrients, k)), 0.0).label(k) for k in FOOD_NUTRIENTS]
+
+
+def nutrient_totals_between(db: Session, child_id: int, start: date, end: date) -> Dict[str, float]:
+    row = (
+        db.query(*daily_nutrient_sums())
+        .filter(
+            ChildDailyNutrients.child_id == child_id,
+            ChildDailyNutrients.log_date >= start,
+            ChildDailyNutrients.log_date <= end,
+        )
+        .one()
+    )
+    return {k: float(getattr(row, k) or 0.0) for k in FOOD_NUTRIENTS}
+
+
+def rebuild_daily_nutrients(
+    db: Session,
+    *,
+    first_child_id: int,
+    last_child_id: int,
+    since: Optional[date] = None,
+) -> int:
+    """Recompute rollup rows from the raw items for a child_id range (one INSERT ... SELECT).
+
+    Existing rows are overwritten, so reruns are safe. Does not commit.
+
+    An overwrite computed before a concurrent meal log commits would drop that
+    log's totals. On Postgres the range's children rows are locked FOR UPDATE
+    first: a meal-log insert takes a KEY SHARE lock on its child through the
+    foreign key, so the lock waits for in-flight logs to commit (the SELECT
+    then sees them) and holds off new ones until the caller commits (their
+    add_daily_nutrients then adds to the rebuilt row). SQLite runs one write
+    transaction at a time.
+    """
+    children = select(Child.child_id).where(Child.child_id >= first_child_id, Child.child_id <= last_child_id)
+    if db.get_bind().dialect.name == "postgresql":
+        children = children.with_for_update()
+    bump_child_versions(db, db.execute(children).scalars().all())
+    filters = [
+        ChildMealLogModel.child_id >= first_child_id,
+        ChildMealLogModel.child_id <= last_child_id,
+    ]
+    if since is not None:
+        filters.append(ChildMealLogModel.log_date >= since)
+    source = (
+        select(
+            ChildMealLogModel.child_id,
+            ChildMealLogModel.log_date,
+            cast(func.count(ChildMealItemModel.id), Integer).label("item_count"),
+            *meal_item_nutrient_sums(),
+        )
+        .select_from(ChildMealLogModel)
+        .outerjoin(ChildMealItemModel, ChildMealItemModel.meal_log_id == ChildMealLogModel.id)
+        # A WHERE clause is required by SQLite's parser before ON CONFLICT
+        .where(*filters)
+        .group_by(ChildMealLogModel.child_id, ChildMealLogModel.log_date)
+    )
+    columns = ["child_id", "log_date", "item_count", *FOOD_NUTRIENTS]
+    stmt = _insert(db).from_select(columns, source)
+    table = ChildDailyNutrients.__table__
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.child_id, table.c.log_date],
+        set_={
+            "item_count": stmt.excluded.item_count,
+            "updated_at": func.now(),
+            **{k: stmt.excluded[k] for k in FOOD_NUTRIENTS},
+        },
+    )
+    return db.execute(stmt).rowcount
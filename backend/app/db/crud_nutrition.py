@@ -1,18 +1,22 @@
 from datetime import date, timedelta
 from typing import Dict, Any
 
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import Date, Integer, cast, func, literal_column
 
 from app.models.models import (
     Child,
+    ChildDailyNutrients,
     ChildMealLog as ChildMealLogModel,
-    ChildMealItem as ChildMealItemModel,
     NutritionRequirement,
     NutritionRecipe,
 )
 from app.schemas.schemas import FoodAgeGroupEnum
-from app.db.crud import compute_child_age_group, list_foods_by_age_group
+from app.db.crud import compute_child_age_group
+from app.db.crud_daily_nutrients import daily_nutrient_sums, nutrient_totals_between
+from app.services.food_index import FOOD_NUTRIENTS, FoodProfile, get_food_index
+from app.services.recipe_index import get_recipe_index, rebuild_recipe_index
 
 
 def _get_week_range_for_child(db: Session, child_id: int, start: date | None) -> tuple[date | None, date | None]:
@@ -140,6 +144,7 @@ def seed_nutrition_recipes(db: Session, payload: Dict[str, Any]) -> dict:
                 inserted += 1
 
     db.commit()
+    rebuild_recipe_index(db)
     return {"inserted": inserted, "updated": updated}
 
 
@@ -181,97 +186,8 @@ def get_child_weekly_nutrition_summary(
     # Fixed 7-day window based on last log (or explicit start)
     days_with_logs = 7
 
-    # Aggregate weekly nutrient totals using SQL for performance
-    totals_row = (
-        db.query(
-            func.coalesce(
-                func.sum(
-                    func.coalesce(ChildMealItemModel.energy_kcal, 0.0)
-                    * ChildMealItemModel.meal_frequency
-                ),
-                0.0,
-            ).label("energy_kcal"),
-            func.coalesce(
-                func.sum(
-                    func.coalesce(ChildMealItemModel.protein_g, 0.0)
-                    * ChildMealItemModel.meal_frequency
-                ),
-                0.0,
-            ).label("protein_g"),
-            func.coalesce(
-                func.sum(
-                    func.coalesce(ChildMealItemModel.carb_g, 0.0)
-                    * ChildMealItemModel.meal_frequency
-                ),
-                0.0,
-            ).label("carb_g"),
-            func.coalesce(
-                func.sum(
-                    func.coalesce(ChildMealItemModel.fat_g, 0.0)
-                    * ChildMealItemModel.meal_frequency
-                ),
-                0.0,
-            ).label("fat_g"),
-            func.coalesce(
-                func.sum(
-                    func.coalesce(ChildMealItemModel.iron_mg, 0.0)
-                    * ChildMealItemModel.meal_frequency
-                ),
-                0.0,
-            ).label("iron_mg"),
-            func.coalesce(
-                func.sum(
-                    func.coalesce(ChildMealItemModel.calcium_mg, 0.0)
-                    * ChildMealItemModel.meal_frequency
-                ),
-                0.0,
-            ).label("calcium_mg"),
-            func.coalesce(
-                func.sum(
-                    func.coalesce(ChildMealItemModel.vitamin_a_mcg, 0.0)
-                    * ChildMealItemModel.meal_frequency
-                ),
-                0.0,
-            ).label("vitamin_a_mcg"),
-            func.coalesce(
-                func.sum(
-                    func.coalesce(ChildMealItemModel.vitamin_c_mg, 0.0)
-                    * ChildMealItemModel.meal_frequency
-                ),
-                0.0,
-            ).label("vitamin_c_mg"),
-        )
-        .join(ChildMealLogModel, ChildMealItemModel.meal_log_id == ChildMealLogModel.id)
-        .filter(
-            ChildMealLogModel.child_id == child_id,
-            ChildMealLogModel.log_date >= start,
-            ChildMealLogModel.log_date <= end,
-        )
-        .one_or_none()
-    )
-
-    if totals_row is None:
-        totals = {
-            "energy_kcal": 0.0,
-            "protein_g": 0.0,
-            "carb_g": 0.0,
-            "fat_g": 0.0,
-            "iron_mg": 0.0,
-            "calcium_mg": 0.0,
-            "vitamin_a_mcg": 0.0,
-            "vitamin_c_mg": 0.0,
-        }
-    else:
-        totals = {
-            "energy_kcal": float(totals_row.energy_kcal or 0.0),
-            "protein_g": float(totals_row.protein_g or 0.0),
-            "carb_g": float(totals_row.carb_g or 0.0),
-            "fat_g": float(totals_row.fat_g or 0.0),
-            "iron_mg": float(totals_row.iron_mg or 0.0),
-            "calcium_mg": float(totals_row.calcium_mg or 0.0),
-            "vitamin_a_mcg": float(totals_row.vitamin_a_mcg or 0.0),
-            "vitamin_c_mg": float(totals_row.vitamin_c_mg or 0.0),
-        }
+    # Weekly nutrient totals from the per-day rollup (at most 7 rows)
+    totals = nutrient_totals_between(db, child_id, start, end)
 
     daily_avg = {k: (v / days_with_logs) if days_with_logs > 0 else 0.0 for k, v in totals.items()}
 
@@ -354,84 +270,21 @@ def get_child_weekly_nutrition_summary(
     group_val = age_group.value if hasattr(age_group, "value") else str(age_group)
     food_group = gmap.get(group_val, FoodAgeGroupEnum.ALL)
 
-    foods = list_foods_by_age_group(db, food_group)
     is_infant_group = age_group == FoodAgeGroupEnum.INFANT or group_val == "Infant"
     # For infants, do not flag iron as "excess"; treat as "adequate" if above requirement
     if is_infant_group:
         if "iron_mg" in adequacy and adequacy["iron_mg"] == "excess":
             adequacy["iron_mg"] = "adequate"
-    # For infants, restrict to milk-only items
-    if is_infant_group:
-        foods = [f for f in foods if (getattr(f, "food_group", None) or "").lower() == "milk"]
-    if age_months <= 6:
-        def _is_breastmilk_like_food(f) -> bool:
-            name = (getattr(f, "food_name", "") or "").lower()
-            text = name + " " + (getattr(f, "food_group", "") or "").lower()
-            keywords = [
-                "breastmilk",
-                "breast milk",
-                "breast-feeding",
-                "breastfeeding",
-                "mother's milk",
-                "mothers milk",
-                "human milk",
-                "infant formula",
-                "baby formula",
-                "formula milk",
-            ]
-            return any(k in text for k in keywords)
-
-        foods = [f for f in foods if _is_breastmilk_like_food(f)]
+    # Infants get milk-only items; up to 6 months only breast milk / formula
+    profile = FoodProfile(food_group, milk_only=is_infant_group, breastmilk_only=age_months <= 6)
+    food_index = get_food_index(db)
 
     # For each needed nutrient, suggest foods richest in that nutrient
     top_foods_by_nutrient: Dict[str, list[dict]] = {}
-    nutrient_attr_map = {
-        "energy_kcal": "energy_kcal",
-        "protein_g": "protein_g",
-        "carb_g": "carb_g",
-        "fat_g": "fat_g",
-        "iron_mg": "iron_mg",
-        "calcium_mg": "calcium_mg",
-        "vitamin_a_mcg": "vitamin_a_mcg",
-        "vitamin_c_mg": "vitamin_c_mg",
-    }
     for nutrient in needed_nutrients:
-        attr = nutrient_attr_map.get(nutrient)
-        if not attr:
+        if nutrient not in FOOD_NUTRIENTS:
             continue
-        sorted_foods = sorted(
-            foods,
-            key=lambda f: float(getattr(f, attr) or 0.0),
-            reverse=True,
-        )
-        top_foods_by_nutrient[nutrient] = [
-            {
-                "food_id": f.food_id,
-                "food_name": f.food_name,
-                "food_group": f.food_group,
-            }
-            for f in sorted_foods[:5]
-        ]
-
-    id_to_food = {f.food_id: f for f in foods}
-    recommended_food_ids: set[int] = set()
-    for flist in top_foods_by_nutrient.values():
-        for item in flist:
-            fid = item.get("food_id")
-            if fid is not None:
-                recommended_food_ids.add(fid)
-
-    recommended_foods = [
-        {
-            "food_id": f.food_id,
-            "food_name": f.food_name,
-            "category_age_group": f.category_age_group.value if hasattr(f.category_age_group, "value") else str(f.category_age_group),
-            "food_group": f.food_group,
-            "is_veg": f.is_veg,
-        }
-        for fid, f in id_to_food.items()
-        if fid in recommended_food_ids
-    ]
+        top_foods_by_nutrient[nutrient] = food_index.top_foods(profile, nutrient, 5)
 
     recommended_recipes: list[dict] = []
     if requirement_data is not None and needed_nutrients:
@@ -445,188 +298,18 @@ def get_child_weekly_nutrition_summary(
 
         excess_nutrients = {k for k, v in adequacy.items() if v == "excess"}
 
-        deficit_severity_items = [
-            (k, severity.get(k, 0.0))
-            for k in needed_nutrients
-            if adequacy.get(k) == "deficit"
-        ]
-        deficit_severity_items.sort(key=lambda kv: kv[1], reverse=True)
-        ordered_deficits = [k for k, s in deficit_severity_items if s > 0.0]
-        if not ordered_deficits:
-            ordered_deficits = list(needed_nutrients)
-
         energy_pct = float(percent.get("energy_kcal", 0.0) or 0.0)
         energy_deficit_severe = energy_pct < 60.0
 
-        recipes_q = (
-            db.query(NutritionRecipe)
-            .filter(
-                NutritionRecipe.age_min_months <= age_months,
-                NutritionRecipe.age_max_months >= age_months,
-            )
+        max_recipes = 2 if age_months <= 6 else 4
+        recommended_recipes = get_recipe_index(db).recommend(
+            age_months,
+            severity=severity,
+            needed=needed_nutrients,
+            excess=excess_nutrients,
+            energy_deficit_severe=energy_deficit_severe,
+            limit=max_recipes,
         )
-        all_recipes = recipes_q.all()
-
-        def _parse_secondary(r: NutritionRecipe) -> list[str]:
-            text = r.secondary_nutrients or ""
-            return [x.strip() for x in text.split(",") if x.strip()]
-
-        def _is_recipe_safe(r: NutritionRecipe) -> bool:
-            tx = (r.texture or "").lower().strip()
-            text = ((r.ingredients or "") + " " + (r.recipe_name or "")).lower()
-            if age_months <= 6:
-                if tx not in ("liquid", "soft"):
-                    return False
-                milk_keywords = [
-                    "breastmilk",
-                    "breast milk",
-                    "breast-feeding",
-                    "breastfeeding",
-                    "mother's milk",
-                    "mothers milk",
-                    "human milk",
-                    "infant formula",
-                    "baby formula",
-                    "formula milk",
-                ]
-                if not any(k in text for k in milk_keywords):
-                    return False
-                banned_words = [
-                    "honey",
-                    "whole nut",
-                    "whole nuts",
-                    "peanut",
-                    "groundnut",
-                    "almond",
-                    "cashew",
-                    "pista",
-                    "walnut",
-                    "fried",
-                    "deep fry",
-                    "deep-fried",
-                ]
-                if any(w in text for w in banned_words):
-                    return False
-            elif age_months < 12:
-                if tx not in ("liquid", "soft"):
-                    return False
-                banned_words = [
-                    "honey",
-                    "whole nut",
-                    "whole nuts",
-                    "peanut",
-                    "groundnut",
-                    "almond",
-                    "cashew",
-                    "pista",
-                    "walnut",
-                    "fried",
-                    "deep fry",
-                    "deep-fried",
-                ]
-                if any(w in text for w in banned_words):
-                    return False
-            elif 12 <= age_months < 36:
-                if tx not in ("soft", "semi-solid"):
-                    return False
-            return True
-
-        def _is_snack(r: NutritionRecipe) -> bool:
-            meal = (r.meal_type or "").lower().strip()
-            return meal == "snack"
-
-        candidates: list[tuple[float, NutritionRecipe]] = []
-
-        for r in all_recipes:
-            primary = (r.primary_nutrient or "").strip()
-            if not primary:
-                continue
-            if primary not in needed_nutrients:
-                continue
-            if primary in excess_nutrients:
-                continue
-            if not _is_recipe_safe(r):
-                continue
-
-            secondary_list = _parse_secondary(r)
-            if any(n in excess_nutrients for n in secondary_list):
-                continue
-
-            base_severity = severity.get(primary, 0.0)
-            if base_severity <= 0.0:
-                continue
-
-            score = base_severity * 10.0
-
-            overlap_count = sum(1 for n in secondary_list if n in needed_nutrients)
-            score += float(overlap_count)
-
-            meal = (r.meal_type or "").lower().strip()
-            pref_meals_map = {
-                "energy_kcal": ["lunch", "dinner"],
-                "protein_g": ["lunch"],
-                "calcium_mg": ["breakfast", "snack"],
-                "vitamin_c_mg": ["snack"],
-                "vitamin_a_mcg": ["lunch"],
-                "fat_g": ["lunch", "dinner"],
-            }
-            preferred_meals = pref_meals_map.get(primary, [])
-            if meal in preferred_meals:
-                score += 5.0
-
-            if energy_deficit_severe and primary == "energy_kcal":
-                if r.energy_density and r.energy_density.lower() == "high":
-                    score += 10.0
-                else:
-                    score += 5.0
-
-            candidates.append((score, r))
-
-        candidates.sort(key=lambda x: x[0], reverse=True)
-
-        MAX_RECIPES = 2 if age_months <= 6 else 4
-        selected: list[NutritionRecipe] = []
-        selected_ids: set[int] = set()
-
-        # Ensure at least one strong energy recipe when energy deficit is severe
-        if energy_deficit_severe:
-            for _, r in candidates:
-                primary_name = (r.primary_nutrient or "").strip()
-                if primary_name == "energy_kcal":
-                    selected.append(r)
-                    if getattr(r, "id", None) is not None:
-                        selected_ids.add(r.id)
-                    break
-
-        for _, r in candidates:
-            if len(selected) >= MAX_RECIPES:
-                break
-            if getattr(r, "id", None) is not None and r.id in selected_ids:
-                continue
-            selected.append(r)
-            if getattr(r, "id", None) is not None:
-                selected_ids.add(r.id)
-
-        def _recipe_to_dict(r: NutritionRecipe) -> dict:
-            secondary_list = _parse_secondary(r)
-            return {
-                "id": r.id,
-                "recipe_code": r.recipe_code,
-                "recipe_name": r.recipe_name,
-                "veg_nonveg": r.veg_nonveg,
-                "primary_nutrient": r.primary_nutrient,
-                "secondary_nutrients": secondary_list,
-                "energy_density": r.energy_density,
-                "meal_type": r.meal_type,
-                "texture": r.texture,
-                "ingredients": r.ingredients,
-                "instructions": r.instructions,
-                "prep_time_mins": r.prep_time_mins,
-                "youtube_url": r.youtube_url,
-            }
-
-        for r in selected:
-            recommended_recipes.append(_recipe_to_dict(r))
 
     return {
         "child_id": child_id,
@@ -639,3 +322,109 @@ def get_child_weekly_nutrition_summary(
         "recommended_recipes": recommended_recipes,
         "message": None,
     }
+
+
+def _week_start(db: Session, column):
+    """Monday of the column's week: date_trunc on Postgres, date arithmetic on SQLite."""
+    if db.get_bind().dialect.name == "sqlite":
+        weekday = cast(func.strftime("%w", column), Integer)  # 0 = Sunday
+        return func.date(column, func.printf("-%d days", (weekday + 6) % 7))
+    return cast(func.date_trunc("week", column), Date)
+
+
+def _adequacy_labels(percent: np.ndarray, requirement: np.ndarray) -> np.ndarray:
+    # Same thresholds as the weekly summary; NaN requirement means no matching row
+    labels = np.select(
+        [np.isnan(requirement), requirement <= 0, percent < 90.0, percent <= 120.0],
+        ["unknown", "not_applicable", "deficit", "adequate"],
+        default="excess",
+    )
+    return labels.astype(object)
+
+
+def _rounded(values: np.ndarray, digits: int) -> list:
+    return [None if np.isnan(v) else round(float(v), digits) for v in values]
+
+
+def get_child_nutrition_history(
+    db: Session,
+    *,
+    child: Child,
+    weeks: int,
+    end: date | None = None,
+) -> Dict[str, Any]:
+    """Per calendar week (Monday start) nutrient intake vs requirement, as parallel arrays.
+
+    The `weeks` weeks end with the one containing `end` (default today). Totals
+    for all weeks come from one GROUP BY over the child_daily_nutrients rollup. Like the weekly summary, the
+    daily average is the week's total / 7, and the requirement row is picked by
+    the child's age in months at the end of each week. Weeks without logs
+    report days_logged 0, null percentages and adequacy "no_data".
+    """
+    end = end or date.today()
+    last_start = end - timedelta(days=end.weekday())
+    first_start = last_start - timedelta(weeks=weeks - 1)
+    week_starts = [first_start + timedelta(weeks=i) for i in range(weeks)]
+
+    week = _week_start(db, ChildDailyNutrients.log_date).label("week_start")
+    rows = (
+        db.query(week, func.count().label("days_logged"), *daily_nutrient_sums())
+        .filter(
+            ChildDailyNutrients.child_id == child.child_id,
+            ChildDailyNutrients.log_date >= first_start,
+            ChildDailyNutrients.log_date <= end,
+        )
+        .group_by(literal_column("week_start"))
+        .all()
+    )
+
+    totals = np.zeros((weeks, len(FOOD_NUTRIENTS)))
+    days_logged = np.zeros(weeks, dtype=np.int64)
+    for row in rows:
+        # SQLite returns the bucket as an ISO string
+        start = row.week_start if isinstance(row.week_start, date) else date.fromisoformat(str(row.week_start)[:10])
+        i = (start - first_start).days // 7
+        if 0 <= i < weeks:
+            days_logged[i] = row.days_logged
+            totals[i] = [float(getattr(row, k) or 0.0) for k in FOOD_NUTRIENTS]
+    daily_avg = totals / 7.0
+
+    # Age at the end of each week (the last week ends at `end`)
+    week_end_days = np.array([(min(s + timedelta(days=6), end) - child.date_of_birth).days for s in week_starts])
+    age_months = np.where(week_end_days > 0, (week_end_days / 30.4375).astype(np.int64), 0)
+
+    reqs = db.query(NutritionRequirement).all()
+    requirement = np.full((weeks, len(FOOD_NUTRIENTS)), np.nan)
+    if reqs:
+        mins = np.array([r.age_min_months for r in reqs])
+        maxs = np.array([r.age_max_months for r in reqs])
+        values = np.array([[float(getattr(r, k)) if getattr(r, k) is not None else 0.0 for k in FOOD_NUTRIENTS] for r in reqs])
+        match = (mins[None, :] <= age_months[:, None]) & (maxs[None, :] >= age_months[:, None])
+        # Several bands can match; like the summary, take the one with the highest minimum age
+        best = np.where(match, mins[None, :], -1).argmax(axis=1)
+        matched = match.any(axis=1)
+        requirement[matched] = values[best[matched]]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = np.where(requirement > 0, daily_avg / requirement * 100.0, 0.0)
+    percent[np.isnan(requirement)] = np.nan
+    adequacy = _adequacy_labels(percent, requirement)
+    # Infants are never flagged for excess iron
+    infant = week_end_days / 365.25 < 1
+    iron = FOOD_NUTRIENTS.index("iron_mg")
+    adequacy[infant & (adequacy[:, iron] == "excess"), iron] = "adequate"
+    no_logs = days_logged == 0
+    percent[no_logs] = np.nan
+    adequacy[no_logs] = "no_data"
+
+    return {
+        "child_id": child.child_id,
+        "nutrients": list(FOOD_NUTRIENTS),
+        "week_start": week_starts,
+        "days_logged": days_logged.tolist(),
+        "age_months": age_months.tolist(),
+        "daily_avg": {k: _rounded(daily_avg[:, j], 2) for j, k in enumerate(FOOD_NUTRIENTS)},
+        "requirement": {k: _rounded(requirement[:, j], 2) for j, k in enumerate(FOOD_NUTRIENTS)},
+        "percent_of_requirement": {k: _rounded(percent[:, j], 1) for j, k in enumerate(FOOD_NUTRIENTS)},
+        "adequacy": {k: adequacy[:, j].tolist() for j, k in enumerate(FOOD_NUTRIENTS)},
+    }
@@ -0,0 +1,336 @@
+"""Offline sync: apply a batch of client-dated meal, measurement and illness entries.
+
+A parent who was offline replays everything recorded on the device in one
+request. The batch is validated in bulk, with one query each for the
+parent's children, the referenced food_master rows, nearby meal-log dates
+and the idempotency keys already applied. That read transaction ends before
+custom meal items are sent to the nutrition estimator. Each child's accepted
+entries are then written with multi-row INSERTs and committed in one
+transaction, together with their sync_receipts rows and meal rollups. A
+replayed key reports the stored record id and inserts nothing.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.crud import _compute_nutrition_from_master
+from app.db.crud_changes import record_changes
+from app.db.crud_daily_nutrients import add_daily_nutrients
+from app.db.data_versions import bump_child_versions
+from app.models.models import (
+    Child,
+    ChildAnthropometry,
+    ChildIllnessLog,
+    ChildMealItem,
+    ChildMealLog,
+    FoodMaster,
+    SyncReceipt,
+)
+from app.schemas.schemas import (
+    ChangeEntityEnum,
+    ResolvedByEnum,
+    SyncEntry,
+    SyncEntryResult,
+    SyncEntryStatusEnum,
+    SyncEntryTypeEnum,
+)
+from app.services.food_index import FOOD_NUTRIENTS
+from app.services.gemini import estimate_nutrition
+
+# Same spacing as POST /food-logs/child/{child_id}/meals
+MEAL_LOG_INTERVAL_DAYS = 7
+MUAC_MIN_AGE_MONTHS = 6
+# Devices ahead of the server's time zone may already be on the next day
+FUTURE_DATE_TOLERANCE_DAYS = 1
+
+BODY_FIELD = {
+    SyncEntryTypeEnum.MEAL_LOG: "meal",
+    SyncEntryTypeEnum.MEASUREMENT: "measurement",
+    SyncEntryTypeEnum.ILLNESS_LOG: "illness",
+}
+RECORD_TABLE = {
+    SyncEntryTypeEnum.MEAL_LOG: (ChildMealLog, ChildMealLog.id),
+    SyncEntryTypeEnum.MEASUREMENT: (ChildAnthropometry, ChildAnthropometry.id),
+    SyncEntryTypeEnum.ILLNESS_LOG: (ChildIllnessLog, ChildIllnessLog.id),
+}
+
+
+class _Rejected(ValueError):
+    pass
+
+
+@dataclass
+class _Accepted:
+    index: int
+    entry: SyncEntry
+    row: Dict[str, Any]
+    items: List[Dict[str, Any]] = field(default_factory=list)  # meal logs only
+
+
+def _result(
+    entry: SyncEntry,
+    status: SyncEntryStatusEnum,
+    *,
+    record_id: Optional[int] = None,
+    detail: Optional[str] = None,
+) -> SyncEntryResult:
+    return SyncEntryResult(
+        idempotency_key=entry.idempotency_key,
+        type=entry.type,
+        child_id=entry.child_id,
+        status=status,
+        record_id=record_id,
+        detail=detail,
+    )
+
+
+def _insert_returning(db: Session, model, pk, rows: List[Dict[str, Any]]) -> List[int]:
+    """Multi-row insert that returns the new primary keys in row order."""
+    if not rows:
+        return []
+    result = db.execute(insert(model).returning(pk, sort_by_parameter_order=True), rows)
+    return [r[0] for r in result]
+
+
+class _BatchValidator:
+    """Per-entry checks against lookups loaded once for the whole batch."""
+
+    def __init__(self, db: Session, *, parent_id: int, entries: Sequence[SyncEntry], today: date) -> None:
+        self.today = today
+        child_ids = {e.child_id for e in entries}
+        self.dob: Dict[int, date] = dict(
+            db.query(Child.child_id, Child.date_of_birth)
+            .filter(Child.parent_id == parent_id, Child.child_id.in_(child_ids))
+            .all()
+        )
+        meals = [e for e in entries if e.type == SyncEntryTypeEnum.MEAL_LOG and e.meal is not None]
+        food_ids = {it.food_id for e in meals for it in e.meal.items if it.food_id is not None}
+        self.foods: Dict[int, FoodMaster] = (
+            {f.food_id: f for f in db.query(FoodMaster).filter(FoodMaster.food_id.in_(food_ids))}
+            if food_ids else {}
+        )
+        # Detached so they stay loaded after apply_sync_batch ends the read transaction
+        for food in self.foods.values():
+            db.expunge(food)
+        # Meal-log dates that could clash with the batch's meal entries
+        self.meal_dates: Dict[int, List[date]] = defaultdict(list)
+        dated = [e for e in meals if e.log_date is not None and e.child_id in self.dob]
+        if dated:
+            gap = timedelta(days=MEAL_LOG_INTERVAL_DAYS - 1)
+            rows = (
+                db.query(ChildMealLog.child_id, ChildMealLog.log_date)
+                .filter(
+                    ChildMealLog.child_id.in_({e.child_id for e in dated}),
+                    ChildMealLog.log_date >= min(e.log_date for e in dated) - gap,
+                    ChildMealLog.log_date <= max(e.log_date for e in dated) + gap,
+                )
+                .all()
+            )
+            for child_id, log_date in rows:
+                self.meal_dates[child_id].append(log_date)
+        self._estimates: Dict[Tuple[str, float], Optional[Dict[str, float]]] = {}
+
+    def _log_date(self, entry: SyncEntry) -> date:
+        if entry.log_date is None:
+            raise _Rejected(f"log_date is required for {entry.type.value} entries")
+        if entry.log_date > self.today + timedelta(days=FUTURE_DATE_TOLERANCE_DAYS):
+            raise _Rejected("log_date is in the future")
+        dob = self.dob[entry.child_id]
+        if dob is not None and entry.log_date < dob:
+            raise _Rejected("log_date is before the child's date of birth")
+        return entry.log_date
+
+    def _estimate(self, name: str, serving_size_g: float) -> Optional[Dict[str, float]]:
+        # Offline batches often repeat the same home-cooked dish
+        key = (name.strip().lower(), serving_size_g)
+        if key not in self._estimates:
+            self._estimates[key] = estimate_nutrition(name, serving_size_g)
+        return self._estimates[key]
+
+    def _meal(self, index: int, entry: SyncEntry) -> _Accepted:
+        log_date = self._log_date(entry)
+        for item in entry.meal.items:
+            if (item.food_id is None and not item.custom_food_name) or (item.food_id is not None and item.custom_food_name):
+                raise _Rejected("Each item must provide either food_id or custom_food_name")
+            if item.food_id is not None and item.food_id not in self.foods:
+                raise _Rejected(f"food_id {item.food_id} not found")
+        known = self.meal_dates[entry.child_id]
+        if any(abs((log_date - d).days) < MEAL_LOG_INTERVAL_DAYS for d in known):
+            raise _Rejected(f"Another meal log exists within {MEAL_LOG_INTERVAL_DAYS} days of {log_date.isoformat()}")
+
+        items = []
+        for item in entry.meal.items:
+            ai_flag = False
+            if item.food_id is not None:
+                nutrients = _compute_nutrition_from_master(self.foods[item.food_id], item.serving_size_g)
+            else:
+                est = self._estimate(item.custom_food_name, item.serving_size_g)
+                nutrients = {k: est.get(k) for k in FOOD_NUTRIENTS} if est else None
+                ai_flag = bool(est)
+            items.append({
+                "meal_type": item.meal_type,
+                "food_id": item.food_id,
+                "custom_food_name": item.custom_food_name,
+                "serving_size_g": item.serving_size_g,
+                "meal_frequency": item.meal_frequency,
+                "is_ai_estimated": ai_flag,
+                **(nutrients or {k: 0.0 for k in FOOD_NUTRIENTS}),
+            })
+        known.append(log_date)
+        row = {"child_id": entry.child_id, "log_date": log_date, "notes": entry.meal.notes}
+        return _Accepted(index, entry, row, items)
+
+    def _measurement(self, index: int, entry: SyncEntry) -> _Accepted:
+        log_date = self._log_date(entry)
+        payload = entry.measurement
+        dob = self.dob[entry.child_id]
+        if payload.muac_cm is not None and dob is not None:
+            if int((log_date - dob).days / 30.44) < MUAC_MIN_AGE_MONTHS:
+                raise _Rejected("MUAC is applicable only for children older than 6 months")
+        return _Accepted(index, entry, {"child_id": entry.child_id, "log_date": log_date, **payload.model_dump()})
+
+    def _illness(self, index: int, entry: SyncEntry) -> _Accepted:
+        payload = entry.illness
+        row = {"child_id": entry.child_id, **payload.model_dump(exclude={"resolved_by"})}
+        # Same rule as create_child_illness_log: resolved_by only for resolved logs
+        row["resolved_by"] = None if payload.is_current else (payload.resolved_by or ResolvedByEnum.PARENT)
+        return _Accepted(index, entry, row)
+
+    def accept(self, index: int, entry: SyncEntry) -> _Accepted:
+        if entry.child_id not in self.dob:
+            raise _Rejected("Not authorized for this child")
+        body = BODY_FIELD[entry.type]
+        if getattr(entry, body) is None:
+            raise _Rejected(f"{body} is required for {entry.type.value} entries")
+        if entry.type == SyncEntryTypeEnum.MEAL_LOG:
+            return self._meal(index, entry)
+        if entry.type == SyncEntryTypeEnum.MEASUREMENT:
+            return self._measurement(index, entry)
+        return self._illness(index, entry)
+
+
+def _write_child(db: Session, *, parent_id: int, accepted: List[_Accepted]) -> List[int]:
+    """Insert one child's accepted entries and their receipts. Does not commit."""
+    # Core inserts bypass the flush hook that counts ORM writes
+    bump_child_versions(db, {a.entry.child_id for a in accepted})
+    record_ids: Dict[int, int] = {}
+    for entry_type, (model, pk) in RECORD_TABLE.items():
+        group = [a for a in accepted if a.entry.type == entry_type]
+        for a, record_id in zip(group, _insert_returning(db, model, pk, [a.row for a in group])):
+            record_ids[a.index] = record_id
+
+    illnesses = [a for a in accepted if a.entry.type == SyncEntryTypeEnum.ILLNESS_LOG]
+    record_changes(db, ChangeEntityEnum.ILLNESS_LOG, [(a.entry.child_id, record_ids[a.index]) for a in illnesses])
+
+    meals = [a for a in accepted if a.entry.type == SyncEntryTypeEnum.MEAL_LOG]
+    items = [{"meal_log_id": record_ids[a.index], **it} for a in meals for it in a.items]
+    if items:
+        db.execute(insert(ChildMealItem), items)
+    for a in meals:
+        add_daily_nutrients(
+            db,
+            child_id=a.row["child_id"],
+            log_date=a.row["log_date"],
+            totals={k: sum(float(it[k] or 0.0) * it["meal_frequency"] for it in a.items) for k in FOOD_NUTRIENTS},
+            item_count=len(a.items),
+        )
+
+    db.execute(insert(SyncReceipt), [
+        {
+            "parent_id": parent_id,
+            "idempotency_key": a.entry.idempotency_key,
+            "entry_type": a.entry.type,
+            "child_id": a.entry.child_id,
+            "record_id": record_ids[a.index],
+        }
+        for a in accepted
+    ])
+    return [record_ids[a.index] for a in accepted]
+
+
+def _applied_keys(db: Session, parent_id: int, keys) -> Dict[str, int]:
+    if not keys:
+        return {}
+    return dict(
+        db.query(SyncReceipt.idempotency_key, SyncReceipt.record_id)
+        .filter(SyncReceipt.parent_id == parent_id, SyncReceipt.idempotency_key.in_(keys))
+        .all()
+    )
+
+
+def apply_sync_batch(
+    db: Session,
+    *,
+    parent_id: int,
+    entries: Sequence[SyncEntry],
+    today: Optional[date] = None,
+) -> List[SyncEntryResult]:
+    """Validate and apply entries; one result per entry, in request order.
+
+    Entries whose idempotency key was already applied (earlier in the batch
+    or in an earlier request) are reported as duplicates with the original
+    record id. Each child's entries commit together, so a failure for one
+    child does not undo another child's.
+    """
+    today = today or date.today()
+    results: List[Optional[SyncEntryResult]] = [None] * len(entries)
+    applied = _applied_keys(db, parent_id, {e.idempotency_key for e in entries})
+
+    first: Dict[str, int] = {}
+    repeats: List[Tuple[int, int]] = []
+    pending: List[Tuple[int, SyncEntry]] = []
+    for i, entry in enumerate(entries):
+        key = entry.idempotency_key
+        if key in applied:
+            results[i] = _result(entry, SyncEntryStatusEnum.DUPLICATE, record_id=applied[key])
+        elif key in first:
+            repeats.append((i, first[key]))
+        else:
+            first[key] = i
+            pending.append((i, entry))
+
+    validator = _BatchValidator(db, parent_id=parent_id, entries=[e for _, e in pending], today=today)
+    # The lookups autobegan a transaction. End it so the connection is not left
+    # idle in transaction while custom items wait on the nutrition estimator.
+    db.rollback()
+    by_child: Dict[int, List[_Accepted]] = defaultdict(list)
+    for i, entry in pending:
+        try:
+            by_child[entry.child_id].append(validator.accept(i, entry))
+        except _Rejected as e:
+            results[i] = _result(entry, SyncEntryStatusEnum.REJECTED, detail=str(e))
+
+    for accepted in by_child.values():
+        try:
+            record_ids = _write_child(db, parent_id=parent_id, accepted=accepted)
+            db.commit()
+        except IntegrityError:
+            # A concurrent replay of the same keys committed first
+            db.rollback()
+            applied = _applied_keys(db, parent_id, {a.entry.idempotency_key for a in accepted})
+            for a in accepted:
+                key = a.entry.idempotency_key
+                if key in applied:
+                    results[a.index] = _result(a.entry, SyncEntryStatusEnum.DUPLICATE, record_id=applied[key])
+                else:
+                    results[a.index] = _result(
+                        a.entry, SyncEntryStatusEnum.REJECTED, detail="Conflicting sync in progress; retry"
+                    )
+            continue
+        for a, record_id in zip(accepted, record_ids):
+            results[a.index] = _result(a.entry, SyncEntryStatusEnum.CREATED, record_id=record_id)
+
+    for i, j in repeats:
+        original = results[j]
+        if original.status == SyncEntryStatusEnum.REJECTED:
+            results[i] = _result(entries[i], SyncEntryStatusEnum.REJECTED, detail=original.detail)
+        else:
+            results[i] = _result(entries[i], SyncEntryStatusEnum.DUPLICATE, record_id=original.record_id)
+    return results
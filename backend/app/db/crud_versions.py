@@ -0,0 +1,114 @@
+"""Version tokens for conditional GETs (app.core.http_cache).
+
+Each token is read with one SELECT of scalar subqueries, and changes whenever
+a row the response is built from is added, removed or updated. The child's
+rows are covered by children.data_version and the reference tables by their
+table_versions counter: writers bump both in the writing transaction
+(app.db.data_versions), so a write that commits after a tag was read always
+changes the tag. Prediction reports are insert-only and use (count, max(id)).
+The max(updated_at) columns only feed Last-Modified. Responses that depend on
+the current date (ages, due doses, the current week) also carry today's date.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from typing import List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.http_cache import CacheVersion
+from app.models.models import (
+    Child,
+    ChildAnthropometry,
+    ChildDailyNutrients,
+    ChildIllnessLog,
+    ChildMilestone,
+    ChildMilestoneStatus,
+    ChildPredictionReport,
+    ChildVaccineStatus,
+    FoodMaster,
+    TableVersion,
+    VaccinationSchedule,
+)
+
+
+def _child_stamp(model, child_id: int) -> List:
+    # Last-Modified only; children.data_version (in _child_row) versions these rows
+    return [select(func.max(model.updated_at)).where(model.child_id == child_id).scalar_subquery()]
+
+
+def _table_stamp(model) -> List:
+    return [
+        select(TableVersion.version).where(TableVersion.table_name == model.__tablename__).scalar_subquery(),
+        select(func.max(model.updated_at)).scalar_subquery(),
+    ]
+
+
+def _child_row(child_id: int) -> List:
+    # date_of_birth drives age groups; updated_at covers profile edits and
+    # data_version every write to the child's rows
+    where = Child.child_id == child_id
+    return [
+        select(Child.date_of_birth).where(where).scalar_subquery(),
+        select(Child.updated_at).where(where).scalar_subquery(),
+        select(Child.data_version).where(where).scalar_subquery(),
+    ]
+
+
+def _reports(child_id: int) -> List:
+    where = ChildPredictionReport.child_id == child_id
+    return [
+        select(func.count()).select_from(ChildPredictionReport).where(where).scalar_subquery(),
+        select(func.max(ChildPredictionReport.id)).where(where).scalar_subquery(),
+        select(func.max(ChildPredictionReport.created_at)).where(where).scalar_subquery(),
+    ]
+
+
+def _read(db: Session, columns: List, *, as_of: Optional[date] = None) -> CacheVersion:
+    parts = tuple(db.execute(select(*columns)).one())
+    stamps = [p for p in parts if isinstance(p, datetime)]
+    if as_of is not None:
+        parts += (as_of,)
+        stamps.append(datetime.combine(as_of, time.min))
+    return CacheVersion(parts, max(stamps) if stamps else None)
+
+
+def prediction_reports_version(db: Session, child_id: int) -> CacheVersion:
+    return _read(db, _reports(child_id))
+
+
+def vaccine_statuses_version(db: Session, child_id: int) -> CacheVersion:
+    return _read(
+        db,
+        _child_row(child_id) + _child_stamp(ChildVaccineStatus, child_id) + _table_stamp(VaccinationSchedule),
+        as_of=date.today(),
+    )
+
+
+def vaccination_schedule_version(db: Session) -> CacheVersion:
+    return _read(db, _table_stamp(VaccinationSchedule))
+
+
+def food_list_version(db: Session) -> CacheVersion:
+    return _read(db, _table_stamp(FoodMaster))
+
+
+def child_food_list_version(db: Session, child_id: int) -> CacheVersion:
+    return _read(db, _child_row(child_id) + _table_stamp(FoodMaster), as_of=date.today())
+
+
+def profile_summary_version(db: Session, child_id: int) -> CacheVersion:
+    return _read(
+        db,
+        _child_row(child_id)
+        + _reports(child_id)
+        + _child_stamp(ChildAnthropometry, child_id)
+        + _child_stamp(ChildDailyNutrients, child_id)
+        + _child_stamp(ChildIllnessLog, child_id)
+        + _child_stamp(ChildVaccineStatus, child_id)
+        + _child_stamp(ChildMilestoneStatus, child_id)
+        + _table_stamp(VaccinationSchedule)
+        + _table_stamp(ChildMilestone),
+        as_of=date.today(),
+    )
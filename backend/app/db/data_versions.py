@@ -0,0 +1,103 @@
+"""Write counters behind the conditional-GET version tokens (app.db.crud_versions).
+
+(count, max(updated_at)) cannot tell every write apart. On Postgres now()
+is the start time of the transaction, so a transaction that commits after a
+client read its tag can carry an older updated_at and leave the max as it
+was; the client then gets a 304 for a body that has changed.
+
+Instead every write to a child's rows adds one to children.data_version, and
+every write to a reference table adds one to its table_versions row, in the
+same transaction as the write. Concurrent writers queue on that row's lock,
+so each commit leaves a value no reader has seen before.
+
+ORM writes are counted by a before_flush hook on SessionLocal. Core
+INSERT/upsert paths (offline sync, the daily nutrient rollup) call
+bump_child_versions themselves, before their own writes.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import event, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.models import (
+    Child,
+    ChildAnthropometry,
+    ChildDailyNutrients,
+    ChildIllnessLog,
+    ChildMilestone,
+    ChildMilestoneStatus,
+    ChildVaccineStatus,
+    FoodMaster,
+    TableVersion,
+    VaccinationSchedule,
+)
+
+# Rows the per-child version tokens are built from. Prediction reports are
+# insert-only, so their count alone already moves on every commit.
+CHILD_VERSIONED = (
+    ChildAnthropometry,
+    ChildDailyNutrients,
+    ChildIllnessLog,
+    ChildMilestoneStatus,
+    ChildVaccineStatus,
+)
+REFERENCE_VERSIONED = (ChildMilestone, FoodMaster, VaccinationSchedule)
+
+
+def _insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(TableVersion)
+    if dialect == "sqlite":
+        return sqlite.insert(TableVersion)
+    raise NotImplementedError(f"table_versions upsert is not implemented for {dialect}")
+
+
+def bump_child_versions(db: Session, child_ids: Iterable[int]) -> None:
+    """Add one to each child's data_version. Does not commit."""
+    ids = sorted(set(child_ids))
+    if not ids:
+        return
+    table = Child.__table__
+    db.connection().execute(
+        update(table)
+        .where(table.c.child_id.in_(ids))
+        # Not a profile edit, so updated_at keeps its value
+        .values(data_version=table.c.data_version + 1, updated_at=table.c.updated_at)
+    )
+
+
+def bump_table_versions(db: Session, table_names: Iterable[str]) -> None:
+    """Add one to each reference table's version (created at 1). Does not commit."""
+    names = sorted(set(table_names))
+    if not names:
+        return
+    table = TableVersion.__table__
+    stmt = _insert(db).values([{"table_name": name, "version": 1} for name in names])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.table_name],
+        set_={"version": table.c.version + 1},
+    )
+    db.connection().execute(stmt)
+
+
+def _count_flushed_writes(session: Session, flush_context, instances) -> None:
+    child_ids = set()
+    tables = set()
+    dirty = (obj for obj in session.dirty if session.is_modified(obj))
+    for obj in (*session.new, *dirty, *session.deleted):
+        if isinstance(obj, CHILD_VERSIONED):
+            # None only for a child created in this same flush
+            if obj.child_id is not None:
+                child_ids.add(obj.child_id)
+        elif isinstance(obj, REFERENCE_VERSIONED):
+            tables.add(obj.__tablename__)
+    bump_child_versions(session, child_ids)
+    bump_table_versions(session, tables)
+
+
+def install_version_counters(session_factory) -> None:
+    event.listen(session_factory, "before_flush", _count_flushed_writes)
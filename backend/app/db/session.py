@@ -1,6 +1,64 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import install_pool_metrics
+from app.core.query_stats import install_query_hooks
+from app.db.data_versions import install_version_counters
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+
+def _async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "postgresql":
+        # psycopg3 ships sync and async support under the same dialect name
+        return url.set(drivername="postgresql+psycopg").render_as_string(hide_password=False)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    return settings.DATABASE_URL
+
+
+def _engine_kwargs(database_url: str, *, pool_size: int, max_overflow: int) -> dict:
+    kwargs = {"pool_pre_ping": True}
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return kwargs
+    kwargs.update(
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if url.get_backend_name() == "postgresql":
+        kwargs["connect_args"] = {"connect_timeout": settings.DB_CONNECT_TIMEOUT}
+    return kwargs
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    **_engine_kwargs(settings.DATABASE_URL, pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+install_query_hooks(engine)
+install_version_counters(SessionLocal)
+install_pool_metrics(engine, "sync")
+
+ASYNC_DATABASE_URL = _async_database_url()
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **_engine_kwargs(
+        ASYNC_DATABASE_URL, pool_size=settings.ASYNC_DB_POOL_SIZE, max_overflow=settings.ASYNC_DB_MAX_OVERFLOW
+    ),
+)
+install_query_hooks(async_engine.sync_engine)
+install_pool_metrics(async_engine.sync_engine, "async")
+# expire_on_commit=False: rows are serialized after the session closes and must
+# not try to lazy-load (which is not possible outside the async context).
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
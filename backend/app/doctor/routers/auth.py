@@ -25,7 +25,7 @@ def register_doctor(doctor: DoctorCreate, db: Session = Depends(get_db)):
 @router.post("/doctor-login", response_model=Token)
 async def login_for_access_token_doctor(user_login: UserLogin, db: Session = Depends(get_db)):
     try:
-        return auth_service.login_doctor(db=db, email=user_login.email, password=user_login.password)
+        return await auth_service.login_doctor(db=db, email=user_login.email, password=user_login.password)
     except HTTPException:
         raise
     except SQLAlchemyError:
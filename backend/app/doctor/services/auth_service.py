@@ -5,12 +5,12 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token, verify_and_update_password
 from app.core.time import now_ist
 from app.doctor.cruds import doctor as doctor_crud
 
 
-def login_doctor(db: Session, *, email: str, password: str) -> dict:
+async def login_doctor(db: Session, *, email: str, password: str) -> dict:
     try:
         result = doctor_crud.get_doctor_and_auth_by_email(db, email=email)
         user_type = "doctor"
@@ -23,13 +23,17 @@ def login_doctor(db: Session, *, email: str, password: str) -> dict:
             )
         user, auth = result
 
-        if not verify_password(password, auth.password_hash):
+        verified, new_hash = await verify_and_update_password(password, auth.password_hash)
+        if not verified:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        if new_hash:
+            # BCRYPT_ROUNDS changed since this hash was stored; upgrade it now
+            auth.password_hash = new_hash
         auth.last_login = now_ist()
         db.add(auth)
         db.commit()
@@ -1,5 +1,5 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import IntegrityError
 from app.apis import auth, users
@@ -15,10 +15,28 @@ from app.apis import child_profile
 from app.apis import nutrition
 from app.apis import chatbot
 from app.apis import reports
+from app.apis import admin
+from app.apis import sync
+from app.apis.deps import require_metrics_access
 from app.doctor import router as doctor_router
+from app.core.config import settings
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.http_cache import CacheValidatorsMiddleware
+from app.core.responses import ORJSONResponse
+from app.core import metrics
+import gc
 import re
 
-app = FastAPI(title="Sanrakshya API")
+if settings.MODEL_PRELOAD:
+    from app.services.cohort_scoring import preload_models
+
+    preload_models()
+    # Move everything loaded so far out of the GC's reach so collections in
+    # forked workers don't write to (and un-share) the model pages
+    gc.freeze()
+
+app = FastAPI(title="Sanrakshya API", default_response_class=ORJSONResponse)
 
 @app.exception_handler(IntegrityError)
 async def integrity_error_exception_handler(request: Request, exc: IntegrityError):
@@ -52,6 +70,16 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CacheValidatorsMiddleware)
+if settings.RESPONSE_COMPRESSION:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_BYTES,
+        gzip_level=settings.GZIP_LEVEL,
+        zstd_level=settings.ZSTD_LEVEL,
+    )
+app.add_middleware(QueryStatsMiddleware, expose_headers=settings.DEBUG)
+app.add_middleware(metrics.MetricsMiddleware)
 
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(users.router, prefix="/users", tags=["users"])
@@ -67,8 +95,16 @@ app.include_router(predictions.router, prefix="/predictions", tags=["predictions
 app.include_router(nutrition.router, prefix="/nutrition", tags=["nutrition"])
 app.include_router(chatbot.router, prefix="/chatbot", tags=["chatbot"])
 app.include_router(reports.router, prefix="/reports", tags=["reports"])
+app.include_router(admin.router, prefix="/admin", tags=["admin"])
+app.include_router(sync.router, prefix="/sync", tags=["sync"])
 app.include_router(child_profile.router, prefix="/children", tags=["children"])
 
 @app.get("/")
 async def health():
     return {"status": "ok"}
+
+# Route templates, pool state and model/LLM timings are internal: off unless
+# METRICS_ENABLED, and bearer-token protected when METRICS_BEARER_TOKEN is set
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+async def prometheus_metrics():
+    return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
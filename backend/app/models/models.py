@@ -1,12 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, func, Enum, Date, ForeignKey, Boolean, UniqueConstraint, Float
+from sqlalchemy import BigInteger, Column, Integer, String, Text, TIMESTAMP, func, Enum, Date, ForeignKey, Boolean, UniqueConstraint, Float, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.commit_order import current_xact_id
 from app.schemas.schemas import VaccineCategoryEnum, VaccineStatusEnum, VaccinationAgeGroupEnum
 from app.schemas.schemas import AchievedDifficultyEnum
 from app.schemas.schemas import IllnessSeverityEnum, ResolvedByEnum
 from app.schemas.schemas import FoodAgeGroupEnum
 from app.schemas.schemas import MealTypeEnum
 from app.schemas.schemas import ReportTypeEnum
+from app.schemas.schemas import SyncEntryTypeEnum, ChangeEntityEnum, ChangeOpEnum
 
 class ChildMedicalReport(Base):
     __tablename__ = "child_medical_reports"
@@ -70,6 +72,11 @@ class ChildAnthropometry(Base):
     created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        # latest_anthro / trend_anthro: newest-first and date-range reads per child
+        Index("ix_child_anthropometry_child_id_log_date", child_id, log_date.desc(), id.desc()),
+    )
+
 class ChildMealLog(Base):
     __tablename__ = "child_meal_log"
 
@@ -80,6 +87,10 @@ class ChildMealLog(Base):
     created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
     items = relationship("ChildMealItem", primaryjoin="ChildMealLog.id==ChildMealItem.meal_log_id", lazy="joined")
 
+    __table_args__ = (
+        Index("ix_child_meal_log_child_id_log_date", child_id, log_date.desc(), id.desc()),
+    )
+
 class ChildMealItem(Base):
     __tablename__ = "child_meal_item"
 
@@ -100,6 +111,32 @@ class ChildMealItem(Base):
     vitamin_a_mcg = Column(Float, nullable=True)
     vitamin_c_mg = Column(Float, nullable=True)
 
+class ChildDailyNutrients(Base):
+    """Per child and day: SUM(nutrient * meal_frequency) over that day's meal items.
+
+    Maintained in the same transaction as the meal log it summarizes
+    (crud_daily_nutrients); app.commands.backfill_daily_nutrients rebuilds it.
+    """
+    __tablename__ = "child_daily_nutrients"
+
+    id = Column(Integer, primary_key=True, index=True)
+    child_id = Column(Integer, ForeignKey("children.child_id", ondelete="CASCADE"), nullable=False)
+    log_date = Column(Date, nullable=False)
+    item_count = Column(Integer, nullable=False, server_default='0')
+    energy_kcal = Column(Float, nullable=False, server_default='0')
+    protein_g = Column(Float, nullable=False, server_default='0')
+    carb_g = Column(Float, nullable=False, server_default='0')
+    fat_g = Column(Float, nullable=False, server_default='0')
+    iron_mg = Column(Float, nullable=False, server_default='0')
+    calcium_mg = Column(Float, nullable=False, server_default='0')
+    vitamin_a_mcg = Column(Float, nullable=False, server_default='0')
+    vitamin_c_mg = Column(Float, nullable=False, server_default='0')
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('child_id', 'log_date', name='uq_child_daily_nutrients_child_id_log_date'),
+    )
+
 
 class FoodMaster(Base):
     __tablename__ = "food_master"
@@ -153,6 +190,10 @@ class ChildIllnessLog(Base):
     created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index("ix_child_illness_logs_child_id_created_at", child_id, created_at.desc(), id.desc()),
+    )
+
 class ChildMilestoneStatus(Base):
     __tablename__ = "child_milestone_status"
 
@@ -227,6 +268,8 @@ class Child(Base):
     date_of_birth = Column(Date, nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Bumped by every write to the child's rows (app.db.data_versions)
+    data_version = Column(Integer, nullable=False, server_default='0')
 
 class ChildMilestone(Base):
     __tablename__ = "child_milestones"
@@ -251,6 +294,8 @@ class ChildPredictionReport(Base):
 
     # When the prediction was generated
     created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    # Writing transaction; incremental exports read in (xact_id, id) order (app.db.commit_order)
+    xact_id = Column(BigInteger, server_default=current_xact_id(), nullable=False)
 
     # Core shared input features (union across age groups)
     is_existing = Column(Integer, nullable=True)
@@ -305,6 +350,18 @@ class ChildPredictionReport(Base):
     milestone_learning_delay_prob = Column(Float, nullable=True)
     milestone_social_skill_delay_prob = Column(Float, nullable=True)
 
+    # sha256 of the model input features (ages included) + age group + model file digests
+    # (prediction_common.feature_fingerprint); equal hash => predictions reusable
+    feature_hash = Column(String(64), nullable=True)
+
+    __table_args__ = (
+        Index("ix_child_prediction_reports_child_id_feature_hash", "child_id", "feature_hash"),
+        # "latest report", /reports and /trend pages
+        Index("ix_child_prediction_reports_child_id_created_at", child_id, created_at.desc(), id.desc()),
+        # Incremental retraining exports per age group
+        Index("ix_child_prediction_reports_age_group_xact_id_id", age_group, xact_id, id),
+    )
+
 class NutritionRequirement(Base):
     __tablename__ = "nutrition_requirement"
 
@@ -349,3 +406,58 @@ class NutritionRecipe(Base):
 
     created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class SyncReceipt(Base):
+    """An offline-sync entry that was applied, keyed by the client's idempotency key.
+
+    The unique (parent_id, idempotency_key) index answers a batch's replay
+    check in one lookup and stops two concurrent replays from both inserting.
+    """
+    __tablename__ = "sync_receipts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    parent_id = Column(Integer, ForeignKey("parents.parent_id", ondelete="CASCADE"), nullable=False)
+    idempotency_key = Column(String(64), nullable=False)
+    entry_type = Column(Enum(SyncEntryTypeEnum, name="sync_entry_type_enum"), nullable=False)
+    child_id = Column(Integer, ForeignKey("children.child_id", ondelete="CASCADE"), nullable=False, index=True)
+    record_id = Column(Integer, nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('parent_id', 'idempotency_key', name='uq_sync_receipts_parent_id_idempotency_key'),
+    )
+
+
+class ChangeLog(Base):
+    """Per-parent change feed behind GET /sync/changes, read in (xact_id, id) order.
+
+    Rows are written by the CRUD write paths (crud_changes.record_changes) in
+    the same transaction as the change they describe.
+    """
+    __tablename__ = "change_log"
+
+    id = Column(Integer, primary_key=True)
+    parent_id = Column(Integer, ForeignKey("parents.parent_id", ondelete="CASCADE"), nullable=False)
+    # No foreign key: tombstones must outlive the rows they describe
+    child_id = Column(Integer, nullable=False)
+    entity_type = Column(Enum(ChangeEntityEnum, name="change_entity_enum"), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(Enum(ChangeOpEnum, name="change_op_enum"), nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    # Writing transaction (app.db.commit_order)
+    xact_id = Column(BigInteger, server_default=current_xact_id(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_change_log_parent_id_xact_id_id", parent_id, xact_id, id),
+        # Never reuse ids, so a cursor cannot see a sequence number twice
+        {'sqlite_autoincrement': True},
+    )
+
+
+class TableVersion(Base):
+    """Write counter per reference table, bumped by app.db.data_versions."""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, server_default='0')
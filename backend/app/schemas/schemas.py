@@ -544,6 +544,19 @@ class WeeklyNutritionSummaryResponse(BaseModel):
     recommended_recipes: List[WeeklyNutritionRecipe] = Field(default_factory=list)
 
     message: Optional[str] = None
+
+class NutritionHistoryResponse(BaseModel):
+    """Parallel arrays, one entry per week (oldest first), keyed by nutrient."""
+    child_id: int
+    nutrients: List[str]
+    week_start: List[date]
+    days_logged: List[int]
+    age_months: List[int]
+    daily_avg: Dict[str, List[float]]
+    requirement: Dict[str, List[Optional[float]]]
+    percent_of_requirement: Dict[str, List[Optional[float]]]
+    adequacy: Dict[str, List[str]]
+
 class MealTypeEnum(str, Enum):
     BREAKFAST = 'breakfast'
     MID_MORNING = 'mid_morning'
@@ -646,4 +659,74 @@ class ChildMedicalReport(ChildMedicalReportBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# -------------------- Offline sync --------------------
+class SyncEntryTypeEnum(str, Enum):
+    MEAL_LOG = 'meal_log'
+    MEASUREMENT = 'measurement'
+    ILLNESS_LOG = 'illness_log'
+
+class SyncEntryStatusEnum(str, Enum):
+    CREATED = 'created'
+    DUPLICATE = 'duplicate'
+    REJECTED = 'rejected'
+
+class SyncEntry(BaseModel):
+    # Generated on the device once per entry and reused on every retry
+    idempotency_key: str = Field(..., min_length=8, max_length=64)
+    type: SyncEntryTypeEnum
+    child_id: int
+    # Day the entry was recorded on the device; required for meal_log and
+    # measurement (illness logs carry their own symptom/resolution times)
+    log_date: Optional[date] = None
+    meal: Optional[ChildMealLogCreate] = None
+    measurement: Optional[ChildAnthropometryCreate] = None
+    illness: Optional[ChildIllnessLogCreate] = None
+
+class SyncBatchRequest(BaseModel):
+    entries: List[SyncEntry] = Field(..., min_length=1)
+
+class SyncEntryResult(BaseModel):
+    idempotency_key: str
+    type: SyncEntryTypeEnum
+    child_id: int
+    status: SyncEntryStatusEnum
+    # Id of the meal log / measurement / illness log, also for duplicates
+    record_id: Optional[int] = None
+    detail: Optional[str] = None
+
+class SyncBatchResponse(BaseModel):
+    """One result per entry, in request order."""
+    results: List[SyncEntryResult]
+    created: int
+    duplicates: int
+    rejected: int
+
+class ChangeEntityEnum(str, Enum):
+    ILLNESS_LOG = 'illness_log'
+    VACCINE_STATUS = 'vaccine_status'
+    MILESTONE_STATUS = 'milestone_status'
+    PREDICTION_REPORT = 'prediction_report'
+    MEDICAL_REPORT = 'medical_report'
+
+class ChangeOpEnum(str, Enum):
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+
+class SyncEntityChanges(BaseModel):
+    # Current rows, shaped like the entity's own endpoints (null fields omitted)
+    upserts: List[Dict[str, Any]] = Field(default_factory=list)
+    # Ids removed since the cursor
+    deletes: List[int] = Field(default_factory=list)
+
+class SyncChangesResponse(BaseModel):
+    """Changes after the request's cursor; only entity types with changes are listed.
+
+    reset=true means the cursor is unknown: refetch the full lists, then
+    continue from the returned cursor. Cursors are opaque strings.
+    """
+    cursor: str
+    has_more: bool
+    reset: bool = False
+    changes: Dict[ChangeEntityEnum, SyncEntityChanges] = Field(default_factory=dict)
@@ -8,6 +8,8 @@ from langchain_community.vectorstores import FAISS
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.prompts import PromptTemplate
 
+from app.core.metrics import llm_errors_total, llm_request_seconds, vector_search_seconds
+
 load_dotenv()
 
 _SERVICES_DIR = os.path.dirname(__file__)
@@ -205,6 +207,7 @@ def ask_bal_mitra(question: str, child_context: Dict[str, Any]) -> str:
     try:
         retriever, llm, prompt = load_rag()
     except Exception as e:
+        llm_errors_total.inc(client="bal_mitra")
         return (
             "Bal Mitra is having some trouble on the technical side and cannot answer right now. "
             "Please try again in a little while. For any urgent concern, please contact your child's "
@@ -225,7 +228,8 @@ def ask_bal_mitra(question: str, child_context: Dict[str, Any]) -> str:
     )
 
     try:
-        docs = retriever.get_relevant_documents(retrieval_query)
+        with vector_search_seconds.time(index="bal_mitra"):
+            docs = retriever.get_relevant_documents(retrieval_query)
     except Exception:
         docs = []
 
@@ -244,12 +248,14 @@ def ask_bal_mitra(question: str, child_context: Dict[str, Any]) -> str:
         rendered = question
 
     try:
-        response = llm.invoke(rendered)
+        with llm_request_seconds.time(client="bal_mitra"):
+            response = llm.invoke(rendered)
         content = getattr(response, "content", None)
         if isinstance(content, str):
             return content
         return str(response)
     except Exception as e:
+        llm_errors_total.inc(client="bal_mitra")
         return (
             "Bal Mitra could not complete this reply due to a technical issue. "
             "Please try again later, and for anything serious or worrying, reach out to your child's "
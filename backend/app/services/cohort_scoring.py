@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db import crud
+from app.db.crud_changes import record_changes
+from app.models.models import (
+    Child,
+    ChildAnthropometry as ChildAnthropometryModel,
+    ChildIllnessLog as ChildIllnessLogModel,
+    ChildMealLog as ChildMealLogModel,
+    ChildMilestone as ChildMilestoneModel,
+    ChildMilestoneStatus as ChildMilestoneStatusModel,
+    ChildPredictionReport,
+    ChildVaccineStatus as ChildVaccineStatusModel,
+    FoodMaster as FoodMasterModel,
+    VaccinationSchedule as VaccinationScheduleModel,
+)
+from app.schemas.schemas import ChangeEntityEnum, VaccinationAgeGroupEnum, VaccineCategoryEnum
+from app.services.prediction_common import (
+    MILESTONE_FEATURES_BY_GROUP,
+    FeatureInputs,
+    build_features_from_inputs,
+    feature_fingerprint,
+    finalize_predictions,
+    milestone_feature_ids,
+    prediction_report_values,
+)
+from app.services.prediction_infant import INFANT_FEATURES, INFANT_MODELS, predict_infant_batch, _load_infant_models
+from app.services.prediction_toddler import TODDLER_FEATURES, TODDLER_MODELS, predict_toddler_batch, _load_toddler_models
+from app.services.prediction_preschool import (
+    PRESCHOOL_FEATURES,
+    PRESCHOOL_MODELS,
+    predict_preschool_batch,
+    _load_preschool_models,
+)
+from app.services.prediction_schoolage import (
+    SCHOOLAGE_FEATURES,
+    SCHOOLAGE_MODELS,
+    predict_schoolage_batch,
+    _load_schoolage_models,
+)
+
+
+# Per age group: {target: model file name} and the model input columns in training order
+GROUP_MODELS: Dict[VaccinationAgeGroupEnum, Tuple[Dict[str, str], List[str]]] = {
+    VaccinationAgeGroupEnum.INFANT: (INFANT_MODELS, INFANT_FEATURES),
+    VaccinationAgeGroupEnum.TODDLER: (TODDLER_MODELS, TODDLER_FEATURES),
+    VaccinationAgeGroupEnum.PRESCHOOL: (PRESCHOOL_MODELS, PRESCHOOL_FEATURES),
+    VaccinationAgeGroupEnum.SCHOOL_AGE: (SCHOOLAGE_MODELS, SCHOOLAGE_FEATURES),
+}
+
+_BATCH_PREDICTORS = {
+    VaccinationAgeGroupEnum.INFANT: predict_infant_batch,
+    VaccinationAgeGroupEnum.TODDLER: predict_toddler_batch,
+    VaccinationAgeGroupEnum.PRESCHOOL: predict_preschool_batch,
+    VaccinationAgeGroupEnum.SCHOOL_AGE: predict_schoolage_batch,
+}
+
+
+def preload_models() -> None:
+    """Load every age group's models into this process's model cache (pool initializer)."""
+    _load_infant_models()
+    _load_toddler_models()
+    _load_preschool_models()
+    _load_schoolage_models()
+
+
+def predict_group_batch(group_value: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Top-level (picklable) entry point for ProcessPoolExecutor workers
+    return _BATCH_PREDICTORS[VaccinationAgeGroupEnum(group_value)](rows)
+
+
+def iter_child_chunks(db: Session, *, chunk_size: int, after_child_id: int = 0) -> Iterator[List[Child]]:
+    """Stream children in child_id order using keyset pagination (restartable from a checkpoint)."""
+    last_id = after_child_id
+    while True:
+        chunk = (
+            db.query(Child)
+            .filter(Child.child_id > last_id)
+            .order_by(Child.child_id.asc())
+            .limit(chunk_size)
+            .all()
+        )
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1].child_id
+
+
+def _group_rows(rows: Iterable, key) -> Dict[int, list]:
+    out: Dict[int, list] = defaultdict(list)
+    for r in rows:
+        out[key(r)].append(r)
+    return out
+
+
+class CohortFeatureLoader:
+    """Builds prediction features for many children with a fixed number of set-wise queries.
+
+    Produces exactly what build_features_for_group returns for each child, but
+    loads anthropometry, meals, illness, vaccines and milestones for the whole
+    chunk with IN (...) queries instead of ~10 queries per child.
+    """
+
+    def __init__(self, db: Session, *, today: Optional[date] = None) -> None:
+        self.db = db
+        self.today = today or date.today()
+        self._feature_to_ids: Dict[VaccinationAgeGroupEnum, Dict[str, List[int]]] = {}
+
+    def _milestone_ids_for(self, group: VaccinationAgeGroupEnum) -> Dict[str, List[int]]:
+        if group not in self._feature_to_ids:
+            group_milestones = (
+                self.db.query(ChildMilestoneModel)
+                .filter(ChildMilestoneModel.category == group)
+                .all()
+            )
+            self._feature_to_ids[group] = milestone_feature_ids(group_milestones, MILESTONE_FEATURES_BY_GROUP.get(group, []))
+        return self._feature_to_ids[group]
+
+    def _load_inputs(self, child_ids: List[int]) -> Tuple[Dict[int, FeatureInputs], Dict[int, Tuple[Optional[str], Optional[str]]]]:
+        db = self.db
+        today = self.today
+        inputs = {cid: FeatureInputs(achieved_milestone_ids=set()) for cid in child_ids}
+
+        ranked = (
+            select(
+                ChildAnthropometryModel.id,
+                func.row_number().over(
+                    partition_by=ChildAnthropometryModel.child_id,
+                    order_by=(ChildAnthropometryModel.log_date.desc(), ChildAnthropometryModel.id.desc()),
+                ).label("rn"),
+            )
+            .where(ChildAnthropometryModel.child_id.in_(child_ids))
+            .subquery()
+        )
+        latest_rows = (
+            db.query(ChildAnthropometryModel)
+            .join(ranked, ranked.c.id == ChildAnthropometryModel.id)
+            .filter(ranked.c.rn == 1)
+            .all()
+        )
+        for row in latest_rows:
+            inputs[row.child_id].latest_anthro = row
+
+        trend_rows = (
+            db.query(ChildAnthropometryModel)
+            .filter(
+                ChildAnthropometryModel.child_id.in_(child_ids),
+                ChildAnthropometryModel.log_date >= today - timedelta(days=6 * 30),
+            )
+            .order_by(ChildAnthropometryModel.child_id.asc(), ChildAnthropometryModel.log_date.asc())
+            .all()
+        )
+        for cid, rows in _group_rows(trend_rows, lambda r: r.child_id).items():
+            inputs[cid].trend_rows = rows
+
+        meal_logs = (
+            db.query(ChildMealLogModel)
+            .filter(
+                ChildMealLogModel.child_id.in_(child_ids),
+                ChildMealLogModel.log_date >= today - timedelta(days=7),
+                ChildMealLogModel.log_date <= today,
+            )
+            .order_by(ChildMealLogModel.log_date.asc(), ChildMealLogModel.id.asc())
+            .all()
+        )
+        for cid, rows in _group_rows(meal_logs, lambda r: r.child_id).items():
+            inputs[cid].meal_logs = rows
+        food_ids = {it.food_id for log in meal_logs for it in (log.items or []) if it.food_id is not None}
+        food_meta: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        if food_ids:
+            for fm in db.query(FoodMasterModel).filter(FoodMasterModel.food_id.in_(food_ids)).all():
+                food_meta[fm.food_id] = (getattr(fm, "food_group", None), getattr(fm, "food_name", None))
+
+        illness_rows = (
+            db.query(ChildIllnessLogModel)
+            .filter(
+                ChildIllnessLogModel.child_id.in_(child_ids),
+                ChildIllnessLogModel.created_at >= today - timedelta(days=90),
+            )
+            .all()
+        )
+        for cid, rows in _group_rows(illness_rows, lambda r: r.child_id).items():
+            inputs[cid].illness_rows = rows
+
+        core_rows = (
+            db.query(ChildVaccineStatusModel, VaccinationScheduleModel)
+            .join(VaccinationScheduleModel, VaccinationScheduleModel.id == ChildVaccineStatusModel.schedule_id)
+            .filter(
+                ChildVaccineStatusModel.child_id.in_(child_ids),
+                VaccinationScheduleModel.category == VaccineCategoryEnum.CORE,
+            )
+            .all()
+        )
+        for cid, rows in _group_rows(core_rows, lambda r: r[0].child_id).items():
+            inputs[cid].core_vaccine_rows = rows
+
+        for (cid,) in (
+            db.query(ChildVaccineStatusModel.child_id)
+            .filter(ChildVaccineStatusModel.child_id.in_(child_ids))
+            .distinct()
+        ):
+            inputs[cid].has_vaccine_data = True
+
+        for cid, milestone_id in (
+            db.query(ChildMilestoneStatusModel.child_id, ChildMilestoneStatusModel.milestone_id)
+            .filter(ChildMilestoneStatusModel.child_id.in_(child_ids))
+        ):
+            inputs[cid].achieved_milestone_ids.add(milestone_id)
+            inputs[cid].has_milestone_data = True
+
+        return inputs, food_meta
+
+    def build(self, children: List[Child]) -> List[Tuple[Child, VaccinationAgeGroupEnum, Dict[str, Any], Dict[str, Any]]]:
+        """Return (child, group, features, info) for each child, in input order."""
+        if not children:
+            return []
+        inputs, food_meta = self._load_inputs([c.child_id for c in children])
+
+        def resolve(it) -> Tuple[Optional[str], Optional[str]]:
+            return food_meta.get(it.food_id, (None, None)) if it.food_id is not None else (None, None)
+
+        out = []
+        for child in children:
+            group = crud.compute_child_age_group(child.date_of_birth)
+            features, info = build_features_from_inputs(
+                child,
+                group,
+                inputs[child.child_id],
+                feature_to_ids=self._milestone_ids_for(group),
+                food_meta=resolve,
+            )
+            out.append((child, group, features, info))
+        return out
+
+
+def existing_feature_hashes(db: Session, pairs: List[Tuple[int, str]]) -> set[Tuple[int, str]]:
+    """(child_id, feature_hash) pairs that already have a report; served by the composite index."""
+    if not pairs:
+        return set()
+    child_ids = sorted({child_id for child_id, _ in pairs})
+    hashes = sorted({h for _, h in pairs})
+    found = db.execute(
+        select(ChildPredictionReport.child_id, ChildPredictionReport.feature_hash)
+        .where(ChildPredictionReport.child_id.in_(child_ids))
+        .where(ChildPredictionReport.feature_hash.in_(hashes))
+        .distinct()
+    ).all()
+    wanted = set(pairs)
+    return {(child_id, h) for child_id, h in found if (child_id, h) in wanted}
+
+
+def report_rows(
+    scored: List[Tuple[int, VaccinationAgeGroupEnum, Dict[str, Any], str]],
+    preds: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    rows = []
+    for (child_id, group, features, feature_hash), raw in zip(scored, preds):
+        rows.append(
+            prediction_report_values(
+                child_id, group, features, finalize_predictions(features, raw), feature_hash=feature_hash
+            )
+        )
+    return rows
+
+
+def bulk_insert_reports(db: Session, rows: List[Dict[str, Any]]) -> None:
+    if rows:
+        inserted = db.execute(
+            insert(ChildPredictionReport).returning(ChildPredictionReport.child_id, ChildPredictionReport.id), rows
+        )
+        record_changes(db, ChangeEntityEnum.PREDICTION_REPORT, inserted.all())
+
+
+def default_worker_count() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the series' shape.
+
+    The first and last points are always kept. The middle is split into
+    threshold - 2 buckets, and from each bucket the point forming the largest
+    triangle with the previously kept point and the next bucket's centroid is
+    chosen. xs must be ascending. Returns every index when the series already
+    fits.
+    """
+    if threshold < 3:
+        raise ValueError("LTTB needs a threshold of at least 3 points")
+    n = len(xs)
+    if threshold >= n:
+        return list(range(n))
+
+    x = np.asarray(xs, dtype=float)
+    y = np.asarray(ys, dtype=float)
+    # Gaps in the series (None/NaN) should neither win nor poison the centroids
+    y = np.where(np.isnan(y), np.nanmean(y) if np.isfinite(y).any() else 0.0, y)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    kept = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nxt_start, nxt_end = edges[i + 1], edges[i + 2]
+        else:
+            nxt_start, nxt_end = n - 1, n
+        cx = x[nxt_start:nxt_end].mean()
+        cy = y[nxt_start:nxt_end].mean()
+        bx = x[start:end]
+        by = y[start:end]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = int(start) + int(np.argmax(area))
+        kept.append(a)
+    kept.append(n - 1)
+    return kept
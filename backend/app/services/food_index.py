@@ -0,0 +1,121 @@
+"""Per-nutrient top-food lookups for the weekly nutrition summary.
+
+top_foods_by_nutrient used to load the age group's FoodMaster rows on every
+call, apply the infant milk and breast-milk filters, and re-sort the list for
+each deficit nutrient. This index is built once from FoodMaster. For every
+food age group and filter profile it keeps the foods' nutrient values in a
+NumPy matrix and one pre-sorted row order per nutrient column, so a top-k
+lookup is a slice with no query.
+
+Orders match the old Python sort: value descending (missing counts as 0),
+ties kept in list_foods_by_age_group order (food_group, food_name).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.table_snapshot import TableSnapshot
+from app.models.models import FoodMaster
+from app.schemas.schemas import FoodAgeGroupEnum
+
+FOOD_NUTRIENTS = (
+    "energy_kcal",
+    "protein_g",
+    "carb_g",
+    "fat_g",
+    "iron_mg",
+    "calcium_mg",
+    "vitamin_a_mcg",
+    "vitamin_c_mg",
+)
+
+BREASTMILK_KEYWORDS = (
+    "breastmilk",
+    "breast milk",
+    "breast-feeding",
+    "breastfeeding",
+    "mother's milk",
+    "mothers milk",
+    "human milk",
+    "infant formula",
+    "baby formula",
+    "formula milk",
+)
+
+
+class FoodProfile(NamedTuple):
+    age_group: FoodAgeGroupEnum
+    milk_only: bool = False  # infants: food_group "milk" only
+    breastmilk_only: bool = False  # 0-6 months: breast milk / formula only
+
+
+def is_breastmilk_like(food_name: str | None, food_group: str | None) -> bool:
+    text = (food_name or "").lower() + " " + (food_group or "").lower()
+    return any(k in text for k in BREASTMILK_KEYWORDS)
+
+
+@dataclass(frozen=True)
+class _Partition:
+    foods: Sequence[Dict[str, object]]
+    values: np.ndarray  # (foods, FOOD_NUTRIENTS)
+    order: Dict[str, np.ndarray]
+
+    @classmethod
+    def build(cls, rows: List[FoodMaster]) -> "_Partition":
+        values = np.array(
+            [[float(getattr(f, n) or 0.0) for n in FOOD_NUTRIENTS] for f in rows],
+            dtype=np.float64,
+        ).reshape(len(rows), len(FOOD_NUTRIENTS))
+        position = np.arange(len(rows))
+        return cls(
+            foods=tuple(
+                {"food_id": f.food_id, "food_name": f.food_name, "food_group": f.food_group} for f in rows
+            ),
+            values=values,
+            # lexsort: last key is primary -> value descending, then list position
+            order={n: np.lexsort((position, -values[:, j])) for j, n in enumerate(FOOD_NUTRIENTS)},
+        )
+
+
+class FoodIndex:
+    def __init__(self, rows: List[FoodMaster]) -> None:
+        # rows must be in list_foods_by_age_group order
+        self._partitions: Dict[FoodProfile, _Partition] = {}
+        for group in FoodAgeGroupEnum:
+            in_group = [f for f in rows if f.category_age_group in (group, FoodAgeGroupEnum.ALL)]
+            milk = [f for f in in_group if (f.food_group or "").lower() == "milk"]
+            for milk_only, base in ((False, in_group), (True, milk)):
+                self._partitions[FoodProfile(group, milk_only, False)] = _Partition.build(base)
+                self._partitions[FoodProfile(group, milk_only, True)] = _Partition.build(
+                    [f for f in base if is_breastmilk_like(f.food_name, f.food_group)]
+                )
+
+    def top_foods(self, profile: FoodProfile, nutrient: str, k: int = 5) -> List[Dict[str, object]]:
+        part = self._partitions[profile]
+        return [dict(part.foods[i]) for i in part.order[nutrient][:k]]
+
+
+def build_food_index(db: Session) -> FoodIndex:
+    rows = (
+        db.query(FoodMaster)
+        .order_by(FoodMaster.food_group.asc().nulls_last(), FoodMaster.food_name.asc())
+        .all()
+    )
+    return FoodIndex(rows)
+
+
+_snapshot: TableSnapshot[FoodIndex] = TableSnapshot(FoodMaster, build_food_index)
+
+
+def get_food_index(db: Session) -> FoodIndex:
+    """This process's index, rebuilt when FoodMaster changed."""
+    return _snapshot.get(db)
+
+
+def invalidate_food_index() -> None:
+    # Called per changed row during a seed; the next lookup re-checks the stamp once
+    _snapshot.invalidate()
@@ -6,6 +6,7 @@ import json
 import re
 from typing import Optional, Dict
 from app.core.config import settings
+from app.core.metrics import llm_errors_total, llm_request_seconds
 
 # -------------------------------------------------
 # 3. Client setup (API key from env)
@@ -38,6 +39,7 @@ def get_nutrition(food_desc: str, grams: float) -> Optional[Dict[str, float]]:
     Returns a dict of nutrient fields; falls back to zeros if anything fails.
     """
     if client is None:
+        llm_errors_total.inc(client="groq_nutrition")
         print("AI nutrition estimation error: LLM client not configured (missing GROQ_API_KEY/GEMINI_API_KEY)")
         return None
 
@@ -49,18 +51,20 @@ Respond with JSON ONLY - start with {{ and end with }}:
 {{"energy_kcal": <float>, "protein_g": <float>, "carb_g": <float>, "fat_g": <float>, "iron_mg": <float>, "calcium_mg": <float>, "vitamin_a_mcg": <float>, "vitamin_c_mg": <float>}}"""
 
     try:
-        chat_completion = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="llama-3.3-70b-versatile",
-            temperature=0.0,
-            max_tokens=150,
-            stream=False,
-        )
+        with llm_request_seconds.time(client="groq_nutrition"):
+            chat_completion = client.chat.completions.create(
+                messages=[{"role": "user", "content": prompt}],
+                model="llama-3.3-70b-versatile",
+                temperature=0.0,
+                max_tokens=150,
+                stream=False,
+            )
         output_text = chat_completion.choices[0].message.content.strip()
 
         # Extract JSON object
         json_match = re.search(r"\{.*\}", output_text, re.DOTALL)
         if not json_match:
+            llm_errors_total.inc(client="groq_nutrition")
             print(f"AI nutrition estimation error: model did not return JSON. Raw: {output_text[:200]}")
             return None
         data = json.loads(json_match.group())
@@ -83,6 +87,7 @@ Respond with JSON ONLY - start with {{ and end with }}:
             data.setdefault(k, v)
         return data  # success
     except Exception as e:
+        llm_errors_total.inc(client="groq_nutrition")
         print(f"AI nutrition estimation error for '{food_desc}' ({grams}g): {repr(e)}")
         return None
 
@@ -0,0 +1,132 @@
+"""XGBoost native-format model store.
+
+`python -m app.commands.export_native_models` writes every pickled model next
+to its pickle in XGBoost's own format (UBJSON by default, or JSON) and records
+it in `<MODELS_DIR>/manifest.json`:
+
+    {"format_version": 1, "xgboost": "3.1.1", "models": {
+        "infant/infant_prob_fever_xgb_model.pkl": {
+            "file": "infant/infant_prob_fever_xgb_model.ubj", "format": "ubj",
+            "estimator": "XGBRegressor", "age_group": "Infant", "target": "prob_fever",
+            "features": [...], "sha256": "...", "source_sha256": "..."}}}
+
+With MODEL_FORMAT=native, `_ModelCache` loads the native file instead of the
+pickle. Files are checksum-verified against the manifest; anything missing or
+mismatched falls back to the pickle.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT_VERSION = 1
+NATIVE_FORMATS = ("ubj", "json")
+
+# (path, mtime_ns) -> parsed manifest models map
+_manifest_cache: Dict[Tuple[str, int], Dict[str, Dict[str, Any]]] = {}
+
+
+def manifest_path() -> str:
+    return os.path.join(settings.MODELS_DIR, MANIFEST_NAME)
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def model_key(path: str) -> str:
+    """Manifest key for a model path: relative to MODELS_DIR, forward slashes."""
+    rel = os.path.relpath(os.path.abspath(path), os.path.abspath(settings.MODELS_DIR))
+    return rel.replace(os.sep, "/")
+
+
+def native_path_for(pickle_path: str, fmt: str = "ubj") -> str:
+    if fmt not in NATIVE_FORMATS:
+        raise ValueError(f"Unsupported native model format: {fmt}")
+    return os.path.splitext(pickle_path)[0] + "." + fmt
+
+
+def load_manifest() -> Dict[str, Dict[str, Any]]:
+    path = manifest_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    key = (path, mtime)
+    models = _manifest_cache.get(key)
+    if models is None:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format_version") != MANIFEST_FORMAT_VERSION:
+            print(f"Ignoring model manifest {path}: unsupported format_version {data.get('format_version')}")
+            models = {}
+        else:
+            models = data.get("models") or {}
+        _manifest_cache.clear()
+        _manifest_cache[key] = models
+    return models
+
+
+def write_manifest(models: Dict[str, Dict[str, Any]]) -> str:
+    import xgboost
+
+    path = manifest_path()
+    data = {"format_version": MANIFEST_FORMAT_VERSION, "xgboost": xgboost.__version__, "models": models}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+    return path
+
+
+def export_model(model: Any, pickle_path: str, *, age_group: str, target: str, fmt: str = "ubj") -> Dict[str, Any]:
+    """Save one fitted XGB sklearn estimator in native format; returns its manifest entry."""
+    out_path = native_path_for(pickle_path, fmt)
+    model.save_model(out_path)
+    booster = model.get_booster()
+    return {
+        "file": model_key(out_path),
+        "format": fmt,
+        "estimator": type(model).__name__,
+        "age_group": age_group,
+        "target": target,
+        "features": list(booster.feature_names or []),
+        "sha256": file_sha256(out_path),
+        "source_sha256": file_sha256(pickle_path),
+    }
+
+
+def load_native(pickle_path: str) -> Optional[Any]:
+    """Native-format replacement for the pickle at pickle_path, or None to fall back."""
+    entry = load_manifest().get(model_key(pickle_path))
+    if entry is None:
+        return None
+    path = os.path.join(settings.MODELS_DIR, entry["file"])
+    if not os.path.exists(path):
+        return None
+    if file_sha256(path) != entry.get("sha256"):
+        print(f"Checksum mismatch for {path}; using {pickle_path}")
+        return None
+    # A pickle replaced after export no longer matches the native copy
+    if os.path.exists(pickle_path) and file_sha256(pickle_path) != entry.get("source_sha256"):
+        print(f"{pickle_path} changed since export; using the pickle")
+        return None
+
+    import xgboost
+
+    estimators = {"XGBClassifier": xgboost.XGBClassifier, "XGBRegressor": xgboost.XGBRegressor}
+    cls = estimators.get(entry.get("estimator"))
+    if cls is None:
+        return None
+    model = cls()
+    model.load_model(path)
+    return model
@@ -1,6 +1,10 @@
+import hashlib
+import json
+import math
 import os
+from dataclasses import dataclass, field
 from datetime import date, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import joblib
 import numpy as np
@@ -9,7 +13,10 @@ from sqlalchemy.orm import Session
 from functools import lru_cache
 
 from app.core.config import settings
+from app.core.metrics import model_cache_requests_total, model_load_seconds
 from app.db import crud
+from app.services.native_models import load_native
+from app.services.vaccine_schedule import schedule_plan
 from app.models.models import (
     Child,
     ChildAnthropometry as ChildAnthropometryModel,
@@ -31,13 +38,22 @@ class _ModelCache:
 
     def get(self, path: str):
         if path in self._cache:
+            model_cache_requests_total.inc(result="hit")
             return self._cache[path]
         if not os.path.exists(path):
+            model_cache_requests_total.inc(result="missing")
             return None
-        model = joblib.load(path)
+        model_cache_requests_total.inc(result="miss")
+        with model_load_seconds.time(model=os.path.basename(path)):
+            model = load_native(path) if settings.MODEL_FORMAT == "native" else None
+            if model is None:
+                model = joblib.load(path)
         self._cache[path] = model
         return model
 
+    def __len__(self) -> int:
+        return len(self._cache)
+
 
 model_cache = _ModelCache()
 
@@ -89,6 +105,19 @@ def latest_anthro(db: Session, child_id: int) -> Optional[ChildAnthropometryMode
     )
 
 
+def trend_anthro_from_rows(rows: List[ChildAnthropometryModel]) -> Tuple[Optional[float], Optional[float], int]:
+    """rows: anthropometry inside the trend window, ordered by log_date ascending."""
+    if len(rows) < 2:
+        return None, None, len(rows)
+    w0, w1 = rows[0], rows[-1]
+    days = (w1.log_date - w0.log_date).days or 1
+    if to_float(w1.weight_kg) is None or to_float(w0.weight_kg) is None:
+        return None, None, len(rows)
+    avg_gain = (w1.weight_kg - w0.weight_kg) / max(days / 30.0, 0.01)
+    vel = (w1.weight_kg - w0.weight_kg) / days
+    return float(avg_gain), float(vel), len(rows)
+
+
 def trend_anthro(db: Session, child_id: int, months: int = 6) -> Tuple[Optional[float], Optional[float], int]:
     since = date.today() - timedelta(days=months * 30)
     rows = (
@@ -100,20 +129,46 @@ def trend_anthro(db: Session, child_id: int, months: int = 6) -> Tuple[Optional[
         .order_by(ChildAnthropometryModel.log_date.asc())
         .all()
     )
-    if len(rows) < 2:
-        return None, None, len(rows)
-    w0, w1 = rows[0], rows[-1]
-    days = (w1.log_date - w0.log_date).days or 1
-    if to_float(w1.weight_kg) is None or to_float(w0.weight_kg) is None:
-        return None, None, len(rows)
-    avg_gain = (w1.weight_kg - w0.weight_kg) / max(days / 30.0, 0.01)
-    vel = (w1.weight_kg - w0.weight_kg) / days
-    return float(avg_gain), float(vel), len(rows)
+    return trend_anthro_from_rows(rows)
 
 
-def feeding_features(db: Session, child_id: int, group: VaccinationAgeGroupEnum, days_window: int = 7) -> Dict[str, int]:
-    start = date.today() - timedelta(days=days_window)
-    logs: List[ChildMealLogModel] = crud.list_child_meal_logs_between(db, child_id=child_id, start_date=start, end_date=date.today())
+FoodMeta = Callable[[Any], Tuple[Optional[str], Optional[str]]]
+
+
+def _food_meta_from_db(db: Session) -> FoodMeta:
+    """Resolve (food_group, food_name) for a meal item, one FoodMaster lookup per item."""
+    def resolve(it) -> Tuple[Optional[str], Optional[str]]:
+        food_group = None
+        food_name = None
+        try:
+            # Try to use joined relationship via eager load if present
+            if hasattr(it, 'food') and it.food is not None:
+                food_group = getattr(it.food, 'food_group', None)
+                food_name = getattr(it.food, 'food_name', None)
+        except Exception:
+            food_group = None
+            food_name = None
+
+        # Fallback: if we still don't have metadata but have food_id, query FoodMaster
+        if (food_group is None or food_name is None) and getattr(it, "food_id", None) is not None:
+            try:
+                fm = (
+                    db.query(FoodMasterModel)
+                    .filter(FoodMasterModel.food_id == it.food_id)
+                    .first()
+                )
+                if fm is not None:
+                    if food_group is None:
+                        food_group = getattr(fm, "food_group", None)
+                    if food_name is None:
+                        food_name = getattr(fm, "food_name", None)
+            except Exception:
+                pass
+        return food_group, food_name
+    return resolve
+
+
+def feeding_features_from_logs(logs: List[ChildMealLogModel], group: VaccinationAgeGroupEnum, food_meta: FoodMeta) -> Dict[str, int]:
     items = 0
     # Category counters by group
     cnt: Dict[str, int] = {}
@@ -129,32 +184,7 @@ def feeding_features(db: Session, child_id: int, group: VaccinationAgeGroupEnum,
             items += freq_val
 
             name = (it.custom_food_name or "").lower()
-            food_group = None
-            food_name = None
-            try:
-                # Try to use joined relationship via eager load if present
-                if hasattr(it, 'food') and it.food is not None:
-                    food_group = getattr(it.food, 'food_group', None)
-                    food_name = getattr(it.food, 'food_name', None)
-            except Exception:
-                food_group = None
-                food_name = None
-
-            # Fallback: if we still don't have metadata but have food_id, query FoodMaster
-            if (food_group is None or food_name is None) and getattr(it, "food_id", None) is not None:
-                try:
-                    fm = (
-                        db.query(FoodMasterModel)
-                        .filter(FoodMasterModel.food_id == it.food_id)
-                        .first()
-                    )
-                    if fm is not None:
-                        if food_group is None:
-                            food_group = getattr(fm, "food_group", None)
-                        if food_name is None:
-                            food_name = getattr(fm, "food_name", None)
-                except Exception:
-                    pass
+            food_group, food_name = food_meta(it)
 
             # Heuristics per age group
             if group == VaccinationAgeGroupEnum.INFANT:
@@ -235,60 +265,21 @@ def feeding_features(db: Session, child_id: int, group: VaccinationAgeGroupEnum,
     return {"feeding_type": feeding_type, "feeding_frequency": feeding_frequency, "has_recent_meal_logs": int(bool(logs))}
 
 
-def vaccination_status_code(db: Session, child: Child, group: VaccinationAgeGroupEnum) -> int:
-    """Compute vaccination status from CORE vaccines with timing.
-    Returns: 0=Up-to-date, 1=Partial, 2=Delayed
-    Logic:
-      - Delayed if any CORE dose is overdue (scheduled_date < today) and not COMPLETED.
-      - Up-to-date if all CORE doses are COMPLETED and no overdue exists.
-      - Partial otherwise (some completed, none overdue yet).
-    """
+def feeding_features(db: Session, child_id: int, group: VaccinationAgeGroupEnum, days_window: int = 7) -> Dict[str, int]:
+    start = date.today() - timedelta(days=days_window)
+    logs: List[ChildMealLogModel] = crud.list_child_meal_logs_between(db, child_id=child_id, start_date=start, end_date=date.today())
+    return feeding_features_from_logs(logs, group, _food_meta_from_db(db))
+
+
+def vaccination_status_from_rows(child: Child, group: VaccinationAgeGroupEnum, rows) -> int:
+    """rows: (ChildVaccineStatus, VaccinationSchedule) pairs for the child's CORE vaccines."""
     today = date.today()
-    rows = (
-        db.query(ChildVaccineStatusModel, VaccinationScheduleModel)
-        .join(VaccinationScheduleModel, VaccinationScheduleModel.id == ChildVaccineStatusModel.schedule_id)
-        .filter(
-            ChildVaccineStatusModel.child_id == child.child_id,
-            VaccinationScheduleModel.category == VaccineCategoryEnum.CORE,
-        )
-        .all()
-    )
     if not rows:
         return 0
     total = len(rows)
     completed = 0
     delayed = 0   # missed or late
     pending = 0   # future due
-    # Helper: parse recommended_age like "6 weeks", "9 months", "12-15 months", "2 years"
-    def _parse_recommended_min_months(txt: Optional[str]) -> Optional[int]:
-        if not txt:
-            return None
-        t = txt.strip().lower()
-        # common tokens
-        # ranges like "12-15 months" -> take 12
-        import re
-        # years
-        m = re.search(r"(\d+)\s*years?", t)
-        if m:
-            return int(m.group(1)) * 12
-        # months (with optional range)
-        m = re.search(r"(\d+)(?:\s*[-–]\s*\d+)?\s*months?", t)
-        if m:
-            return int(m.group(1))
-        # weeks -> convert to months approx (4.345 weeks per month ~ 4.3)
-        m = re.search(r"(\d+)\s*weeks?", t)
-        if m:
-            w = int(m.group(1))
-            return max(0, int(round(w / 4.345)))
-        # days -> convert to months
-        m = re.search(r"(\d+)\s*days?", t)
-        if m:
-            d = int(m.group(1))
-            return max(0, int(round(d / 30.0)))
-        # birth/newborn keywords -> 0
-        if "birth" in t or "newborn" in t:
-            return 0
-        return None
 
     # compute child's current age in months (approx)
     try:
@@ -304,7 +295,7 @@ def vaccination_status_code(db: Session, child: Child, group: VaccinationAgeGrou
             # No scheduled_date: if schedule group < current group, consider late completion
             elif st.scheduled_date is None:
                 # Approximate due from recommended_age
-                min_m = _parse_recommended_min_months(getattr(sch, 'recommended_age', None)) if sch else None
+                min_m = schedule_plan(sch).min_months if sch else None
                 if min_m is not None and st.actual_date is not None:
                     due_date = child.date_of_birth + timedelta(days=int(min_m * 30))
                     if st.actual_date > due_date:
@@ -321,7 +312,7 @@ def vaccination_status_code(db: Session, child: Child, group: VaccinationAgeGrou
                 pending += 1
         else:
             # No explicit scheduled date recorded: fall back to schedule age_group relative to child's current group
-            min_m = _parse_recommended_min_months(getattr(sch, 'recommended_age', None)) if sch else None
+            min_m = schedule_plan(sch).min_months if sch else None
             if min_m is not None and age_months_now is not None:
                 if min_m < age_months_now:
                     delayed += 1
@@ -345,13 +336,27 @@ def vaccination_status_code(db: Session, child: Child, group: VaccinationAgeGrou
     return 0
 
 
-def illness_features(db: Session, child_id: int, days_window: int = 90) -> Dict[str, int | float]:
-    since = date.today() - timedelta(days=days_window)
-    rows: List[ChildIllnessLogModel] = (
-        db.query(ChildIllnessLogModel)
-        .filter(ChildIllnessLogModel.child_id == child_id, ChildIllnessLogModel.created_at >= since)
+def vaccination_status_code(db: Session, child: Child, group: VaccinationAgeGroupEnum) -> int:
+    """Compute vaccination status from CORE vaccines with timing.
+    Returns: 0=Up-to-date, 1=Partial, 2=Delayed
+    Logic:
+      - Delayed if any CORE dose is overdue (scheduled_date < today) and not COMPLETED.
+      - Up-to-date if all CORE doses are COMPLETED and no overdue exists.
+      - Partial otherwise (some completed, none overdue yet).
+    """
+    rows = (
+        db.query(ChildVaccineStatusModel, VaccinationScheduleModel)
+        .join(VaccinationScheduleModel, VaccinationScheduleModel.id == ChildVaccineStatusModel.schedule_id)
+        .filter(
+            ChildVaccineStatusModel.child_id == child.child_id,
+            VaccinationScheduleModel.category == VaccineCategoryEnum.CORE,
+        )
         .all()
     )
+    return vaccination_status_from_rows(child, group, rows)
+
+
+def illness_features_from_rows(rows: List[ChildIllnessLogModel], days_window: int = 90) -> Dict[str, int | float]:
     fever = sum(1 for r in rows if r.fever)
     cold = sum(1 for r in rows if r.cold)
     diarrhea = sum(1 for r in rows if r.diarrhea)
@@ -365,9 +370,19 @@ def illness_features(db: Session, child_id: int, days_window: int = 90) -> Dict[
     }
 
 
+def illness_features(db: Session, child_id: int, days_window: int = 90) -> Dict[str, int | float]:
+    since = date.today() - timedelta(days=days_window)
+    rows: List[ChildIllnessLogModel] = (
+        db.query(ChildIllnessLogModel)
+        .filter(ChildIllnessLogModel.child_id == child_id, ChildIllnessLogModel.created_at >= since)
+        .all()
+    )
+    return illness_features_from_rows(rows, days_window)
+
+
 # -------- Validation and feature building per group --------
 
-def required_fields_for_all(child: Child, db: Session) -> Tuple[List[str], Dict[str, Any]]:
+def required_fields_from_anthro(child: Child, anth: Optional[ChildAnthropometryModel]) -> Tuple[List[str], Dict[str, Any]]:
     missing: List[str] = []
     base: Dict[str, Any] = {}
 
@@ -376,7 +391,6 @@ def required_fields_for_all(child: Child, db: Session) -> Tuple[List[str], Dict[
     if child.gender is None:
         missing.append("gender")
 
-    anth = latest_anthro(db, child.child_id)
     if anth is None:
         missing.extend(["anthropometry.height_cm", "anthropometry.weight_kg"])
         anth_data = {}
@@ -402,14 +416,91 @@ def required_fields_for_all(child: Child, db: Session) -> Tuple[List[str], Dict[
     return missing, base
 
 
-def build_features_for_group(db: Session, child: Child, group: VaccinationAgeGroupEnum) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+def required_fields_for_all(child: Child, db: Session) -> Tuple[List[str], Dict[str, Any]]:
+    return required_fields_from_anthro(child, latest_anthro(db, child.child_id))
+
+
+# Milestone flags: 1 = archived (achieved_date present), 0 = not archived.
+MILESTONE_FEATURES_BY_GROUP: Dict[VaccinationAgeGroupEnum, List[str]] = {
+    VaccinationAgeGroupEnum.INFANT: ["milestone_smile", "milestone_roll", "milestone_sit"],
+    VaccinationAgeGroupEnum.TODDLER: ["milestones_language", "milestones_walking"],
+    VaccinationAgeGroupEnum.PRESCHOOL: ["milestone_speech_clarity", "milestone_social_play"],
+    VaccinationAgeGroupEnum.SCHOOL_AGE: ["milestone_learning_skill", "milestone_social_skill"],
+}
+
+
+def milestone_feature_ids(group_milestones: List[ChildMilestoneModel], expected_codes: List[str]) -> Dict[str, List[int]]:
+    """Map each expected milestone feature code to the milestone IDs in the DB that represent it."""
+    def _norm(s: Optional[str]) -> str:
+        return (s or "").strip().lower().replace(" ", "_")
+    feature_to_ids: Dict[str, List[int]] = {code: [] for code in expected_codes}
+    for m in group_milestones:
+        code = (m.milestone_code or "").strip()
+        code_l = code.lower()
+        name_norm = _norm(m.milestone_name)
+        subs = {_norm(getattr(m, f"sub_feature_{i}", None)) for i in range(1,4)}
+        # direct exact code match to expected feature names
+        if code in expected_codes:
+            feature_to_ids[code].append(m.id)
+            continue
+        # exact match by normalized name or sub_features to expected code
+        for feat in expected_codes:
+            feat_norm = _norm(feat)
+            if feat_norm == name_norm or feat_norm in subs or feat_norm == code_l:
+                feature_to_ids[feat].append(m.id)
+                break
+        else:
+            # keyword heuristics
+            keywords = {
+                "milestone_smile": ["smile"],
+                "milestone_roll": ["roll"],
+                "milestone_sit": ["sit"],
+                "milestones_language": ["language"],
+                "milestones_walking": ["walk"],
+                "milestone_speech_clarity": ["speech", "clarity"],
+                "milestone_social_play": ["social", "play"],
+                "milestone_learning_skill": ["learning"],
+                "milestone_social_skill": ["social", "skill"],
+            }
+            for feat, keys in keywords.items():
+                if feat in expected_codes and all(k in name_norm for k in keys):
+                    feature_to_ids[feat].append(m.id)
+                    break
+    return feature_to_ids
+
+
+@dataclass
+class FeatureInputs:
+    """Everything build_features_from_inputs needs about one child, already loaded.
+
+    build_features_for_group fills it with per-child queries; batch jobs fill it
+    for a whole chunk of children with set-wise queries.
+    """
+    latest_anthro: Optional[ChildAnthropometryModel] = None
+    trend_rows: List[ChildAnthropometryModel] = field(default_factory=list)
+    meal_logs: List[ChildMealLogModel] = field(default_factory=list)
+    illness_rows: List[ChildIllnessLogModel] = field(default_factory=list)
+    core_vaccine_rows: List[Tuple[ChildVaccineStatusModel, VaccinationScheduleModel]] = field(default_factory=list)
+    has_vaccine_data: bool = False
+    achieved_milestone_ids: Optional[set] = None
+    has_milestone_data: bool = False
+
+
+def build_features_from_inputs(
+    child: Child,
+    group: VaccinationAgeGroupEnum,
+    inputs: FeatureInputs,
+    *,
+    feature_to_ids: Optional[Dict[str, List[int]]],
+    food_meta: FoodMeta,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     today = date.today()
-    missing, base = required_fields_for_all(child, db)
+    missing, base = required_fields_from_anthro(child, inputs.latest_anthro)
 
     ages = age_fields(child.date_of_birth, today) if child.date_of_birth else {"age_days": None, "age_months": None, "age_years": None}
-    avg_gain, vel, n_points = trend_anthro(db, child.child_id)
-    feed = feeding_features(db, child.child_id, group)
-    ill = illness_features(db, child.child_id)
+    avg_gain, vel, n_points = trend_anthro_from_rows(inputs.trend_rows)
+    feed = feeding_features_from_logs(inputs.meal_logs, group, food_meta)
+    ill = illness_features_from_rows(inputs.illness_rows)
 
     # new vs existing child
     is_existing = 1 if n_points >= 2 else 0
@@ -422,7 +513,7 @@ def build_features_for_group(db: Session, child: Child, group: VaccinationAgeGro
         "weight_velocity": round(to_float(vel) or 0.0, 3),
         "feeding_type": feed["feeding_type"],
         "feeding_frequency": feed["feeding_frequency"],
-        "vaccination_status": vaccination_status_code(db, child, group),
+        "vaccination_status": vaccination_status_from_rows(child, group, inputs.core_vaccine_rows),
         **ill,
     }
     features.update(base)
@@ -472,71 +563,15 @@ def build_features_for_group(db: Session, child: Child, group: VaccinationAgeGro
     features["height_zscore"] = round(h_z, 3)
 
     # Milestone flags: 1 = archived (achieved_date present), 0 = not archived. Use DB linkage.
-    milestone_map_by_group = {
-        VaccinationAgeGroupEnum.INFANT: ["milestone_smile", "milestone_roll", "milestone_sit"],
-        VaccinationAgeGroupEnum.TODDLER: ["milestones_language", "milestones_walking"],
-        VaccinationAgeGroupEnum.PRESCHOOL: ["milestone_speech_clarity", "milestone_social_play"],
-        VaccinationAgeGroupEnum.SCHOOL_AGE: ["milestone_learning_skill", "milestone_social_skill"],
-    }
-    expected_codes = milestone_map_by_group.get(group, [])
+    expected_codes = MILESTONE_FEATURES_BY_GROUP.get(group, [])
     milestone_flags: Dict[str, int] = {code: 0 for code in expected_codes}
-    try:
-        # Fetch milestones in current group
-        group_milestones: List[ChildMilestoneModel] = (
-            db.query(ChildMilestoneModel)
-            .filter(ChildMilestoneModel.category == group)
-            .all()
-        )
-        # Build mapping from expected feature code -> list of milestone IDs in DB
-        def _norm(s: Optional[str]) -> str:
-            return (s or "").strip().lower().replace(" ", "_")
-        feature_to_ids: Dict[str, List[int]] = {code: [] for code in expected_codes}
-        for m in group_milestones:
-            code = (m.milestone_code or "").strip()
-            code_l = code.lower()
-            name_norm = _norm(m.milestone_name)
-            subs = {_norm(getattr(m, f"sub_feature_{i}", None)) for i in range(1,4)}
-            # direct exact code match to expected feature names
-            if code in expected_codes:
-                feature_to_ids[code].append(m.id)
-                continue
-            # exact match by normalized name or sub_features to expected code
-            for feat in expected_codes:
-                feat_norm = _norm(feat)
-                if feat_norm == name_norm or feat_norm in subs or feat_norm == code_l:
-                    feature_to_ids[feat].append(m.id)
-                    break
-            else:
-                # keyword heuristics
-                keywords = {
-                    "milestone_smile": ["smile"],
-                    "milestone_roll": ["roll"],
-                    "milestone_sit": ["sit"],
-                    "milestones_language": ["language"],
-                    "milestones_walking": ["walk"],
-                    "milestone_speech_clarity": ["speech", "clarity"],
-                    "milestone_social_play": ["social", "play"],
-                    "milestone_learning_skill": ["learning"],
-                    "milestone_social_skill": ["social", "skill"],
-                }
-                for feat, keys in keywords.items():
-                    if feat in expected_codes and all(k in name_norm for k in keys):
-                        feature_to_ids[feat].append(m.id)
-                        break
-        # Fetch all statuses for this child once
-        status_rows: List[ChildMilestoneStatusModel] = (
-            db.query(ChildMilestoneStatusModel)
-            .filter(ChildMilestoneStatusModel.child_id == child.child_id)
-            .all()
-        )
+    if feature_to_ids is not None and inputs.achieved_milestone_ids is not None:
         # Consider any status row as archived presence per your app's semantics
-        achieved_ids = {r.milestone_id for r in status_rows}
+        achieved_ids = inputs.achieved_milestone_ids
         # Assign flags per expected feature
         for feat in expected_codes:
             ids = feature_to_ids.get(feat, [])
             milestone_flags[feat] = 1 if any(mid in achieved_ids for mid in ids) else 0
-    except Exception:
-        pass
     features.update(milestone_flags)
 
     # Presence hints (not fed into model unless needed by feature names)
@@ -545,26 +580,6 @@ def build_features_for_group(db: Session, child: Child, group: VaccinationAgeGro
         "has_recent_illness_logs": ill["has_recent_illness_logs"],
     }
 
-    # Check if any vaccination data exists for this child
-    try:
-        has_vaccine_data = bool(
-            db.query(ChildVaccineStatusModel)
-            .filter(ChildVaccineStatusModel.child_id == child.child_id)
-            .first()
-        )
-    except Exception:
-        has_vaccine_data = False
-
-    # Check if any milestone status data exists for this child
-    try:
-        has_milestone_data = bool(
-            db.query(ChildMilestoneStatusModel)
-            .filter(ChildMilestoneStatusModel.child_id == child.child_id)
-            .first()
-        )
-    except Exception:
-        has_milestone_data = False
-
     # Required missing gating rule:
     # - core demographics/anthropometry
     # - at least one meal log in the last 7 days
@@ -577,9 +592,9 @@ def build_features_for_group(db: Session, child: Child, group: VaccinationAgeGro
         required_missing.append("meal_logs_last_7_days")
     if not presence["has_recent_illness_logs"]:
         required_missing.append("illness_logs_last_90_days")
-    if not has_vaccine_data:
+    if not inputs.has_vaccine_data:
         required_missing.append("vaccination.core_status")
-    if not has_milestone_data:
+    if not inputs.has_milestone_data:
         required_missing.append("milestones.current_group_status")
     if features.get("sleep_hours") is None:
         required_missing.append("anthropometry.avg_sleep_hours_per_day")
@@ -598,14 +613,316 @@ def build_features_for_group(db: Session, child: Child, group: VaccinationAgeGro
     }
 
 
+def build_features_for_group(db: Session, child: Child, group: VaccinationAgeGroupEnum) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    today = date.today()
+    inputs = FeatureInputs(latest_anthro=latest_anthro(db, child.child_id))
+    inputs.trend_rows = (
+        db.query(ChildAnthropometryModel)
+        .filter(
+            ChildAnthropometryModel.child_id == child.child_id,
+            ChildAnthropometryModel.log_date >= today - timedelta(days=6 * 30),
+        )
+        .order_by(ChildAnthropometryModel.log_date.asc())
+        .all()
+    )
+    inputs.meal_logs = crud.list_child_meal_logs_between(db, child_id=child.child_id, start_date=today - timedelta(days=7), end_date=today)
+    inputs.illness_rows = (
+        db.query(ChildIllnessLogModel)
+        .filter(ChildIllnessLogModel.child_id == child.child_id, ChildIllnessLogModel.created_at >= today - timedelta(days=90))
+        .all()
+    )
+    inputs.core_vaccine_rows = (
+        db.query(ChildVaccineStatusModel, VaccinationScheduleModel)
+        .join(VaccinationScheduleModel, VaccinationScheduleModel.id == ChildVaccineStatusModel.schedule_id)
+        .filter(
+            ChildVaccineStatusModel.child_id == child.child_id,
+            VaccinationScheduleModel.category == VaccineCategoryEnum.CORE,
+        )
+        .all()
+    )
+
+    feature_to_ids: Optional[Dict[str, List[int]]] = None
+    try:
+        # Fetch milestones in current group
+        group_milestones: List[ChildMilestoneModel] = (
+            db.query(ChildMilestoneModel)
+            .filter(ChildMilestoneModel.category == group)
+            .all()
+        )
+        feature_to_ids = milestone_feature_ids(group_milestones, MILESTONE_FEATURES_BY_GROUP.get(group, []))
+        # Fetch all statuses for this child once
+        status_rows: List[ChildMilestoneStatusModel] = (
+            db.query(ChildMilestoneStatusModel)
+            .filter(ChildMilestoneStatusModel.child_id == child.child_id)
+            .all()
+        )
+        inputs.achieved_milestone_ids = {r.milestone_id for r in status_rows}
+    except Exception:
+        feature_to_ids = None
+
+    # Check if any vaccination data exists for this child
+    try:
+        inputs.has_vaccine_data = bool(
+            db.query(ChildVaccineStatusModel)
+            .filter(ChildVaccineStatusModel.child_id == child.child_id)
+            .first()
+        )
+    except Exception:
+        inputs.has_vaccine_data = False
+
+    # Check if any milestone status data exists for this child
+    try:
+        inputs.has_milestone_data = bool(
+            db.query(ChildMilestoneStatusModel)
+            .filter(ChildMilestoneStatusModel.child_id == child.child_id)
+            .first()
+        )
+    except Exception:
+        inputs.has_milestone_data = False
+
+    return build_features_from_inputs(
+        child,
+        group,
+        inputs,
+        feature_to_ids=feature_to_ids,
+        food_meta=_food_meta_from_db(db),
+    )
+
+
 def dataframe_for_model(features: Dict[str, Any], expected_columns: List[str]) -> pd.DataFrame:
     # Build a single-row DataFrame with all expected columns in order, fill None/NaN with 0
-    row = {c: (0 if features.get(c) is None or (isinstance(features.get(c), float) and np.isnan(features.get(c))) else features.get(c)) for c in expected_columns}
-    df = pd.DataFrame([row])
+    return dataframe_for_models([features], expected_columns)
+
+
+def dataframe_for_models(rows: List[Dict[str, Any]], expected_columns: List[str]) -> pd.DataFrame:
+    # Same as dataframe_for_model for many children at once (one row per feature dict)
+    data = [
+        {c: (0 if r.get(c) is None or (isinstance(r.get(c), float) and np.isnan(r.get(c))) else r.get(c)) for c in expected_columns}
+        for r in rows
+    ]
+    df = pd.DataFrame(data, columns=expected_columns)
     df = df.fillna(0)
     return df
 
 
+def predict_frame(models: Dict[str, Any], df: pd.DataFrame, targets: List[str]) -> List[Dict[str, Any]]:
+    """Run every target model over all rows of df and apply the shared output clipping."""
+    preds: List[Dict[str, Any]] = [{} for _ in range(len(df))]
+    if len(df) == 0:
+        return preds
+    for target, model in models.items():
+        ys = model.predict(df)
+        for out, y in zip(preds, ys):
+            if target == "nutrition_flag":
+                out[target] = int(round(float(y)))
+            elif target == "growth_percentile":
+                out[target] = clip_float(float(y), 0.0, 100.0)
+            else:
+                out[target] = clip_float(float(y), 0.0, 1.0)
+    # Fill absent targets as None for consistency
+    for out in preds:
+        for t in targets:
+            out.setdefault(t, None)
+    return preds
+
+
+# -------- Prediction report rows --------
+
+# Feature columns persisted on ChildPredictionReport (training/retraining snapshot)
+REPORT_FEATURE_FIELDS: List[str] = [
+    "is_existing",
+    "age_days",
+    "age_months",
+    "age_years",
+    "sex",
+    "weight_kg",
+    "height_cm",
+    "muac_cm",
+    "bmi",
+    "weight_zscore",
+    "height_zscore",
+    "feeding_type",
+    "feeding_frequency",
+    "vaccination_status",
+    "sleep_hours",
+    "illness_fever",
+    "illness_cold",
+    "illness_diarrhea",
+    "milestone_smile",
+    "milestone_roll",
+    "milestone_sit",
+    "milestones_language",
+    "milestones_walking",
+    "milestone_speech_clarity",
+    "milestone_social_play",
+    "milestone_learning_skill",
+    "milestone_social_skill",
+    "avg_weight_gain",
+    "weight_velocity",
+    "illness_freq_trend",
+]
+
+REPORT_PREDICTION_FIELDS: List[str] = [
+    "growth_percentile",
+    "nutrition_flag",
+    "prob_fever",
+    "prob_cold",
+    "prob_diarrhea",
+    "milestone_sit_delay_prob",
+    "milestones_language_delay_prob",
+    "milestones_walking_delay_prob",
+    "milestone_speech_delay_prob",
+    "milestone_social_play_delay_prob",
+    "milestone_learning_delay_prob",
+    "milestone_social_skill_delay_prob",
+]
+
+# If a milestone is already archived (flag = 1), its delay probability is dropped
+MILESTONE_FLAG_TO_PROB: Dict[str, str] = {
+    "milestone_sit": "milestone_sit_delay_prob",
+    "milestones_language": "milestones_language_delay_prob",
+    "milestones_walking": "milestones_walking_delay_prob",
+    "milestone_speech_clarity": "milestone_speech_delay_prob",
+    "milestone_social_play": "milestone_social_play_delay_prob",
+    "milestone_learning_skill": "milestone_learning_delay_prob",
+    "milestone_social_skill": "milestone_social_skill_delay_prob",
+}
+
+
+def finalize_predictions(features: Dict[str, Any], preds: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop delay probabilities for achieved milestones and round scores to 3 decimals."""
+    preds = dict(preds)
+    for flag_field, prob_field in MILESTONE_FLAG_TO_PROB.items():
+        try:
+            if features.get(flag_field) == 1:
+                preds[prob_field] = None
+        except Exception:
+            # If anything goes wrong, fail silently and keep existing value
+            continue
+
+    def _round_pred_value(name: str, value):
+        if value is None:
+            return None
+        # Integers (e.g., nutrition_flag) are left as-is
+        if name == "nutrition_flag":
+            return value
+        # Main probability / score outputs -> 3 decimals
+        if name in REPORT_PREDICTION_FIELDS:
+            try:
+                return round(float(value), 3)
+            except (TypeError, ValueError):
+                return value
+        return value
+
+    return {k: _round_pred_value(k, v) for k, v in preds.items()}
+
+
+def prediction_report_values(
+    child_id: int,
+    group: VaccinationAgeGroupEnum,
+    features: Dict[str, Any],
+    preds: Dict[str, Any],
+    feature_hash: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Column values for one ChildPredictionReport row (usable for ORM or bulk insert)."""
+    values: Dict[str, Any] = {"child_id": child_id, "age_group": group}
+    for name in REPORT_FEATURE_FIELDS:
+        values[name] = features.get(name)
+    for name in REPORT_PREDICTION_FIELDS:
+        values[name] = preds.get(name)
+    values["feature_hash"] = feature_hash
+    return values
+
+
+# -------- Feature fingerprint (prediction reuse) --------
+
+# Inputs that should trigger a re-prediction if changed: the full model input
+# vector, age features included (the models read age_days/age_months/age_years,
+# so a report is only reusable for the same age as well as the same state)
+CHANGE_SENSITIVE_FIELDS: List[str] = list(REPORT_FEATURE_FIELDS)
+
+# Bump when the canonical form below changes so old hashes stop matching
+FEATURE_HASH_VERSION = 2
+
+MODEL_FOLDERS: Dict[VaccinationAgeGroupEnum, str] = {
+    VaccinationAgeGroupEnum.INFANT: "infant",
+    VaccinationAgeGroupEnum.TODDLER: "toddler",
+    VaccinationAgeGroupEnum.PRESCHOOL: "preschool",
+    VaccinationAgeGroupEnum.SCHOOL_AGE: "schoolage",
+}
+
+# (path, mtime_ns, size) -> sha256 of file contents; a replaced model file gets a
+# new stat key and is re-digested, so the fingerprint follows model changes.
+_model_digest_cache: Dict[Tuple[str, int, int], str] = {}
+
+
+def _file_digest(path: str) -> Optional[str]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (path, st.st_mtime_ns, st.st_size)
+    digest = _model_digest_cache.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _model_digest_cache[key] = digest
+    return digest
+
+
+def model_fingerprint(group: VaccinationAgeGroupEnum) -> str:
+    """Digest of every model file in the group's folder (names + contents)."""
+    folder = os.path.join(settings.MODELS_DIR, MODEL_FOLDERS.get(group, str(group.value)))
+    h = hashlib.sha256()
+    try:
+        names = sorted(os.listdir(folder))
+    except OSError:
+        names = []
+    for name in names:
+        digest = _file_digest(os.path.join(folder, name))
+        if digest is None:
+            continue
+        h.update(name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(digest.encode("ascii"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def _canonical_feature_value(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return int(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        v = float(value)
+        if math.isnan(v) or math.isinf(v):
+            return None
+        # 6 decimals absorbs float noise between the DB round trip and fresh builds
+        return round(v, 6)
+    return str(getattr(value, "value", value))
+
+
+def feature_fingerprint(group: VaccinationAgeGroupEnum, features: Dict[str, Any]) -> str:
+    """Stable sha256 of the model input features, age group and model files.
+
+    Every field the models read (ages included) is hashed, so two builds with
+    the same fingerprint feed identical inputs to identical models and an
+    existing report with this hash can be reused instead of re-running them.
+    """
+    payload = {
+        "v": FEATURE_HASH_VERSION,
+        "age_group": group.value,
+        "models": model_fingerprint(group),
+        "features": {name: _canonical_feature_value(features.get(name)) for name in CHANGE_SENSITIVE_FIELDS},
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
 # -------- WHO/CDC LMS utilities --------
 
 @lru_cache(maxsize=1)
@@ -692,6 +1009,24 @@ def _z_from_lms(x: Optional[float], L: float, M: float, S: float) -> Optional[fl
     return float(((x / M) ** L - 1.0) / (L * S))
 
 
+def value_from_lms(z: float, L: float, M: float, S: float) -> float:
+    """Inverse of _z_from_lms: the measurement at z-score z."""
+    if L == 0:
+        return float(M * np.exp(S * z))
+    return float(M * (1.0 + L * S * z) ** (1.0 / L))
+
+
+def lms_params(measure: str, sex_code: int, agemos: float) -> Optional[Tuple[float, float, float]]:
+    """LMS for "weight" or "height" at agemos: WHO below 24 months, CDC from 24 (sex_code as sex_to_int)."""
+    sex = 1 if sex_code == 0 else 2
+    src = _load_lms_sources()
+    if agemos < 24.0:
+        table = src["who_wfa"] if measure == "weight" else src["who_lfa"]
+    else:
+        table = src["cdc_wfa"] if measure == "weight" else src["cdc_hfa"]
+    return _interp_lms(table, sex, agemos)
+
+
 def compute_who_zscores(
     sex_code: int,
     age_days: Optional[int],
@@ -700,20 +1035,14 @@ def compute_who_zscores(
     height_cm: Optional[float],
 ) -> Tuple[float, float]:
     try:
-        sex = 1 if sex_code == 0 else 2
         if age_months is not None:
             agemos = float(age_months)
         elif age_days is not None:
             agemos = float(age_days) / 30.0
         else:
             return 0.0, 0.0
-        src = _load_lms_sources()
-        if agemos < 24.0:
-            w_lms = _interp_lms(src["who_wfa"], sex, agemos)
-            h_lms = _interp_lms(src["who_lfa"], sex, agemos)
-        else:
-            w_lms = _interp_lms(src["cdc_wfa"], sex, agemos)
-            h_lms = _interp_lms(src["cdc_hfa"], sex, agemos)
+        w_lms = lms_params("weight", sex_code, agemos)
+        h_lms = lms_params("height", sex_code, agemos)
         wz = _z_from_lms(weight_kg, *w_lms) if w_lms else None
         hz = _z_from_lms(height_cm, *h_lms) if h_lms else None
         return float(wz) if wz is not None and np.isfinite(wz) else 0.0, float(hz) if hz is not None and np.isfinite(hz) else 0.0
@@ -5,7 +5,7 @@ import pandas as pd
 
 from app.core.config import settings
 from app.schemas.schemas import VaccinationAgeGroupEnum
-from app.services.prediction_common import model_cache, dataframe_for_model, clip_float
+from app.services.prediction_common import model_cache, dataframe_for_models, predict_frame
 
 # Targets and filenames for infant
 INFANT_MODELS: Dict[str, str] = {
@@ -55,20 +55,10 @@ def _load_infant_models() -> Dict[str, Any]:
 
 
 def predict_infant(features: Dict[str, Any]) -> Dict[str, Any]:
-    df = dataframe_for_model(features, INFANT_FEATURES)
-    models = _load_infant_models()
-    preds: Dict[str, Any] = {}
+    return predict_infant_batch([features])[0]
 
-    for target, model in models.items():
-        y = model.predict(df)[0]
-        if target == "nutrition_flag":
-            preds[target] = int(round(float(y)))
-        elif target == "growth_percentile":
-            preds[target] = clip_float(float(y), 0.0, 100.0)
-        else:
-            preds[target] = clip_float(float(y), 0.0, 1.0)
-    # Note: missing targets left out
-    # Fill absent targets as None for consistency
-    for t in INFANT_MODELS.keys():
-        preds.setdefault(t, None)
-    return preds
+
+def predict_infant_batch(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    df = dataframe_for_models(rows, INFANT_FEATURES)
+    # Missing model files leave their targets as None
+    return predict_frame(_load_infant_models(), df, list(INFANT_MODELS.keys()))
@@ -4,7 +4,7 @@ import numpy as np
 import pandas as pd
 
 from app.core.config import settings
-from app.services.prediction_common import model_cache, dataframe_for_model, clip_float
+from app.services.prediction_common import model_cache, dataframe_for_models, predict_frame
 
 SCHOOLAGE_MODELS: Dict[str, str] = {
     "growth_percentile": "schoolage_growth_percentile_xgb_model.pkl",
@@ -53,18 +53,10 @@ def _load_schoolage_models() -> Dict[str, Any]:
 
 
 def predict_schoolage(features: Dict[str, Any]) -> Dict[str, Any]:
-    df = dataframe_for_model(features, SCHOOLAGE_FEATURES)
-    models = _load_schoolage_models()
-    preds: Dict[str, Any] = {}
+    return predict_schoolage_batch([features])[0]
 
-    for target, model in models.items():
-        y = model.predict(df)[0]
-        if target == "nutrition_flag":
-            preds[target] = int(round(float(y)))
-        elif target == "growth_percentile":
-            preds[target] = clip_float(float(y), 0.0, 100.0)
-        else:
-            preds[target] = clip_float(float(y), 0.0, 1.0)
-    for t in SCHOOLAGE_MODELS.keys():
-        preds.setdefault(t, None)
-    return preds
+
+def predict_schoolage_batch(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    df = dataframe_for_models(rows, SCHOOLAGE_FEATURES)
+    # Missing model files leave their targets as None
+    return predict_frame(_load_schoolage_models(), df, list(SCHOOLAGE_MODELS.keys()))
@@ -0,0 +1,273 @@
+"""In-memory index of NutritionRecipe rows for the weekly nutrition summary.
+
+The weekly summary used to load every recipe in the child's age window on
+each call, then re-run the texture/keyword safety checks and split
+secondary_nutrients for each of them. This index does that work once per
+recipe set:
+
+- recipes are partitioned by age-month segment (the age bands' boundaries
+  plus the safety tier boundaries at 7, 12 and 36 months), then by primary
+  nutrient
+- each partition holds only recipes that are safe for its tier, pre-sorted by
+  the most they can add to a score (meal-type, overlap and energy bonuses)
+- secondary nutrients and the response payload are parsed once
+
+A recommendation is a bounded top-k walk over the partitions of the child's
+deficit nutrients, followed by a merge.
+
+The index is rebuilt in-process by seed_nutrition_recipes. Other workers
+pick up changes through TableSnapshot's stamp check.
+"""
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.table_snapshot import TableSnapshot
+from app.models.models import NutritionRecipe
+
+MILK_KEYWORDS = (
+    "breastmilk",
+    "breast milk",
+    "breast-feeding",
+    "breastfeeding",
+    "mother's milk",
+    "mothers milk",
+    "human milk",
+    "infant formula",
+    "baby formula",
+    "formula milk",
+)
+INFANT_BANNED_WORDS = (
+    "honey",
+    "whole nut",
+    "whole nuts",
+    "peanut",
+    "groundnut",
+    "almond",
+    "cashew",
+    "pista",
+    "walnut",
+    "fried",
+    "deep fry",
+    "deep-fried",
+)
+
+# Safety tiers: 0-6 months, 7-11, 12-35, 36+
+TIER_STARTS = (0, 7, 12, 36)
+
+PREFERRED_MEALS = {
+    "energy_kcal": ("lunch", "dinner"),
+    "protein_g": ("lunch",),
+    "calcium_mg": ("breakfast", "snack"),
+    "vitamin_c_mg": ("snack",),
+    "vitamin_a_mcg": ("lunch",),
+    "fat_g": ("lunch", "dinner"),
+}
+PREFERRED_MEAL_BONUS = 5.0
+ENERGY_BONUS_HIGH = 10.0
+ENERGY_BONUS = 5.0
+
+
+def safety_tier(age_months: int) -> int:
+    return bisect_right(TIER_STARTS, age_months) - 1 if age_months >= 0 else 0
+
+
+def is_recipe_safe(texture: Optional[str], text: str, tier: int) -> bool:
+    """Texture and ingredient rules per tier; `text` is lowercased ingredients + name."""
+    tx = (texture or "").lower().strip()
+    if tier == 0:
+        if tx not in ("liquid", "soft"):
+            return False
+        if not any(k in text for k in MILK_KEYWORDS):
+            return False
+        return not any(w in text for w in INFANT_BANNED_WORDS)
+    if tier == 1:
+        if tx not in ("liquid", "soft"):
+            return False
+        return not any(w in text for w in INFANT_BANNED_WORDS)
+    if tier == 2:
+        return tx in ("soft", "semi-solid")
+    return True
+
+
+def parse_secondary(text: Optional[str]) -> List[str]:
+    return [x.strip() for x in (text or "").split(",") if x.strip()]
+
+
+@dataclass(frozen=True)
+class IndexedRecipe:
+    id: int
+    age_min_months: int
+    age_max_months: int
+    primary: str
+    secondary: Tuple[str, ...]
+    meal_bonus: float
+    energy_high: bool
+    safe: Tuple[bool, ...]  # per safety tier
+    payload: Dict[str, Any]
+
+    @property
+    def ceiling(self) -> float:
+        """Highest score this recipe can add on top of the deficit severity."""
+        bonus = self.meal_bonus + len(self.secondary)
+        if self.primary == "energy_kcal":
+            bonus += ENERGY_BONUS_HIGH if self.energy_high else ENERGY_BONUS
+        return bonus
+
+    @classmethod
+    def from_row(cls, r: NutritionRecipe) -> "IndexedRecipe":
+        primary = (r.primary_nutrient or "").strip()
+        secondary = parse_secondary(r.secondary_nutrients)
+        text = ((r.ingredients or "") + " " + (r.recipe_name or "")).lower()
+        meal = (r.meal_type or "").lower().strip()
+        return cls(
+            id=r.id,
+            age_min_months=r.age_min_months,
+            age_max_months=r.age_max_months,
+            primary=primary,
+            secondary=tuple(secondary),
+            meal_bonus=PREFERRED_MEAL_BONUS if meal in PREFERRED_MEALS.get(primary, ()) else 0.0,
+            energy_high=bool(r.energy_density) and r.energy_density.lower() == "high",
+            safe=tuple(is_recipe_safe(r.texture, text, tier) for tier in range(len(TIER_STARTS))),
+            payload={
+                "id": r.id,
+                "recipe_code": r.recipe_code,
+                "recipe_name": r.recipe_name,
+                "veg_nonveg": r.veg_nonveg,
+                "primary_nutrient": r.primary_nutrient,
+                "secondary_nutrients": secondary,
+                "energy_density": r.energy_density,
+                "meal_type": r.meal_type,
+                "texture": r.texture,
+                "ingredients": r.ingredients,
+                "instructions": r.instructions,
+                "prep_time_mins": r.prep_time_mins,
+                "youtube_url": r.youtube_url,
+            },
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.payload, "secondary_nutrients": list(self.secondary)}
+
+
+class RecipeIndex:
+    def __init__(self, recipes: Iterable[IndexedRecipe]) -> None:
+        recipes = [r for r in recipes if r.primary]
+        bounds = set(TIER_STARTS)
+        for r in recipes:
+            bounds.add(r.age_min_months)
+            bounds.add(r.age_max_months + 1)
+        self._starts: List[int] = sorted(bounds)
+        # One {primary nutrient: recipes} map per age segment [starts[i], starts[i+1])
+        self._segments: List[Dict[str, List[IndexedRecipe]]] = []
+        for i, start in enumerate(self._starts):
+            tier = safety_tier(start)
+            by_primary: Dict[str, List[IndexedRecipe]] = {}
+            for r in recipes:
+                if r.age_min_months <= start <= r.age_max_months and r.safe[tier]:
+                    by_primary.setdefault(r.primary, []).append(r)
+            for bucket in by_primary.values():
+                bucket.sort(key=lambda r: (-r.ceiling, r.id))
+            self._segments.append(by_primary)
+        self.size = len(recipes)
+
+    def partition(self, age_months: int, primary: str) -> Sequence[IndexedRecipe]:
+        i = bisect_right(self._starts, age_months) - 1
+        if i < 0:
+            return ()
+        return self._segments[i].get(primary, ())
+
+    def _top_for_primary(
+        self,
+        bucket: Sequence[IndexedRecipe],
+        *,
+        base: float,
+        needed: Set[str],
+        excess: Set[str],
+        energy_bonus: bool,
+        k: int,
+    ) -> List[Tuple[float, int, IndexedRecipe]]:
+        # Min-heap of the k best (score, -id). A bucket is sorted by ceiling, so once the
+        # best possible remaining score cannot beat the k-th, the rest is skipped.
+        heap: List[Tuple[float, int, IndexedRecipe]] = []
+        for r in bucket:
+            if len(heap) == k and base + r.ceiling < heap[0][0]:
+                break
+            if any(n in excess for n in r.secondary):
+                continue
+            score = base + r.meal_bonus + sum(1 for n in r.secondary if n in needed)
+            if energy_bonus:
+                score += ENERGY_BONUS_HIGH if r.energy_high else ENERGY_BONUS
+            entry = (score, -r.id, r)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+        return heap
+
+    def recommend(
+        self,
+        age_months: int,
+        *,
+        severity: Dict[str, float],
+        needed: Sequence[str],
+        excess: Set[str],
+        energy_deficit_severe: bool,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Top `limit` recipes for the deficits, highest score first (ties: lowest id).
+
+        With a severe energy deficit the best energy recipe always comes first.
+        """
+        needed_set = set(needed)
+        per_primary: Dict[str, List[Tuple[float, int, IndexedRecipe]]] = {}
+        for primary in needed_set:
+            if primary in excess:
+                continue
+            base_severity = severity.get(primary, 0.0)
+            if base_severity <= 0.0:
+                continue
+            top = self._top_for_primary(
+                self.partition(age_months, primary),
+                base=base_severity * 10.0,
+                needed=needed_set,
+                excess=excess,
+                energy_bonus=energy_deficit_severe and primary == "energy_kcal",
+                k=limit,
+            )
+            per_primary[primary] = sorted(top, key=lambda e: (-e[0], -e[1]))
+
+        selected: List[IndexedRecipe] = []
+        if energy_deficit_severe and per_primary.get("energy_kcal"):
+            selected.append(per_primary["energy_kcal"][0][2])
+        selected_ids = {r.id for r in selected}
+        merged = heapq.merge(*per_primary.values(), key=lambda e: (-e[0], -e[1]))
+        for _, _, r in merged:
+            if len(selected) >= limit:
+                break
+            if r.id not in selected_ids:
+                selected.append(r)
+                selected_ids.add(r.id)
+        return [r.to_dict() for r in selected]
+
+
+def build_recipe_index(db: Session) -> RecipeIndex:
+    rows = db.query(NutritionRecipe).order_by(NutritionRecipe.id.asc()).all()
+    return RecipeIndex(IndexedRecipe.from_row(r) for r in rows)
+
+
+_snapshot: TableSnapshot[RecipeIndex] = TableSnapshot(NutritionRecipe, build_recipe_index)
+
+
+def rebuild_recipe_index(db: Session) -> RecipeIndex:
+    return _snapshot.refresh(db)
+
+
+def get_recipe_index(db: Session) -> RecipeIndex:
+    """This process's index, rebuilt when the recipe table changed."""
+    return _snapshot.get(db)
@@ -0,0 +1,221 @@
+"""Columnar export of ChildPredictionReport rows for model retraining.
+
+Rows are exported per age group with the columns in the order the models
+were trained on: `id, xact_id, child_id, created_at`, then the group's
+feature list (e.g. INFANT_FEATURES), then its targets (the keys of e.g.
+INFANT_MODELS). Missing values become NaN. Rows are read in (xact_id, id)
+commit order (app.db.commit_order) from a server-side cursor in bounded
+batches, only up to the committed horizon. The (xact_id, id) of the last
+exported row is the watermark that the next incremental export resumes
+from; reports are insert-only, so nothing below it can still appear.
+
+Parquet and Arrow IPC need `pyarrow`, which is optional. Compressed NPZ
+needs only numpy.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.pagination import keyset_after
+from app.db.commit_order import committed, committed_horizon
+from app.models.models import ChildPredictionReport
+from app.schemas.schemas import VaccinationAgeGroupEnum
+from app.services.cohort_scoring import GROUP_MODELS
+
+EXPORT_FORMATS = ("parquet", "npz")
+EXPORT_META_COLUMNS: List[str] = ["id", "xact_id", "child_id", "created_at"]
+INT_COLUMNS = ("id", "xact_id", "child_id")
+DEFAULT_BATCH_SIZE = 10_000
+WATERMARK_FILE = "watermark.json"
+
+
+def export_columns(group: VaccinationAgeGroupEnum) -> List[str]:
+    models, features = GROUP_MODELS[group]
+    return EXPORT_META_COLUMNS + list(features) + list(models.keys())
+
+
+def _column_array(name: str, values) -> np.ndarray:
+    if name == "created_at":
+        return np.array(values, dtype="datetime64[us]")
+    if name in INT_COLUMNS:
+        return np.array(values, dtype=np.int64)
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+
+
+def iter_report_batches(
+    db: Session,
+    group: VaccinationAgeGroupEnum,
+    *,
+    after: Tuple[int, int] = (0, 0),
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_rows: Optional[int] = None,
+) -> Iterator[Dict[str, np.ndarray]]:
+    """Column arrays for successive batches of the group's committed reports after (xact_id, id) `after`."""
+    names = export_columns(group)
+    horizon = committed_horizon(db)
+    stmt = (
+        select(*(getattr(ChildPredictionReport, name) for name in names))
+        .where(
+            ChildPredictionReport.age_group == group,
+            keyset_after(ChildPredictionReport.xact_id, ChildPredictionReport.id, after),
+            committed(ChildPredictionReport.xact_id, horizon),
+        )
+        .order_by(ChildPredictionReport.xact_id, ChildPredictionReport.id)
+    )
+    if max_rows is not None:
+        stmt = stmt.limit(max_rows)
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+    for rows in result.partitions():
+        columns = list(zip(*rows))
+        yield {name: _column_array(name, values) for name, values in zip(names, columns)}
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise RuntimeError("Parquet/Arrow export needs pyarrow (pip install pyarrow); use the npz format instead") from exc
+    return pyarrow
+
+
+def arrow_schema(group: VaccinationAgeGroupEnum):
+    pa = require_pyarrow()
+    fields = []
+    for name in export_columns(group):
+        if name == "created_at":
+            fields.append(pa.field(name, pa.timestamp("us")))
+        elif name in INT_COLUMNS:
+            fields.append(pa.field(name, pa.int64()))
+        else:
+            fields.append(pa.field(name, pa.float64()))
+    return pa.schema(fields, metadata={"age_group": group.value})
+
+
+def arrow_batch(group: VaccinationAgeGroupEnum, batch: Dict[str, np.ndarray]):
+    pa = require_pyarrow()
+    schema = arrow_schema(group)
+    return pa.record_batch([pa.array(batch[f.name], type=f.type) for f in schema], schema=schema)
+
+
+def npz_bytes(batch: Dict[str, np.ndarray]) -> bytes:
+    buf = io.BytesIO()
+    np.savez_compressed(buf, **batch)
+    return buf.getvalue()
+
+
+def concat_batches(batches: List[Dict[str, np.ndarray]], names: List[str]) -> Dict[str, np.ndarray]:
+    if not batches:
+        return {name: _column_array(name, []) for name in names}
+    return {name: np.concatenate([b[name] for b in batches]) for name in names}
+
+
+# -------- Incremental file exports (command) --------
+
+def batch_watermark(batch: Dict[str, np.ndarray]) -> Tuple[int, int]:
+    """(xact_id, id) of the batch's last row: where the next export resumes."""
+    return int(batch["xact_id"][-1]), int(batch["id"][-1])
+
+
+def resume_after(db: Session, mark: Dict[str, Any]) -> Tuple[int, int]:
+    """Export position stored in a watermark.json group entry."""
+    if "last_xact_id" in mark:
+        return int(mark["last_xact_id"]), int(mark["last_id"])
+    # Watermarks written before xact_id existed hold only an id: resume at that
+    # row's position (every pre-migration row shares the migration's xact_id)
+    xact_id = db.execute(
+        select(ChildPredictionReport.xact_id).where(ChildPredictionReport.id == mark["last_id"])
+    ).scalar()
+    return (xact_id if xact_id is not None else 0), int(mark["last_id"])
+
+
+def read_watermark(out_dir: str) -> Dict[str, Any]:
+    path = os.path.join(out_dir, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return {"groups": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_watermark(out_dir: str, state: Dict[str, Any]) -> None:
+    path = os.path.join(out_dir, WATERMARK_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _part_name(first_id: int, last_id: int, ext: str) -> str:
+    return f"part-{first_id:010d}-{last_id:010d}.{ext}"
+
+
+def export_group(
+    db: Session,
+    group: VaccinationAgeGroupEnum,
+    out_dir: str,
+    *,
+    fmt: str,
+    after: Tuple[int, int] = (0, 0),
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_part=None,
+) -> Dict[str, Any]:
+    """Write the group's reports after (xact_id, id) `after` under out_dir/<group>/.
+
+    Parquet: one file per run, one row group per batch. NPZ: one file per
+    batch. on_part(last, rows) is called after every completed file with the
+    (xact_id, id) of its last row, so the caller can advance the watermark.
+    Returns {"rows", "last", "files"}.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    group_dir = os.path.join(out_dir, group.value)
+    os.makedirs(group_dir, exist_ok=True)
+    rows = files = 0
+    last = after
+
+    if fmt == "npz":
+        for batch in iter_report_batches(db, group, after=after, batch_size=batch_size):
+            n = len(batch["id"])
+            last = batch_watermark(batch)
+            path = os.path.join(group_dir, _part_name(int(batch["id"][0]), last[1], "npz"))
+            with open(path + ".tmp", "wb") as f:
+                np.savez_compressed(f, **batch)
+            os.replace(path + ".tmp", path)
+            rows += n
+            files += 1
+            if on_part is not None:
+                on_part(last, n)
+        return {"rows": rows, "last": last, "files": files}
+
+    require_pyarrow()
+    import pyarrow.parquet as pq
+
+    tmp_path = os.path.join(group_dir, f".part-after-{after[0]}-{after[1]}.parquet.tmp")
+    writer = None
+    first = None
+    try:
+        for batch in iter_report_batches(db, group, after=after, batch_size=batch_size):
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, arrow_schema(group), compression="zstd")
+                first = int(batch["id"][0])
+            writer.write_batch(arrow_batch(group, batch))
+            rows += len(batch["id"])
+            last = batch_watermark(batch)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            os.remove(tmp_path)
+        raise
+    if writer is not None:
+        writer.close()
+        os.replace(tmp_path, os.path.join(group_dir, _part_name(first, last[1], "parquet")))
+        files = 1
+        if on_part is not None:
+            on_part(last, rows)
+    return {"rows": rows, "last": last, "files": files}
@@ -3,11 +3,13 @@ from __future__ import annotations
 from typing import List, Optional
 
 from fastapi import HTTPException, status, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import crud
+from app.db import crud, crud_async
+from app.db.crud_changes import record_change
 from app.models.models import ChildMedicalReport, Child as ChildModel, Parent as ParentModel
-from app.schemas.schemas import ChildMedicalReport as ChildMedicalReportSchema, ReportTypeEnum
+from app.schemas.schemas import ChangeEntityEnum, ChangeOpEnum, ChildMedicalReport as ChildMedicalReportSchema, ReportTypeEnum
 from app.services.report_crypto import ReportCryptoService, EncryptionMetadata
 from app.services.report_storage import LocalFilesystemReportStorage
 
@@ -63,6 +65,7 @@ class ChildReportService:
 
         storage_path = self._storage.save(child_id=child.child_id, report_id=db_report.report_id, data=ciphertext)
         db_report.storage_path = storage_path
+        record_change(db, ChangeEntityEnum.MEDICAL_REPORT, child_id=child.child_id, entity_id=db_report.report_id)
         db.commit()
         db.refresh(db_report)
         return ChildMedicalReportSchema.model_validate(db_report)
@@ -83,6 +86,19 @@ class ChildReportService:
         )
         return [ChildMedicalReportSchema.model_validate(r) for r in rows]
 
+    async def list_reports_async(
+        self,
+        db: AsyncSession,
+        *,
+        parent: ParentModel,
+        child_id: int,
+    ) -> List[ChildMedicalReportSchema]:
+        child = await crud_async.get_child_by_id_and_parent(db, child_id=child_id, parent_id=parent.parent_id)
+        if not child:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Child not found")
+        rows = await crud_async.list_child_reports(db, child_id=child.child_id)
+        return [ChildMedicalReportSchema.model_validate(r) for r in rows]
+
     def get_report(
         self,
         db: Session,
@@ -131,5 +147,8 @@ class ChildReportService:
     ) -> None:
         report = self.get_report(db, parent=parent, child_id=child_id, report_id=report_id)
         self._storage.delete(report.storage_path)
+        record_change(
+            db, ChangeEntityEnum.MEDICAL_REPORT, child_id=report.child_id, entity_id=report.report_id, op=ChangeOpEnum.DELETE
+        )
         db.delete(report)
         db.commit()
@@ -0,0 +1,232 @@
+"""Population-wide "which doses are due or overdue" sweep for reminders.
+
+_vaccination_summary answers this for one child with two queries and a walk
+over the schedule. Reminder sweeps ask it for every child. Here the CORE
+schedule is compiled once into a table of dose slots: (schedule, dose, age
+group, day offset from vaccine_schedule). Children are streamed in child_id
+chunks as NumPy arrays of dates of birth. For each chunk, the whole
+child x slot due-date matrix is computed at once, and ChildVaccineStatus rows
+are applied on top: completed doses are dropped and scheduled_date
+overrides the computed date.
+
+Dose rules match _vaccination_summary:
+- overdue: a dose in the child's current age group whose due date has passed
+  (exactly its missed_count)
+- due: a dose due between today and today + within_days. It can be in the
+  current or the next age group, so a child close to a group boundary is
+  reminded of both.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.models import (
+    Child,
+    ChildVaccineStatus as ChildVaccineStatusModel,
+    VaccinationSchedule as VaccinationScheduleModel,
+)
+from app.schemas.schemas import VaccinationAgeGroupEnum, VaccineCategoryEnum, VaccineStatusEnum
+from app.services.vaccine_schedule import schedule_plan
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Same order and boundaries as crud.compute_child_age_group
+AGE_GROUPS: List[VaccinationAgeGroupEnum] = [
+    VaccinationAgeGroupEnum.INFANT,
+    VaccinationAgeGroupEnum.TODDLER,
+    VaccinationAgeGroupEnum.PRESCHOOL,
+    VaccinationAgeGroupEnum.SCHOOL_AGE,
+]
+_GROUP_CODE = {group: code for code, group in enumerate(AGE_GROUPS)}
+
+_EPOCH = date(1970, 1, 1)
+
+
+class DueDose(NamedTuple):
+    child_id: int
+    parent_id: int
+    schedule_id: int
+    vaccine_name: str
+    dose_number: int
+    due_date: date
+    overdue: bool
+
+
+@dataclass(frozen=True)
+class SlotTable:
+    """One row per (CORE schedule, dose number), as parallel arrays."""
+
+    schedule_ids: np.ndarray
+    dose_numbers: np.ndarray
+    group_codes: np.ndarray
+    offsets: np.ndarray  # days from date of birth; -1 when the text has no usable age
+    vaccine_names: Tuple[str, ...]
+    # (schedule_id, dose_number) -> slot index
+    lookup: Dict[Tuple[int, int], int]
+
+    def __len__(self) -> int:
+        return len(self.schedule_ids)
+
+
+def load_slot_table(db: Session) -> SlotTable:
+    schedules = (
+        db.query(VaccinationScheduleModel)
+        .filter(VaccinationScheduleModel.category == VaccineCategoryEnum.CORE)
+        .order_by(VaccinationScheduleModel.id.asc())
+        .all()
+    )
+    schedule_ids, doses, groups, offsets, names = [], [], [], [], []
+    for sch in schedules:
+        try:
+            total = int(getattr(sch, "doses_required", None) or 1)
+        except (TypeError, ValueError):
+            total = 1
+        plan = schedule_plan(sch)
+        for dose_number in range(1, total + 1):
+            offset = plan.due_offset(dose_number)
+            schedule_ids.append(sch.id)
+            doses.append(dose_number)
+            groups.append(_GROUP_CODE[sch.age_group])
+            offsets.append(-1 if offset is None else offset)
+            names.append(sch.vaccine_name)
+    return SlotTable(
+        schedule_ids=np.asarray(schedule_ids, dtype=np.int64),
+        dose_numbers=np.asarray(doses, dtype=np.int64),
+        group_codes=np.asarray(groups, dtype=np.int8),
+        offsets=np.asarray(offsets, dtype=np.int64),
+        vaccine_names=tuple(names),
+        lookup={(s, d): i for i, (s, d) in enumerate(zip(schedule_ids, doses))},
+    )
+
+
+def _day_numbers(values) -> np.ndarray:
+    return np.fromiter(((d - _EPOCH).days for d in values), dtype=np.int64)
+
+
+def age_group_codes(dob_days: np.ndarray, today: date) -> np.ndarray:
+    years = (_day_numbers([today])[0] - dob_days) / 365.25
+    return np.select([years < 1, years < 4, years <= 6], [0, 1, 2], default=3).astype(np.int8)
+
+
+def _iter_child_arrays(db: Session, chunk_size: int, after_child_id: int) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    last_id = after_child_id
+    while True:
+        rows = db.execute(
+            select(Child.child_id, Child.parent_id, Child.date_of_birth)
+            .where(Child.child_id > last_id)
+            .order_by(Child.child_id.asc())
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        child_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        parent_ids = np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows))
+        yield child_ids, parent_ids, _day_numbers(r[2] for r in rows)
+        last_id = int(child_ids[-1])
+
+
+def _apply_status_rows(
+    db: Session,
+    slots: SlotTable,
+    child_ids: np.ndarray,
+    due: np.ndarray,
+    known: np.ndarray,
+    done: np.ndarray,
+) -> None:
+    # Chunks are contiguous in child_id, so a range scan replaces a huge IN (...)
+    rows = db.execute(
+        select(
+            ChildVaccineStatusModel.child_id,
+            ChildVaccineStatusModel.schedule_id,
+            ChildVaccineStatusModel.dose_number,
+            ChildVaccineStatusModel.status,
+            ChildVaccineStatusModel.scheduled_date,
+            ChildVaccineStatusModel.actual_date,
+        ).where(
+            ChildVaccineStatusModel.child_id >= int(child_ids[0]),
+            ChildVaccineStatusModel.child_id <= int(child_ids[-1]),
+        )
+    ).all()
+    # Last row per (child, dose) wins, like the status_map dict in _vaccination_summary
+    latest: Dict[Tuple[int, int], Tuple[bool, int]] = {}
+    for child_id, schedule_id, dose_number, status, scheduled_date, actual_date in rows:
+        slot = slots.lookup.get((schedule_id, dose_number))
+        if slot is None:
+            continue
+        latest[(child_id, slot)] = (
+            actual_date is not None or status == VaccineStatusEnum.COMPLETED,
+            -1 if scheduled_date is None else (scheduled_date - _EPOCH).days,
+        )
+    if not latest:
+        return
+    keys = np.asarray(list(latest.keys()), dtype=np.int64)
+    values = np.asarray(list(latest.values()), dtype=np.int64)
+    rows_at = np.searchsorted(child_ids, keys[:, 0])
+    slot_at = keys[:, 1]
+    done[rows_at, slot_at] = values[:, 0].astype(bool)
+    scheduled = values[:, 1]
+    has_date = scheduled >= 0
+    due[rows_at[has_date], slot_at[has_date]] = scheduled[has_date]
+    known[rows_at[has_date], slot_at[has_date]] = True
+
+
+def iter_due_doses(
+    db: Session,
+    *,
+    within_days: int = 7,
+    today: Optional[date] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    after_child_id: int = 0,
+    include_overdue: bool = True,
+    slots: Optional[SlotTable] = None,
+) -> Iterator[DueDose]:
+    """Yield overdue and soon-due doses for every child, in child_id order, one chunk at a time."""
+    today = today or date.today()
+    slots = slots if slots is not None else load_slot_table(db)
+    if not len(slots):
+        return
+    today_day = int(_day_numbers([today])[0])
+    horizon_day = today_day + within_days
+    usable = slots.offsets >= 0
+
+    for child_ids, parent_ids, dob_days in _iter_child_arrays(db, chunk_size, after_child_id):
+        groups = age_group_codes(dob_days, today)
+        current = slots.group_codes[None, :] == groups[:, None]
+        upcoming_group = current | (slots.group_codes[None, :] == groups[:, None] + 1)
+
+        due = dob_days[:, None] + slots.offsets[None, :]
+        known = np.broadcast_to(usable, due.shape).copy()
+        done = np.zeros(due.shape, dtype=bool)
+        _apply_status_rows(db, slots, child_ids, due, known, done)
+        open_ = known & ~done
+
+        overdue = open_ & current & (due < today_day) if include_overdue else np.zeros_like(open_)
+        due_soon = open_ & upcoming_group & (due >= today_day) & (due <= horizon_day)
+        rows_at, slot_at = np.nonzero(overdue | due_soon)
+        if not len(rows_at):
+            continue
+        overdue_at = overdue[rows_at, slot_at]
+        due_at = due[rows_at, slot_at]
+        for r, s, late, day in zip(rows_at.tolist(), slot_at.tolist(), overdue_at.tolist(), due_at.tolist()):
+            yield DueDose(
+                child_id=int(child_ids[r]),
+                parent_id=int(parent_ids[r]),
+                schedule_id=int(slots.schedule_ids[s]),
+                vaccine_name=slots.vaccine_names[s],
+                dose_number=int(slots.dose_numbers[s]),
+                due_date=_EPOCH + timedelta(days=day),
+                overdue=late,
+            )
+
+
+def due_dose_record(dose: DueDose) -> Dict[str, object]:
+    """JSON-ready dict for one DueDose."""
+    record = dose._asdict()
+    record["due_date"] = dose.due_date.isoformat()
+    return record
@@ -0,0 +1,141 @@
+"""Compiled due-date plans for VaccinationSchedule rows.
+
+`recommended_age` is free text ("6, 10, 14 weeks", "15-18 months", "At birth",
+"Every year"). It is parsed once per distinct (text, doses) into a
+SchedulePlan with one DoseWindow per dose, giving offsets in days from the
+date of birth. Callers then compute due dates with plain arithmetic:
+
+    plan = schedule_plan(schedule)
+    due = plan.due_date(dose_number, child.date_of_birth)
+
+Offsets follow the rules the vaccine and profile endpoints have always used:
+- a week is 7 days, a month 30 and a year 365
+- a range is due at its upper bound
+- a list ("6, 10, 14 weeks") gives one value per dose; later doses reuse the last value
+- "at birth" is due on the date of birth
+- "every year" and "every 6 months" fall back to their first occurrence
+
+`min_months` is the rounded minimum age in months that the prediction
+features were trained on. Do not change its rounding without retraining.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
+
+UNIT_DAYS = {"week": 7, "month": 30, "year": 365}
+
+_DASHES = str.maketrans({"\u2013": "-", "\u2014": "-", "\u2212": "-", "\u2011": "-", "\u00a0": " "})
+_NUMBER = re.compile(r"(\d+)\s*,?")
+_RANGE = re.compile(r"(\d+)\s*[-]\s*(\d+)")
+_MIN_YEARS = re.compile(r"(\d+)\s*years?")
+_MIN_MONTHS = re.compile(r"(\d+)(?:\s*[-\u2013]\s*\d+)?\s*months?")
+_MIN_WEEKS = re.compile(r"(\d+)\s*weeks?")
+_MIN_DAYS = re.compile(r"(\d+)\s*days?")
+
+
+@dataclass(frozen=True)
+class DoseWindow:
+    """One dose's recommended window, in days from the date of birth."""
+
+    min_days: int
+    max_days: int
+
+    @property
+    def due_days(self) -> int:
+        # A dose counts as missed once the end of its window has passed
+        return self.max_days
+
+
+@dataclass(frozen=True)
+class SchedulePlan:
+    doses: Tuple[Optional[DoseWindow], ...]
+    min_months: Optional[int]
+
+    def window(self, dose_number: int) -> Optional[DoseWindow]:
+        if not self.doses:
+            return None
+        return self.doses[max(0, min(len(self.doses) - 1, dose_number - 1))]
+
+    def due_offset(self, dose_number: int) -> Optional[int]:
+        window = self.window(dose_number)
+        return window.due_days if window is not None else None
+
+    def due_date(self, dose_number: int, dob: date) -> Optional[date]:
+        offset = self.due_offset(dose_number)
+        return dob + timedelta(days=offset) if offset is not None else None
+
+
+def _unit(txt: str) -> Optional[str]:
+    for unit in ("week", "month", "year"):
+        if unit in txt:
+            return unit
+    return None
+
+
+def _dose_windows(txt: str, doses: int) -> Tuple[Optional[DoseWindow], ...]:
+    unit = _unit(txt)
+    numbers = [int(n) for n in _NUMBER.findall(txt)]
+    count = max(doses, len(numbers), 1)
+
+    def same(lo: int, hi: int) -> Tuple[DoseWindow, ...]:
+        return (DoseWindow(lo, hi),) * count
+
+    if "at birth" in txt:
+        return same(0, 0)
+    if unit:
+        scale = UNIT_DAYS[unit]
+        m_range = _RANGE.search(txt)
+        if m_range:
+            return same(int(m_range.group(1)) * scale, int(m_range.group(2)) * scale)
+        if numbers:
+            padded = numbers + [numbers[-1]] * (count - len(numbers))
+            return tuple(DoseWindow(n * scale, n * scale) for n in padded)
+    if "every year" in txt:
+        return same(365, 365)
+    if "every 6 months" in txt:
+        first = 9 * 30 if "9 months" in txt else 6 * 30
+        return same(first, first)
+    return (None,) * count
+
+
+def _min_months(txt: str) -> Optional[int]:
+    t = txt.strip()
+    m = _MIN_YEARS.search(t)
+    if m:
+        return int(m.group(1)) * 12
+    m = _MIN_MONTHS.search(t)
+    if m:
+        return int(m.group(1))
+    m = _MIN_WEEKS.search(t)
+    if m:
+        return max(0, int(round(int(m.group(1)) / 4.345)))
+    m = _MIN_DAYS.search(t)
+    if m:
+        return max(0, int(round(int(m.group(1)) / 30.0)))
+    if "birth" in t or "newborn" in t:
+        return 0
+    return None
+
+
+@lru_cache(maxsize=1024)
+def compile_recommended_age(recommended_age: Optional[str], doses_required: int = 1) -> SchedulePlan:
+    """Parse recommended_age once into a SchedulePlan (cached per text and dose count)."""
+    if not recommended_age:
+        return SchedulePlan(doses=(), min_months=None)
+    raw = recommended_age.lower()
+    return SchedulePlan(
+        doses=_dose_windows(raw.translate(_DASHES), max(int(doses_required or 1), 1)),
+        min_months=_min_months(raw),
+    )
+
+
+def schedule_plan(schedule) -> SchedulePlan:
+    """SchedulePlan for a VaccinationSchedule row (or anything with recommended_age/doses_required)."""
+    return compile_recommended_age(
+        getattr(schedule, "recommended_age", None),
+        getattr(schedule, "doses_required", None) or 1,
+    )
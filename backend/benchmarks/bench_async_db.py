@@ -0,0 +1,164 @@
+"""Sync Session vs AsyncSession throughput under concurrent load.
+
+Serves three equivalent "list my children" routes from a uvicorn subprocess
+and drives each with concurrent HTTP clients:
+
+  sync-threadpool   `def` route + sync Session (runs in Starlette's threadpool)
+  async-blocking    `async def` route calling the sync Session on the loop,
+                    which is what most async routes did before AsyncSession
+  async-session     `async def` route + AsyncSession (psycopg3 async)
+
+Point DATABASE_URL at a local Postgres for meaningful numbers:
+
+    DATABASE_URL=postgresql+psycopg://postgres@localhost/sanrakshya_bench \\
+        python -m benchmarks.bench_async_db --requests 2000 --concurrency 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from datetime import date
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.apis.deps import get_async_db, get_db
+from app.core.config import settings
+from app.db import crud, crud_async
+from app.db.session import ASYNC_DATABASE_URL, SessionLocal, engine
+from app.models.models import Child, Parent
+
+BENCH_EMAIL = "bench.asyncdb@example.com"
+ROUTES = ("sync-threadpool", "async-blocking", "async-session")
+
+bench_app = FastAPI()
+
+
+def _bench_parent_id(db: Session) -> int:
+    return db.query(Parent.parent_id).filter(Parent.email == BENCH_EMAIL).scalar()
+
+
+@bench_app.get("/sync-threadpool/{parent_id}")
+def sync_threadpool(parent_id: int, db: Session = Depends(get_db)):
+    return [c.child_id for c in crud.list_children_by_parent(db, parent_id=parent_id)]
+
+
+@bench_app.get("/async-blocking/{parent_id}")
+async def async_blocking(parent_id: int, db: Session = Depends(get_db)):
+    return [c.child_id for c in crud.list_children_by_parent(db, parent_id=parent_id)]
+
+
+@bench_app.get("/async-session/{parent_id}")
+async def async_session(parent_id: int, db: AsyncSession = Depends(get_async_db)):
+    return [c.child_id for c in await crud_async.list_children_by_parent(db, parent_id=parent_id)]
+
+
+def _seed(children: int) -> int:
+    Parent.__table__.create(bind=engine, checkfirst=True)
+    Child.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        parent_id = _bench_parent_id(db)
+        if parent_id is None:
+            parent = Parent(
+                full_name="Bench Async",
+                email=BENCH_EMAIL,
+                phone_number="9000000003",
+                password_hash="x",
+                is_active=True,
+            )
+            db.add(parent)
+            db.flush()
+            db.add_all(
+                Child(parent_id=parent.parent_id, full_name=f"Child {i}", date_of_birth=date(2023, 1, 1))
+                for i in range(children)
+            )
+            db.commit()
+            parent_id = parent.parent_id
+        return parent_id
+    finally:
+        db.close()
+
+
+async def _drive(base_url: str, path: str, requests: int, concurrency: int) -> tuple[float, float, float, int]:
+    latencies: list[float] = []
+    errors = 0
+    sem = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+
+        async def one() -> None:
+            nonlocal errors
+            async with sem:
+                start = time.perf_counter()
+                try:
+                    resp = await client.get(path)
+                    resp.raise_for_status()
+                except httpx.HTTPError:
+                    # Pool timeouts (500) and client read timeouts
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(one() for _ in range(min(concurrency, requests))))
+        latencies.clear()
+        errors = 0
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return requests / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)], errors
+
+
+def _wait_ready(base_url: str, proc: subprocess.Popen) -> None:
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            httpx.get(f"{base_url}/docs", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("uvicorn did not start")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--children", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    parent_id = _seed(args.children)
+    base_url = f"http://127.0.0.1:{args.port}"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.bench_async_db:bench_app",
+         "--port", str(args.port), "--log-level", "warning", "--no-access-log"],
+        env=os.environ.copy(),
+    )
+    try:
+        _wait_ready(base_url, proc)
+        print(f"sync url:  {engine.url.render_as_string()}")
+        print(f"async url: {ASYNC_DATABASE_URL.split('@')[-1]}")
+        print(f"sync pool: size={settings.DB_POOL_SIZE} overflow={settings.DB_MAX_OVERFLOW}; "
+              f"async pool: size={settings.ASYNC_DB_POOL_SIZE} overflow={settings.ASYNC_DB_MAX_OVERFLOW}; "
+              f"{args.requests} requests @ concurrency {args.concurrency}")
+        for route in ROUTES:
+            rps, p50, p95, errors = asyncio.run(
+                _drive(base_url, f"/{route}/{parent_id}", args.requests, args.concurrency)
+            )
+            print(f"{route:16s} {rps:8.1f} req/s   p50={p50:6.1f}ms  p95={p95:6.1f}ms  errors={errors}")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""Throughput and p50/p95/p99 latency of the parent-facing hot endpoints.
+
+Boots the full `app.main:app` in a uvicorn subprocess with the LLM clients
+stubbed. The Groq nutrition client and the Bal Mitra retriever/LLM return
+canned answers after --llm-latency-ms. Each scenario is driven by concurrent
+httpx clients acting as the synthetic parents:
+
+  parent_home       GET  /users/parent-home
+  predict           POST /predictions/child/{id}
+  weekly_nutrition  GET  /nutrition/child/{id}/weekly-summary
+  child_profile     GET  /children/{id}/profile-summary
+  food_log          POST /food-logs/child/{id}/meals   (two FoodMaster items + one custom item)
+  chatbot           POST /chatbot/child/{id}
+
+It needs a database seeded by the synthetic generator:
+
+    python -m app.commands.generate_synthetic_dataset --parents 200 --seed 1
+    python -m benchmarks.bench_endpoints --dataset-seed 1 --requests 500 --concurrency 20 \\
+        --out bench-results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.bench_endpoints --compare bench-results/abc1234.json bench-results/def5678.json
+
+The results are written as JSON so runs can be diffed between commits.
+`food_log` sends one request per child, since the API allows one meal log per
+week. Before it runs, each child's recent meal logs are moved back a week.
+This changes the dataset, so use a throwaway database.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.commands.generate_synthetic_dataset import synthetic_parent_email
+from app.core.security import create_access_token
+from app.db.crud_daily_nutrients import rebuild_daily_nutrients
+from app.db.session import SessionLocal, engine
+from app.models.models import Child, ChildDailyNutrients, ChildMealLog, FoodMaster, Parent
+
+LLM_LATENCY_ENV = "BENCH_LLM_LATENCY_MS"
+SCENARIOS = ("parent_home", "predict", "weekly_nutrition", "child_profile", "food_log", "chatbot")
+CHAT_QUESTION = "My child has a mild cough since yesterday. What should I give for dinner?"
+
+
+# -------- Server side: the app with stubbed LLM clients --------
+
+class _StubCompletions:
+    def create(self, **kwargs):
+        time.sleep(float(os.environ.get(LLM_LATENCY_ENV, "0")) / 1000)
+        content = json.dumps({
+            "energy_kcal": 120.0, "protein_g": 3.5, "carb_g": 18.0, "fat_g": 3.0,
+            "iron_mg": 0.8, "calcium_mg": 40.0, "vitamin_a_mcg": 15.0, "vitamin_c_mg": 2.0,
+        })
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class _StubRetriever:
+    def get_relevant_documents(self, query: str):
+        return [SimpleNamespace(page_content="WHO: offer small, frequent meals and plenty of fluids.")]
+
+
+class _StubLLM:
+    def invoke(self, prompt: str):
+        time.sleep(float(os.environ.get(LLM_LATENCY_ENV, "0")) / 1000)
+        return SimpleNamespace(content=f"(stub answer for a {len(prompt)}-character prompt)")
+
+
+class _StubPrompt:
+    def format(self, **fields: Any) -> str:
+        return "\n\n".join(f"{k}:\n{v}" for k, v in fields.items())
+
+
+def stubbed_app():
+    """uvicorn --factory target: app.main:app with the Groq and Bal Mitra clients replaced."""
+    from app.main import app
+    from app.services import bal_mitra, gemini
+
+    gemini.client = SimpleNamespace(chat=SimpleNamespace(completions=_StubCompletions()))
+    bal_mitra.load_rag = lambda: (_StubRetriever(), _StubLLM(), _StubPrompt())
+    return app
+
+
+# -------- Client side --------
+
+def _dataset(seed: int, parents: int) -> List[Tuple[str, List[int]]]:
+    """(token, child ids) for the first `parents` synthetic parents of the seed."""
+    db = SessionLocal()
+    try:
+        emails = [synthetic_parent_email(seed, i) for i in range(parents)]
+        rows = (
+            db.query(Parent.email, Child.child_id)
+            .join(Child, Child.parent_id == Parent.parent_id)
+            .filter(Parent.email.in_(emails))
+            .order_by(Parent.parent_id, Child.child_id)
+            .all()
+        )
+    finally:
+        db.close()
+    if not rows:
+        raise SystemExit(
+            f"No synthetic parents for seed {seed}; run "
+            f"python -m app.commands.generate_synthetic_dataset --seed {seed} first"
+        )
+    children: Dict[str, List[int]] = {}
+    for email, child_id in rows:
+        children.setdefault(email, []).append(child_id)
+    return [
+        (create_access_token({"sub": email, "user_type": "parent"}), ids)
+        for email, ids in children.items()
+    ]
+
+
+def _release_meal_logs(child_ids: List[int]) -> None:
+    """Shift each child's meal logs back until the newest is a week old, so the child may log today.
+
+    The whole series moves by the same number of days, keeping logs a week apart.
+    """
+    db = SessionLocal()
+    try:
+        cutoff = date.today() - timedelta(days=7)
+        logs: Dict[int, List[ChildMealLog]] = {}
+        for log in db.query(ChildMealLog).filter(ChildMealLog.child_id.in_(child_ids)):
+            logs.setdefault(log.child_id, []).append(log)
+        moved = []
+        for child_id, child_logs in logs.items():
+            shift = max(log.log_date for log in child_logs) - cutoff
+            if shift.days <= 0:
+                continue
+            for log in child_logs:
+                log.log_date = log.log_date - shift
+            moved.append(child_id)
+        if not moved:
+            return
+        # The daily rollup is keyed by log_date: recompute the moved children
+        db.query(ChildDailyNutrients).filter(ChildDailyNutrients.child_id.in_(moved)).delete(synchronize_session=False)
+        db.flush()
+        rebuild_daily_nutrients(db, first_child_id=min(moved), last_child_id=max(moved))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _meal_payload() -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        food_ids = [f for (f,) in db.query(FoodMaster.food_id).order_by(FoodMaster.food_id).limit(2)]
+    finally:
+        db.close()
+    items = [
+        {"meal_type": "lunch", "food_id": food_id, "serving_size_g": 100, "meal_frequency": 1}
+        for food_id in food_ids
+    ]
+    items.append({"meal_type": "dinner", "custom_food_name": "Vegetable pulao", "serving_size_g": 150, "meal_frequency": 1})
+    return {"notes": "bench", "items": items}
+
+
+Request = Tuple[str, str, Dict[str, str], Optional[Dict[str, Any]]]
+
+
+def _requests_for(scenario: str, dataset: List[Tuple[str, List[int]]], n: int) -> List[Request]:
+    """n requests for the scenario, rotating over parents and their children."""
+    pairs = [(token, child_id) for token, ids in dataset for child_id in ids]
+    meal = _meal_payload() if scenario == "food_log" else None
+    if scenario == "food_log":
+        pairs = pairs[:n]
+        _release_meal_logs([child_id for _, child_id in pairs])
+    out: List[Request] = []
+    for i in range(n if scenario != "food_log" else len(pairs)):
+        if scenario == "parent_home":
+            headers = {"Authorization": f"Bearer {dataset[i % len(dataset)][0]}"}
+            out.append(("GET", "/users/parent-home", headers, None))
+            continue
+        token, child_id = pairs[i % len(pairs)]
+        headers = {"Authorization": f"Bearer {token}"}
+        if scenario == "predict":
+            out.append(("POST", f"/predictions/child/{child_id}", headers, None))
+        elif scenario == "weekly_nutrition":
+            out.append(("GET", f"/nutrition/child/{child_id}/weekly-summary", headers, None))
+        elif scenario == "child_profile":
+            out.append(("GET", f"/children/{child_id}/profile-summary", headers, None))
+        elif scenario == "food_log":
+            out.append(("POST", f"/food-logs/child/{child_id}/meals", headers, meal))
+        elif scenario == "chatbot":
+            out.append(("POST", f"/chatbot/child/{child_id}", headers, {"question": CHAT_QUESTION}))
+    return out
+
+
+def _percentile(sorted_ms: List[float], q: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return sorted_ms[min(len(sorted_ms) - 1, int(round(q * (len(sorted_ms) - 1))))]
+
+
+async def _drive(base_url: str, requests: List[Request], concurrency: int, warmup: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    sem = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def one(req: Request, record: bool) -> None:
+            method, path, headers, body = req
+            async with sem:
+                start = time.perf_counter()
+                resp = await client.request(method, path, headers=headers, json=body)
+                elapsed = (time.perf_counter() - start) * 1000
+            if record:
+                latencies.append(elapsed)
+                statuses[resp.status_code] += 1
+
+        await asyncio.gather(*(one(req, False) for req in requests[:warmup]))
+        measured = requests[warmup:]
+        start = time.perf_counter()
+        await asyncio.gather(*(one(req, True) for req in measured))
+        wall = time.perf_counter() - start
+    latencies.sort()
+    errors = sum(n for code, n in statuses.items() if code >= 400)
+    return {
+        "requests": len(measured),
+        "concurrency": concurrency,
+        "rps": round(len(measured) / wall, 2) if wall else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50), 2),
+        "p95_ms": round(_percentile(latencies, 0.95), 2),
+        "p99_ms": round(_percentile(latencies, 0.99), 2),
+        "errors": errors,
+        "status": {str(code): n for code, n in sorted(statuses.items())},
+    }
+
+
+def _wait_ready(base_url: str, proc: subprocess.Popen) -> None:
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            httpx.get(f"{base_url}/", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("uvicorn did not start")
+
+
+def _git_revision() -> Dict[str, Any]:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip())
+        return {"commit": sha, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def _print_results(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'scenario':<18} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}")
+    for name, r in results.items():
+        print(f"{name:<18} {r['rps']:>8.1f} {r['p50_ms']:>6.1f}ms {r['p95_ms']:>6.1f}ms {r['p99_ms']:>6.1f}ms {r['errors']:>7}")
+
+
+def _compare(old_path: str, new_path: str) -> None:
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"{old['meta'].get('commit', '?')[:10]} -> {new['meta'].get('commit', '?')[:10]}")
+    print(f"{'scenario':<18} {'req/s':>16} {'p50 ms':>16} {'p95 ms':>16} {'p99 ms':>16}")
+
+    def delta(a: float, b: float) -> str:
+        pct = (b - a) / a * 100 if a else 0.0
+        return f"{b:>8.1f} ({pct:+5.0f}%)"
+
+    for name, b in new["results"].items():
+        a = old["results"].get(name)
+        if a is None:
+            continue
+        print(f"{name:<18} {delta(a['rps'], b['rps'])} {delta(a['p50_ms'], b['p50_ms'])} "
+              f"{delta(a['p95_ms'], b['p95_ms'])} {delta(a['p99_ms'], b['p99_ms'])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset-seed", type=int, default=1, help="--seed given to generate_synthetic_dataset")
+    parser.add_argument("--parents", type=int, default=50, help="synthetic parents to act as")
+    parser.add_argument("--requests", type=int, default=300, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="repeatable; defaults to all")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="delay of the stubbed LLM calls")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--out", default="bench_endpoints.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="print the deltas between two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        _compare(*args.compare)
+        return
+
+    dataset = _dataset(args.dataset_seed, args.parents)
+    scenarios = args.scenario or list(SCENARIOS)
+    plans = {name: _requests_for(name, dataset, args.requests + args.warmup) for name in scenarios}
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    env = {**os.environ, LLM_LATENCY_ENV: str(args.llm_latency_ms)}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "--factory", "benchmarks.bench_endpoints:stubbed_app",
+         "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        _wait_ready(base_url, proc)
+        for name, plan in plans.items():
+            results[name] = asyncio.run(_drive(base_url, plan, args.concurrency, min(args.warmup, len(plan) // 2)))
+            r = results[name]
+            print(f"{name:<18} {r['rps']:8.1f} req/s  p50={r['p50_ms']:.1f}ms p95={r['p95_ms']:.1f}ms p99={r['p99_ms']:.1f}ms  status={r['status']}")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    report = {
+        "meta": {
+            **_git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("compare", "out")},
+            "dataset": {"parents": len(dataset), "children": sum(len(ids) for _, ids in dataset)},
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print()
+    _print_results(results)
+    print(f"\nwrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Per-child time-ordered log queries with and without the (child_id, date DESC, id DESC) indexes.
+
+Seeds a synthetic dataset (by default 1,000,000 rows in each of
+child_anthropometry, child_meal_log, child_illness_logs and
+child_prediction_reports, spread over 5,000 children of a bench parent).
+Then, for the app's hot per-child queries, it prints the query plan and
+the latency over a sample of children twice: once with only the
+single-column child_id indexes, and once with the composite indexes from
+migration c7e19b4d2a60.
+
+    python -m benchmarks.bench_log_indexes --rows 1000000 --children 5000
+
+Seeding is skipped when the bench parent already has the requested data, so
+re-runs only re-measure. The composite indexes are left in place afterwards.
+Run it against Postgres for the plans that matter (EXPLAIN ANALYZE). SQLite
+shows EXPLAIN QUERY PLAN, where the win appears as the disappearing
+"USE TEMP B-TREE FOR ORDER BY".
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event, func, insert, text
+
+from app.db import crud
+from app.db.session import SessionLocal, engine
+from app.models.models import (
+    Child,
+    ChildAnthropometry,
+    ChildIllnessLog,
+    ChildMealItem,
+    ChildMealLog,
+    ChildPredictionReport,
+    FoodMaster,
+    Parent,
+)
+from app.schemas.schemas import VaccinationAgeGroupEnum
+from app.services.prediction_common import illness_features, latest_anthro, trend_anthro
+
+BENCH_EMAIL = "bench.logindexes@example.com"
+CHUNK = 20_000
+HISTORY_DAYS = 730
+
+TABLES = [Parent, Child, ChildAnthropometry, ChildMealLog, FoodMaster, ChildMealItem, ChildIllnessLog, ChildPredictionReport]
+LOG_TABLES = [ChildAnthropometry, ChildMealLog, ChildIllnessLog, ChildPredictionReport]
+
+COMPOSITE_INDEXES = {
+    "ix_child_anthropometry_child_id_log_date",
+    "ix_child_meal_log_child_id_log_date",
+    "ix_child_illness_logs_child_id_created_at",
+    "ix_child_prediction_reports_child_id_created_at",
+}
+
+
+def _composite_indexes():
+    for model in LOG_TABLES:
+        for index in model.__table__.indexes:
+            if index.name in COMPOSITE_INDEXES:
+                yield index
+
+
+# -------- Seeding --------
+
+def _bench_children(db) -> list[int]:
+    return [
+        cid for (cid,) in db.query(Child.child_id)
+        .join(Parent, Parent.parent_id == Child.parent_id)
+        .filter(Parent.email == BENCH_EMAIL)
+        .order_by(Child.child_id)
+    ]
+
+
+def _seed_children(n: int) -> list[int]:
+    db = SessionLocal()
+    try:
+        parent = db.query(Parent).filter(Parent.email == BENCH_EMAIL).first()
+        if parent is None:
+            parent = Parent(
+                full_name="Bench Parent",
+                email=BENCH_EMAIL,
+                phone_number="9000000038",
+                password_hash="x",
+                is_active=True,
+            )
+            db.add(parent)
+            db.commit()
+        existing = _bench_children(db)
+        missing = n - len(existing)
+        if missing > 0:
+            today = date.today()
+            rows = [
+                {
+                    "parent_id": parent.parent_id,
+                    "full_name": f"Bench Child {len(existing) + i}",
+                    "gender": random.choice(["male", "female"]),
+                    "date_of_birth": today - timedelta(days=random.randint(60, 3000)),
+                }
+                for i in range(missing)
+            ]
+            for start in range(0, len(rows), CHUNK):
+                db.execute(insert(Child), rows[start:start + CHUNK])
+            db.commit()
+        return _bench_children(db)[:n]
+    finally:
+        db.close()
+
+
+def _log_row(model, child_id: int, day: date, moment: datetime) -> dict:
+    if model is ChildAnthropometry:
+        return {
+            "child_id": child_id,
+            "log_date": day,
+            "height_cm": round(random.uniform(60, 130), 1),
+            "weight_kg": round(random.uniform(6, 30), 2),
+            "muac_cm": round(random.uniform(11, 18), 1),
+            "created_at": moment,
+            "updated_at": moment,
+        }
+    if model is ChildMealLog:
+        return {"child_id": child_id, "log_date": day, "created_at": moment}
+    if model is ChildIllnessLog:
+        return {
+            "child_id": child_id,
+            "fever": random.random() < 0.3,
+            "cough": random.random() < 0.3,
+            "diarrhea": random.random() < 0.1,
+            "is_current": False,
+            "created_at": moment,
+            "updated_at": moment,
+        }
+    return {
+        "child_id": child_id,
+        "age_group": VaccinationAgeGroupEnum.TODDLER,
+        "created_at": moment,
+        "weight_zscore": round(random.gauss(0, 1), 3),
+        "height_zscore": round(random.gauss(0, 1), 3),
+    }
+
+
+def _seed_logs(model, child_ids: list[int], rows: int) -> None:
+    db = SessionLocal()
+    try:
+        have = (
+            db.query(func.count(model.id))
+            .join(Child, Child.child_id == model.child_id)
+            .join(Parent, Parent.parent_id == Child.parent_id)
+            .filter(Parent.email == BENCH_EMAIL)
+            .scalar()
+        )
+        missing = rows - have
+        if missing <= 0:
+            print(f"  {model.__tablename__}: {have} rows present")
+            return
+        started = time.perf_counter()
+        now = datetime.now().replace(microsecond=0)
+        batch = []
+        for i in range(missing):
+            # Children are interleaved (insert order != per-child order), like real traffic
+            child_id = child_ids[i % len(child_ids)]
+            moment = now - timedelta(seconds=random.randint(0, HISTORY_DAYS * 86400))
+            batch.append(_log_row(model, child_id, moment.date(), moment))
+            if len(batch) == CHUNK:
+                db.execute(insert(model), batch)
+                db.commit()
+                batch = []
+        if batch:
+            db.execute(insert(model), batch)
+            db.commit()
+        print(f"  {model.__tablename__}: +{missing} rows ({time.perf_counter() - started:.0f}s)")
+    finally:
+        db.close()
+
+
+# -------- Queries under test --------
+
+def _last_illness(db, child_id: int):
+    # crud_child_profile._timeline
+    return (
+        db.query(ChildIllnessLog)
+        .filter(ChildIllnessLog.child_id == child_id)
+        .order_by(ChildIllnessLog.created_at.desc())
+        .first()
+    )
+
+
+def _latest_report(db, child_id: int):
+    # crud_child_profile / GET /predictions/child/{id}/latest
+    return (
+        db.query(ChildPredictionReport)
+        .filter(ChildPredictionReport.child_id == child_id)
+        .order_by(ChildPredictionReport.created_at.desc(), ChildPredictionReport.id.desc())
+        .first()
+    )
+
+
+def _recent_reports(db, child_id: int):
+    # GET /predictions/child/{id}/reports first page
+    return (
+        db.query(ChildPredictionReport.id, ChildPredictionReport.created_at)
+        .filter(ChildPredictionReport.child_id == child_id)
+        .order_by(ChildPredictionReport.created_at.desc(), ChildPredictionReport.id.desc())
+        .limit(50)
+        .all()
+    )
+
+
+QUERIES = {
+    "latest_anthro": latest_anthro,
+    "trend_anthro": trend_anthro,
+    "meal_logs_last_7d": lambda db, cid: crud.list_child_meal_logs_between(
+        db, cid, date.today() - timedelta(days=7), date.today()
+    ),
+    "latest_meal_log": crud.get_latest_child_meal_log,
+    "illness_features": illness_features,
+    "last_illness": _last_illness,
+    "latest_report": _latest_report,
+    "recent_reports": _recent_reports,
+}
+
+
+class _LastStatement:
+    def __init__(self) -> None:
+        self.statement = None
+        self.parameters = None
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if not statement.lstrip().upper().startswith("EXPLAIN"):
+            self.statement, self.parameters = statement, parameters
+
+
+def _explain(db, last: _LastStatement) -> list[str]:
+    if engine.dialect.name == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS, COSTS OFF) "
+        rows = db.connection().exec_driver_sql(prefix + last.statement, last.parameters).fetchall()
+        return [r[0] for r in rows]
+    rows = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + last.statement, last.parameters).fetchall()
+    return [r[-1] for r in rows]
+
+
+def _analyze(db) -> None:
+    if engine.dialect.name == "postgresql":
+        for model in LOG_TABLES:
+            db.execute(text(f"ANALYZE {model.__tablename__}"))
+    else:
+        db.execute(text("ANALYZE"))
+    db.commit()
+
+
+def _measure(label: str, sample: list[int], show_plans: bool) -> dict[str, tuple[float, float]]:
+    last = _LastStatement()
+    event.listen(engine, "before_cursor_execute", last)
+    db = SessionLocal()
+    results = {}
+    try:
+        _analyze(db)
+        print(f"\n=== {label} ===")
+        for name, fn in QUERIES.items():
+            fn(db, sample[0])
+            if show_plans:
+                print(f"-- {name}")
+                for line in _explain(db, last):
+                    print(f"   {line}")
+            timings = []
+            for cid in sample:
+                db.expunge_all()
+                started = time.perf_counter()
+                fn(db, cid)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            results[name] = (statistics.median(timings), timings[int(len(timings) * 0.95) - 1])
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", last)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows per log table")
+    parser.add_argument("--children", type=int, default=5_000)
+    parser.add_argument("--sample", type=int, default=200, help="children queried per measurement")
+    parser.add_argument("--no-plans", action="store_true")
+    parser.add_argument("--seed", type=int, default=38)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    for model in TABLES:
+        model.__table__.create(bind=engine, checkfirst=True)
+    print(f"Seeding ({engine.dialect.name})")
+    child_ids = _seed_children(args.children)
+    for model in LOG_TABLES:
+        _seed_logs(model, child_ids, args.rows)
+    sample = random.sample(child_ids, min(args.sample, len(child_ids)))
+
+    for index in _composite_indexes():
+        index.drop(bind=engine, checkfirst=True)
+    before = _measure("child_id indexes only", sample, not args.no_plans)
+
+    started = time.perf_counter()
+    for index in _composite_indexes():
+        index.create(bind=engine, checkfirst=True)
+    print(f"\nBuilt composite indexes in {time.perf_counter() - started:.1f}s")
+    after = _measure("with (child_id, date DESC, id DESC)", sample, not args.no_plans)
+
+    print(f"\n{'query':<20} {'p50 before':>11} {'p50 after':>10} {'p95 before':>11} {'p95 after':>10}")
+    for name in QUERIES:
+        (b50, b95), (a50, a95) = before[name], after[name]
+        print(f"{name:<20} {b50:>9.2f}ms {a50:>8.2f}ms {b95:>9.2f}ms {a95:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
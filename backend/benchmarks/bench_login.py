@@ -0,0 +1,100 @@
+"""Login burst benchmark: login throughput and event-loop responsiveness.
+
+Fires --logins concurrent parent logins at the app while a probe keeps hitting
+the `GET /` health route, and reports login throughput plus probe latency.
+With bcrypt running on the event loop the probe stalls for the whole burst;
+with the dedicated hashing pool it should stay in the low milliseconds.
+
+    python -m benchmarks.bench_login --logins 40 --concurrency 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.models.models import Parent
+
+BENCH_EMAIL = "bench.login@example.com"
+BENCH_PASSWORD = "bench-password"
+
+
+def _ensure_parent() -> None:
+    Parent.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        parent = db.query(Parent).filter(Parent.email == BENCH_EMAIL).first()
+        if parent is None:
+            db.add(Parent(
+                full_name="Bench Login",
+                email=BENCH_EMAIL,
+                phone_number="9000000002",
+                password_hash=get_password_hash(BENCH_PASSWORD),
+                is_active=True,
+            ))
+            db.commit()
+    finally:
+        db.close()
+
+
+def _pct(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _run(logins: int, concurrency: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        sem = asyncio.Semaphore(concurrency)
+        done = asyncio.Event()
+        probe_ms: list[float] = []
+
+        async def login() -> None:
+            async with sem:
+                resp = await client.post(
+                    "/auth/parent-login",
+                    json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD},
+                )
+                assert resp.status_code == 200, resp.text
+
+        async def probe() -> None:
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/")
+                probe_ms.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.005)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    print(f"bcrypt rounds:   {settings.BCRYPT_ROUNDS}  (hash workers={settings.PASSWORD_HASH_WORKERS})")
+    print(f"logins:          {logins} in {elapsed:.2f}s  ->  {logins / elapsed:.1f} logins/s")
+    print(f"health probes:   {len(probe_ms)}")
+    print(
+        f"probe latency:   p50={statistics.median(probe_ms):.1f}ms "
+        f"p95={_pct(probe_ms, 0.95):.1f}ms max={max(probe_ms):.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    _ensure_parent()
+    asyncio.run(_run(args.logins, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Pickle vs XGBoost native models: load time, memory per worker and prediction parity.
+
+Export the native copies first:
+
+    python -m app.commands.export_native_models
+    python -m benchmarks.bench_model_formats --workers 4
+
+For each format it reports, from a fresh interpreter, the time and RSS growth
+of loading all models through the model cache. It then forks --workers
+children two ways and reports their private (unshared) memory from
+/proc/<pid>/smaps_rollup:
+
+  per-worker   each forked worker loads the models itself (uvicorn --workers)
+  preloaded    models loaded once in the parent, gc.freeze(), then fork
+               (gunicorn --preload with MODEL_PRELOAD=true)
+
+Linux only (uses fork and /proc).
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+FORMATS = ("pickle", "native")
+
+
+def _rss_kb() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def _private_kb() -> int:
+    total = 0
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                total += int(line.split()[1])
+    return total
+
+
+def _predict_everything() -> None:
+    from app.commands.export_native_models import random_frame
+    from app.services.cohort_scoring import GROUP_MODELS, predict_group_batch
+
+    for group, (_, features) in GROUP_MODELS.items():
+        rows = random_frame(features, 64).to_dict("records")
+        predict_group_batch(group.value, rows)
+
+
+def _child_measure() -> None:
+    """Runs in a fresh interpreter with MODEL_FORMAT set; prints one JSON line."""
+    import xgboost  # noqa: F401  (count the models, not the library)
+
+    from app.services.cohort_scoring import preload_models
+    from app.services.prediction_common import model_cache
+
+    base = _rss_kb()
+    start = time.perf_counter()
+    preload_models()
+    load_s = time.perf_counter() - start
+    loaded_kb = _rss_kb() - base
+
+    workers = int(os.environ.get("BENCH_WORKERS", "0"))
+    preloaded = _fork_workers(workers, preload_in_child=False) if workers else []
+    print(json.dumps({
+        "models": len(model_cache),
+        "load_s": load_s,
+        "rss_growth_kb": loaded_kb,
+        "preloaded_private_kb": preloaded,
+    }))
+
+
+def _child_per_worker() -> None:
+    workers = int(os.environ.get("BENCH_WORKERS", "0"))
+    # Import the app and libraries (but not the models) before forking
+    import xgboost  # noqa: F401
+
+    import app.services.cohort_scoring  # noqa: F401
+
+    print(json.dumps({"per_worker_private_kb": _fork_workers(workers, preload_in_child=True)}))
+
+
+def _fork_workers(n: int, *, preload_in_child: bool) -> list:
+    if not preload_in_child:
+        gc.freeze()
+    results = []
+    pipes = []
+    for _ in range(n):
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(r)
+            if preload_in_child:
+                from app.services.cohort_scoring import preload_models
+
+                preload_models()
+            _predict_everything()
+            os.write(w, str(_private_kb()).encode())
+            os._exit(0)
+        os.close(w)
+        pipes.append((pid, r))
+    for pid, r in pipes:
+        with os.fdopen(r) as f:
+            results.append(int(f.read() or 0))
+        os.waitpid(pid, 0)
+    return results
+
+
+def _spawn(mode: str, fmt: str, workers: int) -> dict:
+    env = dict(os.environ, MODEL_FORMAT=fmt, BENCH_WORKERS=str(workers))
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_model_formats", "--child", mode],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _avg_mb(values: list) -> float:
+    return sum(values) / len(values) / 1024 if values else 0.0
+
+
+def _parity(rows: int) -> float:
+    import joblib
+
+    from app.commands.export_native_models import iter_model_paths, random_frame
+    from app.services.native_models import load_native
+
+    worst = 0.0
+    for _, _, path, features in iter_model_paths():
+        native = load_native(path)
+        if native is None:
+            raise SystemExit(f"No native copy for {path}; run python -m app.commands.export_native_models first")
+        df = random_frame(features, rows, seed=1)
+        diff = np.abs(np.asarray(joblib.load(path).predict(df), float) - np.asarray(native.predict(df), float))
+        worst = max(worst, float(diff.max()))
+    return worst
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--parity-rows", type=int, default=1000)
+    parser.add_argument("--child", choices=("measure", "per-worker"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child == "measure":
+        _child_measure()
+        return
+    if args.child == "per-worker":
+        _child_per_worker()
+        return
+
+    print(f"max |pickle - native| over {args.parity_rows} random rows per model: {_parity(args.parity_rows):.3g}")
+    print(f"{'format':<8} {'models':>6} {'load s':>8} {'RSS +MB':>8} {'per-worker MB':>14} {'preloaded MB':>13}")
+    for fmt in FORMATS:
+        measured = _spawn("measure", fmt, args.workers)
+        per_worker = _spawn("per-worker", fmt, args.workers)["per_worker_private_kb"]
+        print(
+            f"{fmt:<8} {measured['models']:>6} {measured['load_s']:>8.3f} {measured['rss_growth_kb'] / 1024:>8.1f} "
+            f"{_avg_mb(per_worker):>14.1f} {_avg_mb(measured['preloaded_private_kb']):>13.1f}"
+        )
+    print("per-worker/preloaded = average private memory of one forked worker after predicting")
+
+
+if __name__ == "__main__":
+    main()
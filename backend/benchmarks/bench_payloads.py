@@ -0,0 +1,135 @@
+"""Payload size and serialization cost of the largest JSON responses.
+
+Fetches one response per synthetic child (or parent) from each endpoint below,
+in-process through `app.main:app` with the LLM clients stubbed, and reports
+per response:
+
+- bytes: identity, gzip and zstd at the configured GZIP_LEVEL / ZSTD_LEVEL,
+  and the time each compression takes
+- encode: stdlib json.dumps (what Starlette's JSONResponse renders with) vs
+  orjson (app.core.responses.dumps) on the same content
+- for the list routes on the trusted path: validate + serialize through the
+  response_model (what FastAPI does for a returned list) vs trusted_rows +
+  orjson
+
+  parent_home         GET /users/parent-home
+  weekly_nutrition    GET /nutrition/child/{id}/weekly-summary
+  nutrition_history   GET /nutrition/child/{id}/history
+  prediction_reports  GET /predictions/child/{id}/reports?limit=200
+  prediction_trend    GET /predictions/child/{id}/trend?limit=2000
+  foods               GET /foods/child/{id}
+  illness_logs        GET /illness/list/{id}
+
+It needs a database seeded by the synthetic generator. Prediction reports come
+from POST /predictions or app.commands.rescore_cohort runs:
+
+    python -m app.commands.generate_synthetic_dataset --parents 200 --seed 1
+    python -m benchmarks.bench_payloads --dataset-seed 1 --parents 20
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional, Type
+
+import zstandard
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.config import settings
+from app.core.responses import dumps, trusted_rows
+from app.schemas.schemas import ChildIllnessLog, ChildPredictionReportBase, ChildPredictionTrendPoint, FoodBrief
+from benchmarks.bench_endpoints import _dataset, stubbed_app
+
+# name -> (path template, list schema on the trusted path or None, one request per child?)
+ENDPOINTS = {
+    "parent_home": ("/users/parent-home", None, False),
+    "weekly_nutrition": ("/nutrition/child/{id}/weekly-summary", None, True),
+    "nutrition_history": ("/nutrition/child/{id}/history", None, True),
+    "prediction_reports": ("/predictions/child/{id}/reports?limit=200", ChildPredictionReportBase, True),
+    "prediction_trend": ("/predictions/child/{id}/trend?limit=2000", ChildPredictionTrendPoint, True),
+    "foods": ("/foods/child/{id}", FoodBrief, True),
+    "illness_logs": ("/illness/list/{id}", ChildIllnessLog, True),
+}
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    # starlette.responses.JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _per_call_us(fn: Callable[[], Any], repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def _fetch(client: TestClient, path: str, dataset, per_child: bool) -> List[bytes]:
+    bodies = []
+    for token, child_ids in dataset:
+        headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "identity"}
+        for target in (child_ids if per_child else [None]):
+            r = client.get(path.format(id=target), headers=headers)
+            if r.status_code == 200:
+                bodies.append(r.content)
+    return bodies
+
+
+def _measure(bodies: List[bytes], schema: Optional[Type[BaseModel]], repeat: int) -> Dict[str, float]:
+    zstd = zstandard.ZstdCompressor(level=settings.ZSTD_LEVEL)
+    contents = [json.loads(b) for b in bodies]
+    out = {
+        "responses": len(bodies),
+        "identity_bytes": statistics.mean(len(b) for b in bodies),
+        "gzip_bytes": statistics.mean(len(gzip.compress(b, settings.GZIP_LEVEL)) for b in bodies),
+        "zstd_bytes": statistics.mean(len(zstd.compress(b)) for b in bodies),
+        "gzip_us": statistics.mean(_per_call_us(lambda b=b: gzip.compress(b, settings.GZIP_LEVEL), repeat) for b in bodies),
+        "zstd_us": statistics.mean(_per_call_us(lambda b=b: zstd.compress(b), repeat) for b in bodies),
+        "json_us": statistics.mean(_per_call_us(lambda c=c: _stdlib_dumps(c), repeat) for c in contents),
+        "orjson_us": statistics.mean(_per_call_us(lambda c=c: dumps(c), repeat) for c in contents),
+    }
+    if schema is not None:
+        adapter = TypeAdapter(List[schema])
+        # Python-typed rows (datetimes, enums), as the routes get them from the database
+        rows_list = [[m.model_dump() for m in adapter.validate_python(c)] for c in contents]
+        out["validated_us"] = statistics.mean(
+            _per_call_us(lambda r=r: _stdlib_dumps(adapter.dump_python(adapter.validate_python(r), mode="json")), repeat)
+            for r in rows_list
+        )
+        out["trusted_us"] = statistics.mean(
+            _per_call_us(lambda r=r: dumps(trusted_rows(schema, r)), repeat) for r in rows_list
+        )
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset-seed", type=int, default=1, help="--seed given to generate_synthetic_dataset")
+    parser.add_argument("--parents", type=int, default=20, help="synthetic parents to act as")
+    parser.add_argument("--repeat", type=int, default=20, help="timed repetitions per response")
+    parser.add_argument("--endpoint", action="append", choices=ENDPOINTS, help="repeatable; defaults to all")
+    args = parser.parse_args()
+
+    dataset = _dataset(args.dataset_seed, args.parents)
+    client = TestClient(stubbed_app())
+    print(f"{'endpoint':<19} {'n':>4} {'identity':>9} {'gzip':>8} {'zstd':>8} {'gzip us':>8} {'zstd us':>8} "
+          f"{'json us':>8} {'orjson us':>9} {'validated us':>12} {'trusted us':>10}")
+    for name in args.endpoint or list(ENDPOINTS):
+        path, schema, per_child = ENDPOINTS[name]
+        bodies = _fetch(client, path, dataset, per_child)
+        if not bodies:
+            print(f"{name:<19} no 200 responses")
+            continue
+        m = _measure(bodies, schema, args.repeat)
+        validated = f"{m['validated_us']:12.0f} {m['trusted_us']:10.0f}" if schema is not None else f"{'-':>12} {'-':>10}"
+        print(f"{name:<19} {m['responses']:>4} {m['identity_bytes']:9.0f} {m['gzip_bytes']:8.0f} {m['zstd_bytes']:8.0f} "
+              f"{m['gzip_us']:8.0f} {m['zstd_us']:8.0f} {m['json_us']:8.0f} {m['orjson_us']:9.0f} {validated}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Throughput of an authenticated no-op endpoint with and without the principal cache.
+
+Run from backend/ against any DATABASE_URL the app can use (a throwaway
+sqlite file works):
+
+    python -m benchmarks.bench_principal_cache --requests 2000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.apis.deps import get_current_user
+from app.core.principal_cache import principal_cache
+from app.core.security import create_access_token
+from app.db.session import SessionLocal, engine
+from app.models.models import Parent
+
+BENCH_EMAIL = "bench.principal@example.com"
+
+
+def _ensure_parent() -> str:
+    Parent.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        parent = db.query(Parent).filter(Parent.email == BENCH_EMAIL).first()
+        if parent is None:
+            db.add(Parent(
+                full_name="Bench Parent",
+                email=BENCH_EMAIL,
+                phone_number="9000000001",
+                password_hash="x",
+                is_active=True,
+            ))
+            db.commit()
+    finally:
+        db.close()
+    return create_access_token({"sub": BENCH_EMAIL, "user_type": "parent"})
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/noop")
+    async def noop(current_user=Depends(get_current_user)):
+        return {"ok": True}
+
+    return app
+
+
+def _run(client: TestClient, token: str, n: int) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    for _ in range(min(50, n)):
+        client.get("/noop", headers=headers)
+    start = time.perf_counter()
+    for _ in range(n):
+        resp = client.get("/noop", headers=headers)
+        assert resp.status_code == 200, resp.text
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    token = _ensure_parent()
+    client = TestClient(_build_app())
+    configured_ttl = principal_cache.ttl_seconds or 30.0
+
+    principal_cache.ttl_seconds = 0
+    principal_cache.clear()
+    uncached = _run(client, token, args.requests)
+
+    principal_cache.ttl_seconds = configured_ttl
+    principal_cache.clear()
+    cached = _run(client, token, args.requests)
+
+    print(f"requests:        {args.requests}")
+    print(f"no cache:        {uncached:8.1f} req/s")
+    print(f"principal cache: {cached:8.1f} req/s  (ttl={configured_ttl}s, x{cached / uncached:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Concurrent POST /predictions/child/{id} calls for one child: model evaluations and rows written.
+
+Fires N simultaneous calls at the prediction route (the same way Starlette's
+threadpool runs a sync route: one thread and one Session per request) for a
+child with no matching report yet, and counts model evaluations and inserted
+ChildPredictionReport rows. With single-flight both must be exactly 1; pass
+--compare to also show the uncoalesced behaviour.
+
+Needs a database with at least one child whose prediction inputs are complete
+(anthropometry, meal/illness logs, vaccination and milestone status). The
+child's existing prediction reports are deleted between rounds.
+
+    python -m benchmarks.bench_single_flight --concurrency 16 --rounds 5 --compare
+
+Across API workers the same guarantee comes from the Postgres advisory lock,
+so run it against Postgres with several uvicorn workers for the full picture.
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.apis import predictions
+from app.db import crud
+from app.db.session import SessionLocal
+from app.models.models import Child, ChildPredictionReport, Parent
+from app.services.prediction_common import build_features_for_group
+
+
+def _eligible_child(child_id: int | None) -> int:
+    """The requested child, or the first one with every required prediction input."""
+    db = SessionLocal()
+    try:
+        query = db.query(Child).order_by(Child.child_id)
+        if child_id is not None:
+            query = query.filter(Child.child_id == child_id)
+        for child in query.yield_per(100):
+            group = crud.compute_child_age_group(child.date_of_birth)
+            _, info = build_features_for_group(db, child, group)
+            if not info.get("required_missing"):
+                return child.child_id
+    finally:
+        db.close()
+    raise SystemExit("No child with complete prediction inputs; seed the database first or pass --child-id")
+
+
+class _Uncoalesced:
+    def do(self, key, fn):
+        return fn(), False
+
+
+def _count_evaluations(delay: float) -> list:
+    calls = []
+    lock = threading.Lock()
+    for group, predict in list(predictions._PREDICTORS.items()):
+        def counted(features, _predict=predict):
+            with lock:
+                calls.append(1)
+            # Widen the race window the way a slow model load would
+            time.sleep(delay)
+            return _predict(features)
+        predictions._PREDICTORS[group] = counted
+    return calls
+
+
+def _round(child_id: int, concurrency: int, calls: list) -> tuple[int, int]:
+    db = SessionLocal()
+    try:
+        db.query(ChildPredictionReport).filter(ChildPredictionReport.child_id == child_id).delete()
+        db.commit()
+        parent = db.query(Parent).join(Child, Child.parent_id == Parent.parent_id).filter(Child.child_id == child_id).one()
+        db.expunge(parent)
+    finally:
+        db.close()
+
+    barrier = threading.Barrier(concurrency)
+
+    def one_request():
+        session = SessionLocal()
+        try:
+            barrier.wait()
+            return predictions.get_predictions_for_child(child_id, db=session, current_user=parent).report_id
+        finally:
+            session.close()
+
+    calls.clear()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: one_request(), range(concurrency)))
+
+    db = SessionLocal()
+    try:
+        rows = db.query(ChildPredictionReport).filter(ChildPredictionReport.child_id == child_id).count()
+    finally:
+        db.close()
+    return len(calls), rows
+
+
+def _run(label: str, child_id: int, concurrency: int, rounds: int, calls: list) -> tuple[int, int]:
+    evaluations = rows = 0
+    for _ in range(rounds):
+        e, r = _round(child_id, concurrency, calls)
+        evaluations += e
+        rows += r
+    print(f"{label:<16} evaluations/round={evaluations / rounds:5.2f}  reports/round={rows / rounds:5.2f}")
+    return evaluations, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--child-id", type=int, default=None, help="defaults to the first eligible child")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--model-delay", type=float, default=0.2, help="seconds added to every model evaluation")
+    parser.add_argument("--compare", action="store_true", help="also run with single-flight disabled")
+    args = parser.parse_args()
+
+    child_id = _eligible_child(args.child_id)
+    calls = _count_evaluations(args.model_delay)
+    print(f"child_id={child_id} concurrency={args.concurrency} rounds={args.rounds}")
+
+    if args.compare:
+        flight = predictions._prediction_flight
+        predictions._prediction_flight = _Uncoalesced()
+        try:
+            _run("uncoalesced", child_id, args.concurrency, args.rounds, calls)
+        finally:
+            predictions._prediction_flight = flight
+
+    evaluations, rows = _run("single-flight", child_id, args.concurrency, args.rounds, calls)
+    assert evaluations == args.rounds, f"expected 1 model evaluation per round, got {evaluations / args.rounds:.2f}"
+    assert rows == args.rounds, f"expected 1 report per round, got {rows / args.rounds:.2f}"
+    print("OK: one model evaluation and one report per burst")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Reminder sweep: per-child _vaccination_summary vs the set-based vaccination_due engine.
+
+Seeds a bench parent with --children children (default 1,000,000) with
+dates of birth spread over 0-10 years. For --status-share of them it also
+seeds ChildVaccineStatus rows that mark most of their past CORE doses
+completed. It then measures:
+
+- per-child: _vaccination_summary over a random sample, extrapolated to the
+  whole population (two queries plus a schedule walk per child)
+- engine: one full iter_due_doses pass over every child, with wall time,
+  doses/s and peak RSS
+
+Finally it checks on the sample that the engine's overdue count per child
+equals missed_count, and that every next_due_date inside the window is
+reported.
+
+    python -m benchmarks.bench_vaccination_due --children 1000000 --within-days 7
+
+Seeding is skipped when the bench parent already has the children.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import resource
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import insert
+
+from app.db import crud
+from app.db.crud_child_profile import _vaccination_summary
+from app.db.session import SessionLocal, engine
+from app.models.models import Child, ChildVaccineStatus, Parent, VaccinationSchedule
+from app.schemas.schemas import VaccineStatusEnum
+from app.services.vaccination_due import _EPOCH, age_group_codes, iter_due_doses, load_slot_table
+
+BENCH_EMAIL = "bench.vaccinationdue@example.com"
+CHUNK = 20_000
+MAX_AGE_DAYS = 10 * 365
+
+TABLES = [Parent, Child, VaccinationSchedule, ChildVaccineStatus]
+
+
+def _bench_child_ids(db) -> list[int]:
+    return [
+        cid for (cid,) in db.query(Child.child_id)
+        .join(Parent, Parent.parent_id == Child.parent_id)
+        .filter(Parent.email == BENCH_EMAIL)
+        .order_by(Child.child_id)
+    ]
+
+
+def _seed(n: int, status_share: float, rng: np.random.Generator) -> list[int]:
+    db = SessionLocal()
+    try:
+        crud.seed_all_vaccination_schedules(db)
+        parent = db.query(Parent).filter(Parent.email == BENCH_EMAIL).first()
+        if parent is None:
+            parent = Parent(
+                full_name="Bench Parent",
+                email=BENCH_EMAIL,
+                phone_number="9000000042",
+                password_hash="x",
+                is_active=True,
+            )
+            db.add(parent)
+            db.commit()
+        existing = _bench_child_ids(db)
+        missing = n - len(existing)
+        if missing <= 0:
+            print(f"  children: {len(existing)} present")
+            return existing[:n]
+
+        started = time.perf_counter()
+        today = date.today()
+        ages = rng.integers(0, MAX_AGE_DAYS, size=missing)
+        for start in range(0, missing, CHUNK):
+            db.execute(
+                insert(Child),
+                [
+                    {
+                        "parent_id": parent.parent_id,
+                        "full_name": f"Bench Child {len(existing) + i}",
+                        "gender": "male" if i % 2 else "female",
+                        "date_of_birth": today - timedelta(days=int(ages[i])),
+                    }
+                    for i in range(start, min(start + CHUNK, missing))
+                ],
+            )
+            db.commit()
+        child_ids = _bench_child_ids(db)
+        new_ids = np.asarray(child_ids[len(existing):], dtype=np.int64)
+        print(f"  children: +{missing} ({time.perf_counter() - started:.0f}s)")
+
+        # Completed rows for most past doses of the child's current age group
+        started = time.perf_counter()
+        slots = load_slot_table(db)
+        today_day = (today - _EPOCH).days
+        dob_days = today_day - ages
+        groups = age_group_codes(dob_days, today)
+        tracked = rng.random(missing) < status_share
+        rows = 0
+        for start in range(0, missing, CHUNK):
+            sl = slice(start, start + CHUNK)
+            due = dob_days[sl, None] + slots.offsets[None, :]
+            given = (
+                tracked[sl, None]
+                & (slots.group_codes[None, :] == groups[sl, None])
+                & (slots.offsets[None, :] >= 0)
+                & (due < today_day)
+                & (rng.random(due.shape) < 0.8)
+            )
+            r_at, s_at = np.nonzero(given)
+            batch = [
+                {
+                    "child_id": int(new_ids[start + r]),
+                    "schedule_id": int(slots.schedule_ids[s]),
+                    "dose_number": int(slots.dose_numbers[s]),
+                    "status": VaccineStatusEnum.COMPLETED,
+                    "actual_date": _EPOCH + timedelta(days=int(due[r, s])),
+                }
+                for r, s in zip(r_at.tolist(), s_at.tolist())
+            ]
+            if batch:
+                db.execute(insert(ChildVaccineStatus), batch)
+                db.commit()
+            rows += len(batch)
+        print(f"  child_vaccine_status: +{rows} rows ({time.perf_counter() - started:.0f}s)")
+        return child_ids[:n]
+    finally:
+        db.close()
+
+
+def _per_child(sample: list[int]) -> tuple[float, dict[int, dict]]:
+    db = SessionLocal()
+    try:
+        children = db.query(Child).filter(Child.child_id.in_(sample)).all()
+        db.expunge_all()
+        summaries = {}
+        started = time.perf_counter()
+        for child in children:
+            summaries[child.child_id] = _vaccination_summary(db, child)
+        return (time.perf_counter() - started) / len(children), summaries
+    finally:
+        db.close()
+
+
+def _engine(within_days: int, chunk_size: int, sample: set[int]):
+    db = SessionLocal()
+    try:
+        overdue = defaultdict(int)
+        due_dates = defaultdict(set)
+        counts = {"due": 0, "overdue": 0}
+        started = time.perf_counter()
+        for dose in iter_due_doses(db, within_days=within_days, chunk_size=chunk_size):
+            counts["overdue" if dose.overdue else "due"] += 1
+            if dose.child_id in sample:
+                if dose.overdue:
+                    overdue[dose.child_id] += 1
+                else:
+                    due_dates[dose.child_id].add(dose.due_date)
+        return time.perf_counter() - started, counts, overdue, due_dates
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--children", type=int, default=1_000_000)
+    parser.add_argument("--status-share", type=float, default=0.25, help="share of children with status rows")
+    parser.add_argument("--sample", type=int, default=2000, help="children timed with _vaccination_summary")
+    parser.add_argument("--within-days", type=int, default=7)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    for model in TABLES:
+        model.__table__.create(bind=engine, checkfirst=True)
+    print(f"Seeding ({engine.dialect.name})")
+    child_ids = _seed(args.children, args.status_share, np.random.default_rng(args.seed))
+    db = SessionLocal()
+    try:
+        population = db.query(Child).count()
+    finally:
+        db.close()
+    sample = random.sample(child_ids, min(args.sample, len(child_ids)))
+
+    per_child_s, summaries = _per_child(sample)
+    print(
+        f"\nper-child  : {per_child_s * 1000:.2f} ms/child over {len(sample)} children"
+        f" -> ~{per_child_s * population:.0f}s for {population} children"
+    )
+
+    elapsed, counts, overdue, due_dates = _engine(args.within_days, args.chunk_size, set(sample))
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"engine     : {elapsed:.1f}s for {population} children ({population / elapsed:,.0f} children/s), "
+        f"{counts['due']} due within {args.within_days}d, {counts['overdue']} overdue, peak RSS {rss_mb:.0f} MB"
+    )
+    print(f"speed-up   : {per_child_s * population / elapsed:.0f}x")
+
+    horizon = date.today() + timedelta(days=args.within_days)
+    mismatched = 0
+    for child_id, summary in summaries.items():
+        next_due = summary["next_due_date"]
+        if summary["missed_count"] != overdue[child_id]:
+            mismatched += 1
+        elif next_due is not None and next_due <= horizon and next_due not in due_dates[child_id]:
+            mismatched += 1
+    print(f"parity     : {len(summaries) - mismatched}/{len(summaries)} sampled children agree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Shared fixtures: the app, with its LLM clients stubbed, over a throwaway
+SQLite database holding a small synthetic cohort.
+
+Settings are read when app modules are imported, so the environment is set
+up here before any of them. Set TEST_DATABASE_URL to run against another
+(empty, disposable) database instead.
+"""
+import base64
+import os
+import tempfile
+from datetime import date
+
+_DB_DIR = tempfile.mkdtemp(prefix="sanrakshya-tests-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{_DB_DIR}/test.db")
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("REPORTS_MASTER_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode())
+# Every request looks its user up, so query counts do not depend on test order
+os.environ["PRINCIPAL_CACHE_TTL_SECONDS"] = "0"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.commands import generate_synthetic_dataset  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from benchmarks.bench_endpoints import _dataset, stubbed_app  # noqa: E402
+
+COHORT_SEED = 1
+COHORT_PARENTS = 4
+
+
+@pytest.fixture(scope="session")
+def cohort():
+    """[(bearer token, child ids)] for the synthetic parents."""
+    stubbed_app()  # imports every model module before create_all
+    Base.metadata.create_all(bind=engine)
+    generate_synthetic_dataset.run(
+        parents=COHORT_PARENTS, children_per_parent=2, seed=COHORT_SEED, as_of=date.today()
+    )
+    return _dataset(COHORT_SEED, COHORT_PARENTS)
+
+
+@pytest.fixture(scope="session")
+def client(cohort):
+    with TestClient(stubbed_app()) as c:
+        yield c
+
+
+def auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
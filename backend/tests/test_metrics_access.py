@@ -0,0 +1,22 @@
+from app.core.config import settings
+
+
+def test_metrics_disabled_by_default(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_bearer_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    monkeypatch.setattr(settings, "METRICS_BEARER_TOKEN", "scrape-token")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
+    assert "http_request_duration_seconds" in response.text
+
+
+def test_metrics_without_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    monkeypatch.setattr(settings, "METRICS_BEARER_TOKEN", None)
+    assert client.get("/metrics").status_code == 200
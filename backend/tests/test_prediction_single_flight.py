@@ -0,0 +1,63 @@
+"""Concurrent POST /predictions/child/{id} calls share one model evaluation.
+
+Each call runs in its own thread with its own Session, the way Starlette's
+threadpool runs the sync route, for a child with no matching report yet.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.apis import predictions
+from app.db.session import SessionLocal
+from app.models.models import Child, ChildPredictionReport, Parent
+from benchmarks.bench_single_flight import _eligible_child
+
+CONCURRENCY = 8
+# Widens the race window the way a slow model load would
+MODEL_DELAY = 0.3
+
+
+def test_concurrent_predictions_evaluate_once(cohort, monkeypatch):
+    child_id = _eligible_child(None)
+
+    calls = []
+    lock = threading.Lock()
+    for group, predict in list(predictions._PREDICTORS.items()):
+        def counted(features, _predict=predict):
+            with lock:
+                calls.append(1)
+            time.sleep(MODEL_DELAY)
+            return _predict(features)
+        monkeypatch.setitem(predictions._PREDICTORS, group, counted)
+
+    db = SessionLocal()
+    try:
+        db.query(ChildPredictionReport).filter(ChildPredictionReport.child_id == child_id).delete()
+        db.commit()
+        parent = db.query(Parent).join(Child, Child.parent_id == Parent.parent_id).filter(Child.child_id == child_id).one()
+        db.expunge(parent)
+    finally:
+        db.close()
+
+    barrier = threading.Barrier(CONCURRENCY)
+
+    def one_request(_):
+        session = SessionLocal()
+        try:
+            barrier.wait()
+            return predictions.get_predictions_for_child(child_id, db=session, current_user=parent).report_id
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        report_ids = list(pool.map(one_request, range(CONCURRENCY)))
+
+    db = SessionLocal()
+    try:
+        rows = db.query(ChildPredictionReport).filter(ChildPredictionReport.child_id == child_id).count()
+    finally:
+        db.close()
+
+    assert len(calls) == 1
+    assert rows == 1
+    assert len(set(report_ids)) == 1
@@ -0,0 +1,35 @@
+"""Statement budgets for the hot endpoints (app.core.query_stats.assert_query_budget).
+
+The budgets sit just above today's counts on the synthetic cohort, so an
+added per-row query (an N+1) fails here rather than in production.
+"""
+from app.core.query_stats import assert_query_budget
+from tests.conftest import auth
+
+# Principal lookup and the parent's own rows, then the profile summary per child
+PARENT_HOME_BASE = 6
+PARENT_HOME_PER_CHILD = 20
+# Inputs, single-flight lookup, report insert and change_log row
+PREDICT_BUDGET = 25
+
+
+def test_parent_home_query_budget(client, cohort):
+    for token, child_ids in cohort:
+        with assert_query_budget(PARENT_HOME_BASE + PARENT_HOME_PER_CHILD * len(child_ids)):
+            response = client.get("/users/parent-home", headers=auth(token))
+        assert response.status_code == 200
+        assert len(response.json()["children"]) == len(child_ids)
+
+
+def test_predict_query_budget(client, cohort):
+    predicted = 0
+    for token, child_ids in cohort:
+        for child_id in child_ids:
+            # Once for a new report, once more reusing it
+            for _ in range(2):
+                with assert_query_budget(PREDICT_BUDGET):
+                    response = client.post(f"/predictions/child/{child_id}", headers=auth(token))
+                # 422: the child lacks a required input, which is also budgeted
+                assert response.status_code in (200, 422)
+            predicted += response.status_code == 200
+    assert predicted